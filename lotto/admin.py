@@ -1,6 +1,10 @@
 from django.contrib import admin
 from django.core.exceptions import PermissionDenied
-from .models import Ticket, Draw
+from .models import (
+    ApiToken, ArchivedTicket, ComboExposure, Draw, DrawResult, NumberExposure, NumberRollup, Round, SalesRollup,
+    SalesTotal, SettlementJob, Ticket, UserSalesRollup,
+)
+from .ticket_numbers import filter_tickets_by_numbers, parse_number_query
 
 
 @admin.register(Draw)
@@ -30,13 +34,38 @@ class DrawAdmin(admin.ModelAdmin):
         super().save_model(request, obj, form, change)
 
 
+@admin.register(Round)
+class RoundAdmin(admin.ModelAdmin):
+    list_display = ('number', 'status', 'opened_at', 'sales_close_at', 'closed_at', 'draw', 'archived_at')
+    list_filter = ('status',)
+    ordering = ('-number',)
+    fields = ('number', 'status', 'opened_at', 'sales_close_at', 'closed_at', 'draw', 'archiving_at', 'archived_at')
+    readonly_fields = ('number', 'status', 'opened_at', 'closed_at', 'draw', 'archiving_at', 'archived_at')
+
+    def has_add_permission(self, request):
+        """회차는 추첨 시 자동으로 열림 (판매 마감 예정 시각만 수정 가능)"""
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        """티켓이 묶여 있으므로 삭제 불가"""
+        return False
+
+
 @admin.register(Ticket)
 class TicketAdmin(admin.ModelAdmin):
-    list_display = ('id', 'user', 'numbers', 'is_auto', 'winning_grade', 'draw', 'created_at')
-    list_filter = ('is_auto', 'winning_grade', 'created_at', 'draw')
-    search_fields = ('user__username', 'numbers')
-    readonly_fields = ('created_at', 'winning_grade', 'draw', 'user', 'numbers', 'is_auto')
+    list_display = ('id', 'user', 'numbers', 'is_auto', 'winning_grade', 'round', 'draw', 'created_at')
+    list_filter = ('is_auto', 'winning_grade', 'created_at', 'round', 'draw')
+    search_fields = ('user__username',)
+    search_help_text = "사용자명 또는 번호(예: 7 / 1,5,12)로 검색 - 번호는 모두 포함하는 티켓"
+    readonly_fields = ('created_at', 'winning_grade', 'round', 'draw', 'user', 'numbers', 'is_auto')
     ordering = ('-created_at',)
+
+    def get_search_results(self, request, queryset, search_term):
+        """번호 검색은 문자열 LIKE 대신 TicketNumber 인덱스로 정확히 일치하는 번호를 찾음"""
+        numbers = parse_number_query(search_term)
+        if numbers:
+            return filter_tickets_by_numbers(queryset, numbers), False
+        return super().get_search_results(request, queryset, search_term)
     
     def has_add_permission(self, request):
         """티켓은 admin에서 추가 불가 (사용자가 직접 구매)"""
@@ -48,4 +77,125 @@ class TicketAdmin(admin.ModelAdmin):
     
     def has_delete_permission(self, request, obj=None):
         """superuser만 티켓 삭제 가능"""
-        return request.user.is_superuser
\ No newline at end of file
+        return request.user.is_superuser
+
+
+@admin.register(ArchivedTicket)
+class ArchivedTicketAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'numbers', 'is_auto', 'winning_grade', 'round', 'draw', 'created_at')
+    list_filter = ('is_auto', 'winning_grade', 'round')
+    search_fields = ('user__username',)
+    readonly_fields = ('id', 'created_at', 'winning_grade', 'round', 'draw', 'user', 'numbers', 'numbers_mask',
+                       'is_auto', 'archived_at')
+    ordering = ('-created_at',)
+
+    def has_add_permission(self, request):
+        """보관 티켓은 manage.py archive_tickets로만 생성"""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """보관 티켓은 읽기 전용"""
+        return request.user.is_staff
+
+    def has_delete_permission(self, request, obj=None):
+        """superuser만 보관 티켓 삭제 가능"""
+        return request.user.is_superuser
+
+
+@admin.register(SettlementJob)
+class SettlementJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'draw', 'round', 'start_pk', 'end_pk', 'status', 'processed', 'worker', 'started_at', 'finished_at')
+    list_filter = ('status', 'draw')
+    readonly_fields = ('draw', 'round', 'start_pk', 'end_pk', 'last_pk', 'processed', 'worker', 'error',
+                       'created_at', 'started_at', 'updated_at', 'finished_at')
+
+    def has_add_permission(self, request):
+        """정산 작업은 추첨 진행 시 자동 등록"""
+        return False
+
+
+@admin.register(DrawResult)
+class DrawResultAdmin(admin.ModelAdmin):
+    list_display = ('draw', 'total_tickets', 'grade1_count', 'grade2_count', 'grade3_count',
+                    'grade4_count', 'grade5_count', 'top_tiers_at', 'updated_at')
+    readonly_fields = ('draw', 'total_tickets', 'grade1_count', 'grade2_count', 'grade3_count',
+                       'grade4_count', 'grade5_count', 'top_tiers_at', 'updated_at')
+
+    def has_add_permission(self, request):
+        """결과 요약은 정산 시 자동 기록"""
+        return False
+
+
+@admin.register(SalesRollup)
+class SalesRollupAdmin(admin.ModelAdmin):
+    list_display = ('date', 'user', 'is_auto', 'ticket_count')
+    list_filter = ('is_auto', 'date')
+    readonly_fields = ('date', 'user', 'is_auto', 'ticket_count')
+
+    def has_add_permission(self, request):
+        """판매 집계는 티켓 구매 시 자동 갱신"""
+        return False
+
+
+@admin.register(UserSalesRollup)
+class UserSalesRollupAdmin(admin.ModelAdmin):
+    list_display = ('user', 'ticket_count')
+    readonly_fields = ('user', 'ticket_count')
+
+    def has_add_permission(self, request):
+        """사용자별 판매 집계는 티켓 구매 시 자동 갱신"""
+        return False
+
+
+@admin.register(SalesTotal)
+class SalesTotalAdmin(admin.ModelAdmin):
+    list_display = ('is_auto', 'ticket_count')
+    readonly_fields = ('is_auto', 'ticket_count')
+
+    def has_add_permission(self, request):
+        """전체 판매 집계는 티켓 구매 시 자동 갱신"""
+        return False
+
+
+@admin.register(NumberRollup)
+class NumberRollupAdmin(admin.ModelAdmin):
+    list_display = ('number', 'ticket_count')
+    readonly_fields = ('number', 'ticket_count')
+
+    def has_add_permission(self, request):
+        """번호별 판매 집계는 티켓 구매 시 자동 갱신"""
+        return False
+
+
+@admin.register(NumberExposure)
+class NumberExposureAdmin(admin.ModelAdmin):
+    list_display = ('first', 'second', 'ticket_count')
+    ordering = ('first', 'second')
+    readonly_fields = ('first', 'second', 'ticket_count')
+
+    def has_add_permission(self, request):
+        """노출 집계는 티켓 구매 시 자동 갱신"""
+        return False
+
+
+@admin.register(ComboExposure)
+class ComboExposureAdmin(admin.ModelAdmin):
+    list_display = ('mask', 'ticket_count')
+    ordering = ('-ticket_count',)
+    readonly_fields = ('mask', 'ticket_count')
+
+    def has_add_permission(self, request):
+        """노출 집계는 티켓 구매 시 자동 갱신"""
+        return False
+
+
+@admin.register(ApiToken)
+class ApiTokenAdmin(admin.ModelAdmin):
+    list_display = ('prefix', 'user', 'name', 'is_active', 'created_at')
+    list_filter = ('is_active',)
+    search_fields = ('user__username', 'name', 'prefix')
+    readonly_fields = ('user', 'key_hash', 'prefix', 'created_at')
+
+    def has_add_permission(self, request):
+        """토큰은 manage.py create_api_token으로 발급 (키 원문은 발급 시에만 확인 가능)"""
+        return False
@@ -0,0 +1,170 @@
+"""
+기계 클라이언트(제휴 단말기)용 JSON API
+
+세션·CSRF·템플릿 렌더링 없이 토큰으로 인증하고, 필요한 컬럼만 values()로 읽어 JSON으로 응답한다.
+GET 응답에는 ETag를 붙이고, If-None-Match가 같으면 304로 본문 없이 응답한다.
+
+인증: Authorization: Token <키>  (키 발급: python manage.py create_api_token <사용자명>)
+"""
+import hashlib
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_http_methods
+
+from .draws import CurrentDraw, get_current_draw
+from .models import ApiToken, ArchivedTicket, Ticket
+from .pagination import paginate_tickets
+from .purchase import build_slip, issue_tickets, parse_numbers, parse_slip_request, validate_picks
+from .rounds import ticket_result
+from .utils import mask_to_numbers, numbers_to_mask
+
+TICKET_FIELDS = ('id', 'numbers', 'is_auto', 'created_at', 'winning_grade', 'draw_id')
+
+
+def api_error(message, status):
+    return JsonResponse({"error": message}, status=status)
+
+
+def token_required(view):
+    """Authorization 헤더의 토큰으로 request.user를 설정 (CSRF 검사 제외)"""
+    @csrf_exempt
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        scheme, _, key = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() != 'token' or not key:
+            return api_error("인증 토큰이 필요합니다.", 401)
+        token = (
+            ApiToken.objects.select_related('user')
+            .filter(key_hash=ApiToken.hash_key(key.strip()), is_active=True, user__is_active=True)
+            .first()
+        )
+        if token is None:
+            return api_error("유효하지 않은 토큰입니다.", 401)
+        request.user = token.user
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def conditional_json(request, data, status=200):
+    """본문 해시를 ETag로 붙인 JSON 응답 (If-None-Match가 같으면 304)"""
+    body = json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':'))
+    etag = '"%s"' % hashlib.md5(body.encode(), usedforsecurity=False).hexdigest()
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+    response = HttpResponse(body, status=status, content_type='application/json')
+    response['ETag'] = etag
+    return response
+
+
+def draw_payload(draw):
+    if draw is None:
+        return None
+    return {
+        "id": draw.id,
+        "numbers": list(draw.numbers_tuple),
+        "bonus_number": draw.bonus_number,
+        "drawn_at": draw.drawn_at,
+    }
+
+
+@csrf_exempt
+@require_GET
+def current_draw(request):
+    """현재 활성 추첨 (인증 불필요, 캐시된 스냅샷만 사용)"""
+    return conditional_json(request, {"draw": draw_payload(get_current_draw())})
+
+
+@csrf_exempt
+@require_GET
+def check_numbers(request):
+    """
+    번호 당첨 확인 (인증 불필요, 추첨 시 미리 만들어 둔 스냅샷만 사용해 DB를 조회하지 않음)
+
+    ?numbers=1,5,12,20,33,42 (여러 게임은 numbers를 반복)
+    """
+    games = request.GET.getlist('numbers')
+    if not 1 <= len(games) <= settings.LOTTO_MAX_GAMES_PER_SLIP:
+        return api_error(f"한 번에 1~{settings.LOTTO_MAX_GAMES_PER_SLIP}게임까지 확인할 수 있습니다.", 400)
+    try:
+        picks = validate_picks([parse_numbers(game) for game in games])
+    except ValidationError as e:
+        return JsonResponse({"error": "잘못된 번호입니다.", "errors": e.messages}, status=400)
+
+    draw = get_current_draw()
+    results = []
+    for numbers in picks.tolist():
+        mask = numbers_to_mask(numbers)
+        results.append({
+            "numbers": numbers,
+            "grade": draw.grade_of(mask) if draw else None,
+            "matched": mask_to_numbers(mask & draw.mask) if draw else [],
+            "bonus_matched": bool(draw and mask & draw.bonus_mask),
+        })
+    return conditional_json(request, {"draw": draw_payload(draw), "results": results})
+
+
+@token_required
+@require_http_methods(["GET", "POST"])
+def tickets(request):
+    """
+    GET: 내 티켓 목록 (최신순, ?cursor=로 다음 페이지)
+    POST: 티켓 구매 - 본문은 일괄 구매와 같음 {"games": [...], "auto_count": N}
+    """
+    if request.method == "POST":
+        return buy(request)
+
+    queryset = Ticket.objects.filter(user=request.user).values(*TICKET_FIELDS)
+    archived = ArchivedTicket.objects.filter(user=request.user).values(*TICKET_FIELDS)
+    try:
+        rows, next_cursor = paginate_tickets(
+            queryset, request.GET.get('cursor'), settings.LOTTO_API_PAGE_SIZE, archive=archived
+        )
+    except ValueError:
+        return api_error("잘못된 커서입니다.", 400)
+    return conditional_json(request, {"tickets": rows, "next_cursor": next_cursor})
+
+
+def buy(request):
+    try:
+        issued = issue_tickets(request.user, *build_slip(*parse_slip_request(request.body)))
+    except ValidationError as e:
+        return JsonResponse({"error": "구매할 수 없습니다.", "errors": e.messages}, status=400)
+
+    return JsonResponse({
+        "tickets": [
+            {"id": t.id, "numbers": t.numbers, "is_auto": t.is_auto, "created_at": t.created_at}
+            for t in issued
+        ],
+    }, status=201)
+
+
+@token_required
+@require_GET
+def ticket_detail(request, ticket_id):
+    """
+    티켓 조회 및 티켓 회차 기준 당첨 확인 (DB에 쓰지 않음)
+
+    draw/grade는 티켓이 판매된 회차의 추첨과 당첨 등급이며, 회차 추첨 전이면 둘 다 null이다.
+    """
+    ticket = (
+        Ticket.objects.select_related('round__draw').filter(id=ticket_id, user=request.user).first()
+        # 보관된 이전 회차 티켓도 같은 번호로 조회
+        or ArchivedTicket.objects.select_related('round__draw').filter(id=ticket_id, user=request.user).first()
+    )
+    if ticket is None:
+        return api_error("티켓을 찾을 수 없습니다.", 404)
+
+    draw, grade = ticket_result(ticket)
+    row = {field: getattr(ticket, field) for field in TICKET_FIELDS}
+    row["round"] = ticket.round.number if ticket.round_id else None
+    row["draw"] = draw_payload(CurrentDraw.from_draw(draw) if draw else None)
+    row["grade"] = grade
+    return conditional_json(request, {"ticket": row})
@@ -5,3 +5,6 @@ class LottoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'lotto'
     verbose_name = '로또'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,120 @@
+"""
+정산이 끝난 회차의 티켓 보관 (manage.py archive_tickets)
+
+티켓 테이블은 판매 중인 회차와 최근 추첨 회차(settings.LOTTO_ARCHIVE_KEEP_ROUNDS)만 남기고,
+그 이전 회차의 티켓은 보관 테이블(ArchivedTicket)로 옮겨 티켓 테이블과 인덱스를 작게 유지한다.
+
+회차 티켓을 기본키 순서로 배치씩 옮기며 배치마다 커밋한다.
+  1. INSERT ... SELECT로 보관 테이블에 복사 (기본키 유지)
+  2. 번호별 행(TicketNumber) 삭제
+  3. 티켓 삭제
+첫 배치를 옮기기 전에 archiving_at을 기록하고, 다 옮긴 회차에는 archived_at을 기록한다.
+중간에 멈춰도 다시 실행하면 남은 티켓부터 이어서 옮긴다. 그 사이(archiving_at만 있는 회차)에는
+티켓이 두 테이블에 나뉘어 있으므로 추첨별 조회는 두 테이블을 함께 읽는다 (ticket_sources).
+
+보관한 회차의 티켓은 모두 남아 있는 티켓보다 먼저 판매되었으므로, 내 티켓 목록은 티켓 테이블을
+다 읽은 뒤 같은 커서로 보관 테이블을 이어 읽는다 (pagination.paginate_tickets의 archive).
+"""
+import logging
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ArchivedTicket, Round, SettlementJob, Ticket, TicketNumber
+
+logger = logging.getLogger(__name__)
+
+# Ticket과 ArchivedTicket에 공통인 열 (archived_at 제외)
+ARCHIVE_COLUMNS = (
+    'id', 'user_id', 'numbers', 'numbers_mask', 'is_auto', 'created_at', 'winning_grade', 'draw_id', 'round_id',
+)
+
+
+def archivable_rounds(keep_rounds=None):
+    """
+    보관할 수 있는 회차 (회차 번호 순)
+
+    추첨과 정산이 끝났고, 최근 keep_rounds개 추첨 회차와 현재 활성 추첨의 회차가 아닌 회차.
+
+    Args:
+        keep_rounds: 티켓 테이블에 남겨 둘 최근 추첨 회차 수 (기본값: settings.LOTTO_ARCHIVE_KEEP_ROUNDS)
+    """
+    keep_rounds = settings.LOTTO_ARCHIVE_KEEP_ROUNDS if keep_rounds is None else keep_rounds
+    drawn = Round.objects.filter(status=Round.STATUS_DRAWN)
+    recent = list(drawn.order_by('-number').values_list('id', flat=True)[:keep_rounds])
+    unfinished = SettlementJob.objects.exclude(status=SettlementJob.STATUS_DONE).values('draw_id')
+    return (
+        drawn.filter(archived_at__isnull=True)
+        .exclude(id__in=recent)
+        .exclude(draw__is_active=True)
+        .exclude(draw_id__in=unfinished)
+        .order_by('number')
+    )
+
+
+def _copy_and_delete(round_id, ids, now):
+    """회차 티켓 한 배치를 보관 테이블로 복사한 뒤 티켓 테이블에서 삭제"""
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(column) for column in ARCHIVE_COLUMNS)
+    ticket_table = quote(Ticket._meta.db_table)
+    start, end = ids[0], ids[-1]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote(ArchivedTicket._meta.db_table)} ({columns}, {quote('archived_at')}) "
+            f"SELECT {columns}, %s FROM {ticket_table} WHERE round_id = %s AND id BETWEEN %s AND %s",
+            [now, round_id, start, end],
+        )
+        TicketNumber.objects.filter(
+            ticket_id__gte=start, ticket_id__lte=end, ticket__round_id=round_id,
+        ).delete()
+        # 번호별 행을 먼저 지웠으므로 연관 객체를 모으지 않고 바로 삭제
+        cursor.execute(
+            f"DELETE FROM {ticket_table} WHERE round_id = %s AND id BETWEEN %s AND %s",
+            [round_id, start, end],
+        )
+
+
+def archive_round(sales_round, batch_size=None, progress=None):
+    """
+    회차 티켓을 보관 테이블로 옮김
+
+    Args:
+        sales_round: 보관할 회차 (Round)
+        batch_size: 한 트랜잭션에서 옮길 티켓 수 (기본값: settings.LOTTO_ARCHIVE_BATCH_SIZE)
+        progress: 배치마다 (옮긴 티켓 수)로 호출되는 함수 (옵션)
+
+    Returns:
+        int: 옮긴 티켓 수
+    """
+    batch_size = batch_size or settings.LOTTO_ARCHIVE_BATCH_SIZE
+    tickets = Ticket.objects.filter(round=sales_round).order_by('pk').values_list('pk', flat=True)
+    if sales_round.archiving_at is None:
+        sales_round.archiving_at = timezone.now()
+        sales_round.save(update_fields=['archiving_at'])
+    moved = 0
+    while ids := list(tickets[:batch_size]):
+        with transaction.atomic():
+            _copy_and_delete(sales_round.id, ids, timezone.now())
+        moved += len(ids)
+        if progress:
+            progress(moved)
+
+    sales_round.archived_at = timezone.now()
+    sales_round.save(update_fields=['archived_at'])
+    logger.info("제%s회 티켓 %s장 보관", sales_round.number, moved)
+    return moved
+
+
+def ticket_sources(draw_id):
+    """
+    추첨의 티켓이 들어 있는 모델 목록
+
+    보관 전이면 (Ticket,), 보관 중이면 (Ticket, ArchivedTicket), 보관이 끝났으면 (ArchivedTicket,)
+    """
+    state = Round.objects.filter(draw_id=draw_id).values('archiving_at', 'archived_at').first()
+    if state is None or state['archiving_at'] is None and state['archived_at'] is None:
+        return (Ticket,)
+    if state['archived_at'] is None:
+        return (Ticket, ArchivedTicket)
+    return (ArchivedTicket,)
@@ -0,0 +1,157 @@
+"""
+구매·조회·당첨 확인 화면의 비동기(ASGI) 버전
+
+ASGI 서버(uvicorn 등)에서 LOTTO_ASYNC_VIEWS = True로 실행하면 urls.py가 views.py 대신
+이 모듈의 뷰를 연결한다. 조회는 Django 비동기 ORM(afirst, async for)을 사용해
+DB 응답을 기다리는 동안 이벤트 루프가 다른 요청을 처리할 수 있다.
+트랜잭션이 필요한 티켓 발급만 sync_to_async로 스레드에서 실행한다.
+
+응답 내용과 템플릿은 views.py의 동기 뷰와 같다.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.core.exceptions import ValidationError
+from django.http import Http404, HttpResponseBadRequest, JsonResponse
+from django.shortcuts import redirect, render
+from django.utils import timezone
+
+from .draws import aget_current_draw
+from .forms import LottoBuyForm
+from .models import ArchivedTicket, DrawResult, Ticket
+from .pagination import apaginate_tickets
+from .purchase import auto_pick, issue_tickets, parse_numbers, validate_picks
+from .rounds import ticket_result
+from .views import GRADE_LABELS, MY_TICKET_FIELDS, is_admin, result_context
+
+
+async def _load_user(request):
+    """
+    세션의 사용자를 비동기로 읽어 request.user에 고정
+
+    템플릿의 {{ user }}가 지연 객체를 평가하면서 이벤트 루프에서 동기 쿼리를 실행하지 않도록 한다.
+    """
+    request.user = await request.auser()
+    return request.user
+
+
+@login_required
+async def buy_ticket(request):
+    user = await _load_user(request)
+    if request.method == "POST":
+        form = LottoBuyForm(request.POST)
+        if form.is_valid():
+            is_auto = form.cleaned_data["is_auto"]
+            numbers = auto_pick() if is_auto else parse_numbers(form.cleaned_data["numbers"])
+
+            # 티켓 저장과 판매 집계 갱신은 한 트랜잭션이어야 하므로 스레드에서 실행
+            try:
+                ticket, = await sync_to_async(issue_tickets)(user, validate_picks([numbers]), [is_auto])
+            except ValidationError as e:
+                form.add_error(None, e)
+            else:
+                return redirect("buy_ticket_done", ticket_id=ticket.id)
+
+    else:
+        form = LottoBuyForm()
+
+    return render(request, "lotto/buy_ticket.html", {"form": form})
+
+
+@login_required
+async def buy_ticket_done(request, ticket_id):
+    user = await _load_user(request)
+    # 보관된 이전 회차 티켓도 같은 번호로 조회
+    ticket = (
+        await Ticket.objects.select_related('round__draw').filter(id=ticket_id, user=user).afirst()
+        or await ArchivedTicket.objects.select_related('round__draw').filter(id=ticket_id, user=user).afirst()
+    )
+    if ticket is None:
+        raise Http404("티켓을 찾을 수 없습니다.")
+
+    winning_draw, winning_grade = ticket_result(ticket)
+    return render(request, "lotto/buy_ticket_done.html", result_context(ticket, winning_draw, winning_grade))
+
+
+@login_required
+async def my_tickets(request):
+    """내 티켓 목록 보기 (최신순, 커서 페이지네이션, 이전 회차 보관 티켓까지 이어서)"""
+    user = await _load_user(request)
+    tickets = Ticket.objects.filter(user=user).only(*MY_TICKET_FIELDS)
+    archived = ArchivedTicket.objects.filter(user=user).only(*MY_TICKET_FIELDS)
+    try:
+        tickets, next_cursor = await apaginate_tickets(
+            tickets, request.GET.get('cursor'), settings.LOTTO_MY_TICKETS_PAGE_SIZE, archive=archived
+        )
+    except ValueError:
+        return HttpResponseBadRequest("잘못된 커서입니다.")
+
+    return render(request, "lotto/my_tickets.html", {
+        "tickets": tickets,
+        "next_cursor": next_cursor,
+        "active_draw": await aget_current_draw(),
+    })
+
+
+@login_required
+async def my_tickets_more(request):
+    """내 티켓 목록 다음 페이지 (JSON, 더 보기용)"""
+    user = await _load_user(request)
+    tickets = Ticket.objects.filter(user=user).values(*MY_TICKET_FIELDS)
+    archived = ArchivedTicket.objects.filter(user=user).values(*MY_TICKET_FIELDS)
+    try:
+        tickets, next_cursor = await apaginate_tickets(
+            tickets, request.GET.get('cursor'), settings.LOTTO_MY_TICKETS_PAGE_SIZE, archive=archived
+        )
+    except ValueError:
+        return JsonResponse({"error": "잘못된 커서입니다."}, status=400)
+
+    for ticket in tickets:
+        ticket['winning_grade_display'] = GRADE_LABELS[ticket['winning_grade']]
+        ticket['created_at'] = timezone.localtime(ticket['created_at']).strftime('%Y-%m-%d %H:%M')
+    return JsonResponse({"tickets": tickets, "next_cursor": next_cursor})
+
+
+@user_passes_test(is_admin)
+async def admin_winners(request):
+    """관리자: 당첨자 확인"""
+    await _load_user(request)
+    active_draw = await aget_current_draw()
+
+    if not active_draw:
+        messages.info(request, "아직 추첨이 진행되지 않았습니다.")
+        return render(request, "lotto/admin_winners.html", {
+            "active_draw": None,
+            "winners_by_grade": {},
+        })
+
+    result = await DrawResult.objects.filter(draw_id=active_draw.id).afirst()
+    grade_counts = result.get_grade_counts() if result else {grade: 0 for grade in range(1, 6)}
+    if not result:
+        messages.info(request, "당첨 등급 정산이 아직 완료되지 않았습니다.")
+
+    winners = (
+        Ticket.objects.filter(draw_id=active_draw.id, winning_grade__gt=0)
+        .select_related('user').order_by('-winning_grade', 'created_at')
+    )
+    winners_by_grade = {}
+    for grade, count in grade_counts.items():
+        winners_by_grade[grade] = {
+            "count": count,
+            "tickets": (
+                [ticket async for ticket in winners.filter(winning_grade=grade)[:50]]
+                if count else []
+            ),
+        }
+
+    all_winning_tickets = []
+    if result and result.winner_count:
+        all_winning_tickets = [ticket async for ticket in winners[:100]]
+
+    return render(request, "lotto/admin_winners.html", {
+        "active_draw": active_draw,
+        "result": result,
+        "winners_by_grade": winners_by_grade,
+        "all_winning_tickets": all_winning_tickets,
+    })
@@ -0,0 +1,102 @@
+"""
+자동 번호 대량 생성
+
+프로모션·일괄 구매처럼 자동 번호가 많이 필요할 때 한 장씩 random.sample을 부르는 대신
+NumPy로 여러 게임을 한 번에 만든다. 게임마다 1~45 사이 정수 6개를 뽑고, 번호가 겹친
+게임(약 29%)만 다시 뽑는다. 겹치지 않은 6개 순서쌍은 모두 같은 확률이므로
+random.sample(range(1, 46), 6)과 같은 분포가 된다.
+
+난수원은 바꿔 끼울 수 있다.
+  - SecureRandom: os.urandom 기반 (실제 판매용, 예측 불가)
+  - numpy.random.Generator: 시드를 주면 재현 가능 (테스트·부하 데이터용)
+
+결과는 정렬된 (게임 수, 6) 번호 배열이며, picks_to_masks로 Ticket.numbers_mask 형식으로 바로 변환한다.
+"""
+import os
+
+import numpy as np
+from django.conf import settings
+
+# 서로 다른 번호 조합 수 (45C6)
+COMBINATIONS = 8145060
+
+
+class SecureRandom:
+    """os.urandom 기반 난수원 (numpy.random.Generator.integers와 같은 방식으로 사용)"""
+
+    def integers(self, low, high, size):
+        count = int(np.prod(size))
+        # 64비트 난수의 나머지라 치우침은 무시할 수 있는 수준(약 2^-58)
+        values = np.frombuffer(os.urandom(count * 8), dtype=np.uint64) % np.uint64(high - low)
+        return (values.astype(np.int64) + low).reshape(size)
+
+
+def make_rng(seed=None, secure=None):
+    """
+    자동 번호 난수원 생성
+
+    Args:
+        seed: 시드 (주면 재현 가능한 numpy Generator)
+        secure: True면 SecureRandom (기본값: LOTTO_AUTO_PICK_SECURE, 시드를 주면 무시)
+    """
+    if seed is None and (settings.LOTTO_AUTO_PICK_SECURE if secure is None else secure):
+        return SecureRandom()
+    return np.random.default_rng(seed)
+
+
+def _draw_picks(count, rng):
+    picks = np.sort(rng.integers(1, 46, size=(count, 6)), axis=1).astype(np.int64)
+    retry = np.flatnonzero((np.diff(picks, axis=1) == 0).any(axis=1))
+    while retry.size:
+        picks[retry] = np.sort(rng.integers(1, 46, size=(retry.size, 6)), axis=1)
+        retry = retry[(np.diff(picks[retry], axis=1) == 0).any(axis=1)]
+    return picks
+
+
+def picks_to_masks(picks):
+    """(게임 수, 6) 번호 배열을 번호 비트마스크 배열로 변환"""
+    return np.bitwise_or.reduce(np.left_shift(1, np.asarray(picks, dtype=np.int64)), axis=1)
+
+
+def generate_picks(count, rng=None, unique=False):
+    """
+    자동 번호 여러 게임 생성
+
+    Args:
+        count: 게임 수
+        rng: 난수원 (기본값: make_rng())
+        unique: True면 같은 번호 조합이 두 번 나오지 않음
+
+    Returns:
+        numpy.ndarray: (count, 6) 정렬된 번호 배열
+
+    Raises:
+        ValueError: unique인데 count가 가능한 조합 수보다 클 때
+    """
+    if unique and count > COMBINATIONS:
+        raise ValueError(f"서로 다른 번호 조합은 최대 {COMBINATIONS:,}개입니다.")
+    rng = rng or make_rng()
+    picks = _draw_picks(count, rng)
+    if not unique:
+        return picks
+
+    masks = picks_to_masks(picks)
+    _, first = np.unique(masks, return_index=True)
+    while len(first) < count:
+        # 중복된 만큼 다시 뽑아 채운다 (생성 순서는 유지)
+        picks = np.concatenate([picks[np.sort(first)], _draw_picks(count - len(first), rng)])
+        masks = picks_to_masks(picks)
+        _, first = np.unique(masks, return_index=True)
+    return picks[np.sort(first)]
+
+
+def iter_pick_batches(count, batch_size=100000, rng=None):
+    """
+    대량 생성용: count 게임을 batch_size씩 (번호 배열, 비트마스크 배열)로 생성
+
+    배치 안에서는 조합이 겹치지 않는다. 전체에서 겹치지 않아야 하면 generate_picks(unique=True)를 사용한다.
+    """
+    rng = rng or make_rng()
+    for offset in range(0, count, batch_size):
+        picks = generate_picks(min(batch_size, count - offset), rng, unique=True)
+        yield picks, picks_to_masks(picks)
@@ -0,0 +1,279 @@
+"""
+성능 회귀 측정 모음 (manage.py bench_suite)
+
+크기(예: 1만/10만/100만 장)마다 그만큼의 합성 티켓(seeding)을 한 회차에 판매하고 다음을 측정한다.
+이전 크기의 회차는 추첨이 끝난 채 테이블에 남으므로, 정산 시간이 누적 티켓 수가 아니라
+회차 판매량에 비례하는지도 함께 확인된다.
+  - grade.*: calculate_winning_grade / grades_from_masks 처리량 (데이터 크기와 무관, 한 번만)
+  - settle.<mode>: 회차 티켓 정산 시간과 쿼리 수 (정산 방식별)
+  - settle.top_tiers: 번호 조합 인덱스로 1~3등만 먼저 찾는 시간 (회차 판매량과 거의 무관해야 함)
+  - settle.admin_draw: admin_draw 요청(판매 마감 + 추첨 + 요청 안에서 정산) 시간과 쿼리 수
+  - view.* / purchase.*: 구매·조회·당첨자 화면 응답 시간(p50/p95)과 요청당 쿼리 수
+
+결과는 기록(record) 목록으로 JSON에 저장하고, 이전 결과(기준)와 비교해
+시간이 허용 비율 이상 늘었거나 쿼리 수가 늘어난 항목을 회귀로 보고한다.
+화면의 쿼리 수가 데이터 크기에 따라 늘어나면(N+1) 기준 없이도 회귀로 본다.
+"""
+import platform
+import random
+import statistics
+import time
+
+import django
+import numpy as np
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .autopick import generate_picks, make_rng, picks_to_masks
+from .models import Draw, Round, Ticket
+from .pagination import paginate_tickets
+from .sales import rebuild_sales_rollup
+from .seeding import create_seed_users, seed_tickets
+from .settlement import grades_from_masks, settle_draw, settle_top_tiers
+from .utils import calculate_winning_grade, numbers_to_mask
+
+# 이보다 작은 시간 차이(ms)는 측정 잡음으로 보고 회귀로 세지 않음
+NOISE_FLOOR_MS = 2.0
+
+# 크기별 요청당 쿼리 수 차이가 이보다 크면 N+1로 봄
+# (당첨자 화면은 당첨자가 없는 등급의 조회를 건너뛰므로 등급 수만큼은 달라질 수 있음)
+QUERY_GROWTH_SLACK = 5
+
+# 기준과 비교하는 시간 지표
+TIMING_METRICS = ('seconds', 'p50_ms')
+
+BENCH_USER_PREFIX = '__bench_user_'
+BENCH_ADMIN = '__bench_admin__'
+
+
+def _percentile(values, q):
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def measure_request(client, method, url, repeat, data=None):
+    """
+    같은 요청을 repeat번 보내 응답 시간과 요청당 쿼리 수를 측정 (첫 요청은 준비 단계로 제외)
+
+    Returns:
+        dict: p50_ms, p95_ms, queries (요청당 최대 쿼리 수), status
+    """
+    send = getattr(client, method)
+    send(url, data)
+    timings, queries, status = [], 0, None
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            response = send(url, data)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = max(queries, len(ctx.captured_queries))
+        status = response.status_code
+    return {
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(_percentile(timings, 95), 3),
+        "queries": queries,
+        "status": status,
+    }
+
+
+def bench_grade_calculation(samples, seed=0):
+    """
+    당첨 등급 계산 처리량 (티켓 한 장씩 calculate_winning_grade vs 비트마스크 일괄 계산)
+
+    Returns:
+        list: 기록 2개
+    """
+    picks = generate_picks(samples, make_rng(seed))
+    draw_numbers, bonus = [3, 11, 19, 27, 35, 43], 7
+    rows = picks.tolist()
+
+    started = time.perf_counter()
+    for row in rows:
+        calculate_winning_grade(row, draw_numbers, bonus)
+    scalar = time.perf_counter() - started
+
+    masks = picks_to_masks(picks)
+    started = time.perf_counter()
+    grades_from_masks(masks, numbers_to_mask(draw_numbers), bonus)
+    vectorized = time.perf_counter() - started
+
+    return [
+        {"name": name, "size": samples, "seconds": round(elapsed, 6),
+         "per_sec": round(samples / elapsed) if elapsed else None}
+        for name, elapsed in (
+            ("grade.calculate_winning_grade", scalar),
+            ("grade.grades_from_masks", vectorized),
+        )
+    ]
+
+
+def bench_settlement(client, sales_round, size, modes):
+    """
+    회차 티켓 정산 시간과 쿼리 수를 정산 방식별로 측정한 뒤 admin_draw 요청으로 회차를 추첨
+
+    Returns:
+        list: 정산 방식별 기록과 admin_draw 기록
+    """
+    tickets = sales_round.tickets.all()
+    total = Ticket.objects.count()
+    timed = [
+        (f"settle.{mode}", lambda mode=mode: settle_draw(
+            Draw.objects.create(numbers="3,11,19,27,35,43", bonus_number=7, is_active=False),
+            tickets=tickets, mode=mode,
+        ))
+        for mode in modes
+    ]
+    timed.append(("settle.top_tiers", lambda: settle_top_tiers(
+        Draw.objects.create(numbers="3,11,19,27,35,43", bonus_number=7, is_active=False), tickets=tickets,
+    )))
+    timed.append(("settle.admin_draw", lambda: client.post(reverse('admin_draw'))))
+
+    records = []
+    with override_settings(LOTTO_SETTLEMENT_BACKGROUND=False, LOTTO_SETTLEMENT_MODE=modes[0]):
+        for name, func in timed:
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                func()
+                elapsed = time.perf_counter() - started
+            records.append({
+                "name": name,
+                "size": size,
+                "total_tickets": total,
+                "seconds": round(elapsed, 4),
+                "per_sec": round(size / elapsed) if elapsed else None,
+                "queries": len(ctx.captured_queries),
+            })
+    return records
+
+
+def bench_views(user_client, admin_client, user, size, repeat):
+    """
+    구매·조회·당첨자 화면 응답 시간과 요청당 쿼리 수
+
+    Returns:
+        list: 화면별 기록
+    """
+    _, cursor = paginate_tickets(Ticket.objects.filter(user=user), None, settings.LOTTO_MY_TICKETS_PAGE_SIZE)
+    ticket = Ticket.objects.filter(user=user).order_by('-id').first()
+    cases = [
+        ("view.my_tickets", user_client, 'get', reverse('my_tickets'), None),
+        ("view.my_tickets_more", user_client, 'get', reverse('my_tickets_more'),
+         {'cursor': cursor} if cursor else None),
+        ("view.buy_ticket_done", user_client, 'get', reverse('buy_ticket_done', args=[ticket.id]), None),
+        ("view.admin_winners", admin_client, 'get', reverse('admin_winners'), None),
+        ("view.admin_sales", admin_client, 'get', reverse('admin_sales'), None),
+        ("purchase.buy_ticket", user_client, 'post', reverse('buy_ticket'), {'is_auto': 'on'}),
+    ]
+    return [
+        {"name": name, "size": size, **measure_request(client, method, url, repeat, data)}
+        for name, client, method, url, data in cases
+    ]
+
+
+def run_suite(sizes, modes=('chunked', 'sql'), users=1000, repeat=20, grade_samples=200000, seed=0,
+              log=None):
+    """
+    sizes 순서대로 회차마다 티켓을 판매해 가며 전체 측정 실행 (현재 연결된 DB에 합성 데이터를 추가함)
+
+    Args:
+        sizes: 회차별 티켓 수 목록
+        modes: 측정할 정산 방식
+        users: 합성 사용자 수
+        repeat: 화면별 반복 요청 수
+        grade_samples: 등급 계산 처리량 측정에 쓸 게임 수
+        seed: 난수 시드
+        log: 진행 메시지를 받을 함수 (옵션)
+
+    Returns:
+        dict: meta, records
+    """
+    log = log or (lambda message: None)
+    random.seed(seed)
+    user_ids = create_seed_users(users, prefix=BENCH_USER_PREFIX)
+    user = User.objects.get(id=user_ids[0])
+    admin = User.objects.filter(username=BENCH_ADMIN).first() or User.objects.create_superuser(BENCH_ADMIN)
+    user_client, admin_client = Client(), Client()
+    user_client.force_login(user)
+    admin_client.force_login(admin)
+
+    log(f"등급 계산 처리량 ({grade_samples:,}게임)")
+    records = bench_grade_calculation(grade_samples, seed)
+
+    for index, size in enumerate(sorted(sizes)):
+        sales_round = Round.current()
+        log(f"제{sales_round.number}회 티켓 {size:,}장 생성")
+        seed_tickets(size, user_ids, seed=[seed, index], round_id=sales_round.id)
+        rebuild_sales_rollup()
+        log(f"[{size:,}장] 정산 ({', '.join(modes)}, admin_draw)")
+        records += bench_settlement(admin_client, sales_round, size, modes)
+        log(f"[{size:,}장] 화면 응답 ({repeat}회씩)")
+        records += bench_views(user_client, admin_client, user, size, repeat)
+
+    return {
+        "meta": {
+            "created_at": timezone.now().isoformat(),
+            "vendor": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "sizes": sorted(sizes),
+            "modes": list(modes),
+            "users": users,
+            "repeat": repeat,
+            "seed": seed,
+            "page_size": settings.LOTTO_MY_TICKETS_PAGE_SIZE,
+        },
+        "records": records,
+    }
+
+
+def query_growth(records):
+    """
+    데이터 크기에 따라 요청당 쿼리 수가 QUERY_GROWTH_SLACK 넘게 달라지는 화면 (N+1 의심)
+
+    Returns:
+        list: 회귀 메시지
+    """
+    by_name = {}
+    for record in records:
+        if record["name"].startswith(("view.", "purchase.")):
+            by_name.setdefault(record["name"], {})[record["size"]] = record["queries"]
+    return [
+        f"{name}: 데이터 크기에 따라 쿼리 수가 달라짐 {counts}"
+        for name, counts in sorted(by_name.items())
+        if max(counts.values()) - min(counts.values()) > QUERY_GROWTH_SLACK
+    ]
+
+
+def compare_results(current, baseline, threshold=0.25):
+    """
+    기준 결과와 비교해 회귀 항목을 찾음
+
+    같은 (이름, 크기) 기록끼리 비교한다.
+      - 시간(seconds, p50_ms): 기준보다 threshold 비율 넘게, NOISE_FLOOR_MS 넘게 늘면 회귀
+      - 쿼리 수: 기준보다 하나라도 늘면 회귀
+
+    Returns:
+        list: 회귀 메시지 (없으면 빈 리스트)
+    """
+    base = {(r["name"], r["size"]): r for r in baseline["records"]}
+    regressions = []
+    for record in current["records"]:
+        previous = base.get((record["name"], record["size"]))
+        if not previous:
+            continue
+        label = f"{record['name']} [{record['size']:,}]"
+        for metric in TIMING_METRICS:
+            if metric not in record or metric not in previous:
+                continue
+            now, before = record[metric], previous[metric]
+            delta_ms = (now - before) * (1000 if metric == 'seconds' else 1)
+            if now > before * (1 + threshold) and delta_ms > NOISE_FLOOR_MS:
+                growth = f" (+{(now / before - 1) * 100:.0f}%)" if before else ""
+                regressions.append(f"{label}: {metric} {before} → {now}{growth}")
+        if record.get("queries", 0) > previous.get("queries", record.get("queries", 0)):
+            regressions.append(f"{label}: 쿼리 수 {previous['queries']} → {record['queries']}")
+    return regressions
@@ -0,0 +1,136 @@
+"""
+현재 활성 추첨 조회 캐시
+
+구매·조회 요청마다 `Draw.objects.filter(is_active=True).first()`를 실행하고
+번호 문자열을 다시 파싱하는 대신, 파싱된 스냅샷을 프로세스 메모리와
+Django 캐시에 두고 재사용한다. Draw가 저장·삭제되면 시그널로 무효화된다.
+
+프로세스 메모리 캐시는 LOTTO_CURRENT_DRAW_LOCAL_TTL초 동안만 유지되므로,
+여러 프로세스가 같은 Django 캐시(settings.CACHES, LOTTO_CACHE_DIR의 파일 캐시 등)를 공유하면
+다른 프로세스에서 진행한 추첨도 그 시간 안에 반영되고, 공유 캐시에 스냅샷이 있는 동안은 DB를 조회하지 않는다.
+
+추첨이 저장되면 커밋 직후 publish_current_draw가 스냅샷(당첨 번호·보너스 비트마스크)을
+미리 만들어 캐시에 넣어 두므로, 당첨 확인은 DB 조회 없이 비트 연산 몇 번으로 끝난다.
+"""
+import time
+from dataclasses import dataclass
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Draw
+from .utils import numbers_to_mask
+
+# 스냅샷 필드가 바뀌면 버전을 올려 다른 프로세스가 넣어 둔 이전 형식을 읽지 않도록 한다
+CACHE_KEY = 'lotto:current_draw:v2'
+
+_MISSING = object()
+
+# 일치 개수(0~6)별 당첨 등급 (5개 일치는 보너스 번호에 따라 2등/3등)
+GRADE_BY_MATCHES = (0, 0, 0, 5, 4, 3, 1)
+
+# 프로세스 메모리 캐시: (만료 시각, 스냅샷). 튜플을 통째로 교체하므로 스레드 간 잠금이 필요 없다.
+_local_snapshot = (0.0, None)
+
+
+@dataclass(frozen=True)
+class CurrentDraw:
+    """활성 추첨 스냅샷 (템플릿에서 Draw 대신 그대로 사용 가능)"""
+    id: int
+    numbers: str
+    numbers_tuple: tuple
+    bonus_number: int
+    drawn_at: object
+    mask: int
+    bonus_mask: int
+
+    @classmethod
+    def from_draw(cls, draw):
+        numbers = tuple(draw.get_numbers_list())
+        return cls(
+            id=draw.id,
+            numbers=draw.numbers,
+            numbers_tuple=numbers,
+            bonus_number=draw.bonus_number,
+            drawn_at=draw.drawn_at,
+            mask=numbers_to_mask(numbers),
+            bonus_mask=1 << draw.bonus_number if draw.bonus_number else 0,
+        )
+
+    @property
+    def pk(self):
+        return self.id
+
+    def get_numbers_list(self):
+        return list(self.numbers_tuple)
+
+    def get_numbers_mask(self):
+        return self.mask
+
+    def grade_of(self, ticket_mask):
+        """
+        티켓 번호 비트마스크의 당첨 등급 (calculate_winning_grade와 같은 결과, DB 조회 없음)
+
+        Returns:
+            int: 당첨 등급 (0: 낙첨, 1~5: 등급)
+        """
+        grade = GRADE_BY_MATCHES[(ticket_mask & self.mask).bit_count()]
+        if grade == 3 and ticket_mask & self.bonus_mask:
+            return 2
+        return grade
+
+
+def get_current_draw():
+    """
+    현재 활성 추첨 스냅샷 조회
+
+    Returns:
+        CurrentDraw 또는 None (활성 추첨이 없을 때)
+    """
+    global _local_snapshot
+    now = time.monotonic()
+    expires, snapshot = _local_snapshot
+    if expires > now:
+        return snapshot
+
+    snapshot = cache.get(CACHE_KEY, _MISSING)
+    if snapshot is _MISSING:
+        draw = Draw.objects.filter(is_active=True).first()
+        snapshot = CurrentDraw.from_draw(draw) if draw else None
+        cache.set(CACHE_KEY, snapshot, settings.LOTTO_CURRENT_DRAW_CACHE_TIMEOUT)
+
+    _local_snapshot = (now + settings.LOTTO_CURRENT_DRAW_LOCAL_TTL, snapshot)
+    return snapshot
+
+
+async def aget_current_draw():
+    """get_current_draw의 비동기 버전 (프로세스 메모리 캐시 적중 시 스레드 전환 없음)"""
+    expires, snapshot = _local_snapshot
+    if expires > time.monotonic():
+        return snapshot
+    return await sync_to_async(get_current_draw)()
+
+
+def publish_current_draw():
+    """
+    활성 추첨 스냅샷을 DB에서 다시 만들어 캐시에 저장 (추첨 저장 커밋 후 호출)
+
+    다음 추첨이 저장될 때까지 유효하므로 Django 캐시 만료 시간 없이 저장한다.
+
+    Returns:
+        CurrentDraw 또는 None
+    """
+    global _local_snapshot
+    draw = Draw.objects.filter(is_active=True).first()
+    snapshot = CurrentDraw.from_draw(draw) if draw else None
+    cache.set(CACHE_KEY, snapshot, None)
+    _local_snapshot = (time.monotonic() + settings.LOTTO_CURRENT_DRAW_LOCAL_TTL, snapshot)
+    return snapshot
+
+
+def invalidate_current_draw():
+    """현재 활성 추첨 캐시 무효화"""
+    global _local_snapshot
+    cache.delete(CACHE_KEY)
+    _local_snapshot = (0.0, None)
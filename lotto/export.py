@@ -0,0 +1,144 @@
+"""
+추첨별 티켓·당첨자 전체 내보내기 (CSV, Parquet)
+
+티켓을 iterator(chunk_size)로 나눠 읽고(PostgreSQL에서는 서버 측 커서) 읽은 만큼 바로
+내보내므로, 수천만 행을 내보내도 메모리 사용량은 청크 하나 크기로 일정하다.
+보관이 끝난 회차의 추첨은 보관 테이블(ArchivedTicket)에서, 보관 중인 회차의 추첨은
+두 테이블을 합쳐(UNION ALL) 읽는다.
+Parquet 형식은 pyarrow가 설치되어 있을 때만 사용할 수 있다.
+"""
+import csv
+from itertools import islice
+
+from .archive import ticket_sources
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+EXPORT_FIELDS = ('id', 'user__username', 'numbers', 'is_auto', 'created_at', 'winning_grade', 'draw_id')
+EXPORT_COLUMNS = ('ticket_id', 'username', 'numbers', 'is_auto', 'created_at', 'winning_grade', 'draw_id')
+EXPORT_KINDS = ('tickets', 'winners')
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+def available_formats():
+    """사용할 수 있는 내보내기 형식"""
+    return ('csv', 'parquet') if pa else ('csv',)
+
+
+def export_rows(draw_id, kind='tickets'):
+    """
+    내보낼 행 queryset (EXPORT_FIELDS 순서의 튜플)
+
+    Args:
+        draw_id: 추첨 ID
+        kind: 'tickets' (정산된 전체 티켓, ID 순) 또는 'winners' (당첨 티켓, 상위 등급부터)
+    """
+    querysets = []
+    for model in ticket_sources(draw_id):
+        tickets = model.objects.filter(draw_id=draw_id)
+        if kind == 'winners':
+            tickets = tickets.filter(winning_grade__gt=0)
+        querysets.append(tickets.order_by().values_list(*EXPORT_FIELDS))
+    rows = querysets[0].union(*querysets[1:], all=True) if len(querysets) > 1 else querysets[0]
+    return rows.order_by('winning_grade', 'id') if kind == 'winners' else rows.order_by('id')
+
+
+def _batches(rows, size):
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class _Echo:
+    """csv.writer가 만든 문자열을 그대로 돌려주는 파일 대용 객체"""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows, chunk_size=2000):
+    """
+    queryset을 CSV 문자열 조각으로 내보냄 (조각 하나에 chunk_size행)
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for batch in _batches(rows.iterator(chunk_size=chunk_size), chunk_size):
+        yield ''.join(
+            writer.writerow((pk, username, numbers, int(is_auto), created_at.isoformat(), grade, draw_id))
+            for pk, username, numbers, is_auto, created_at, grade, draw_id in batch
+        )
+
+
+class _ChunkSink:
+    """ParquetWriter가 쓴 바이트를 모아 두었다가 꺼내 가는 쓰기 전용 파일 대용 객체"""
+    closed = False
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_parquet(rows, row_group_size=100000, chunk_size=2000):
+    """
+    queryset을 Parquet 바이트 조각으로 내보냄 (행 그룹 하나씩)
+
+    Raises:
+        RuntimeError: pyarrow가 설치되어 있지 않을 때
+    """
+    if pa is None:
+        raise RuntimeError("Parquet 형식으로 내보내려면 pyarrow가 필요합니다.")
+    schema = pa.schema([
+        ('ticket_id', pa.int64()),
+        ('username', pa.string()),
+        ('numbers', pa.string()),
+        ('is_auto', pa.bool_()),
+        ('created_at', pa.timestamp('us', tz='UTC')),
+        ('winning_grade', pa.int8()),
+        ('draw_id', pa.int64()),
+    ])
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in _batches(rows.iterator(chunk_size=chunk_size), row_group_size):
+            columns = zip(*batch)
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema,
+            ))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def iter_export(draw_id, kind='tickets', fmt='csv'):
+    """추첨 내보내기 조각 생성기 (형식에 따라 str 또는 bytes)"""
+    rows = export_rows(draw_id, kind)
+    return iter_parquet(rows) if fmt == 'parquet' else iter_csv(rows)
+
+
+def export_filename(draw_id, kind, fmt):
+    return f"draw{draw_id}_{kind}.{fmt}"
@@ -0,0 +1,142 @@
+"""
+번호 인기도·당첨 노출(liability) 집계
+
+현재 회차에 판매한 티켓을 대상으로, 판매할 때마다 다음 두 집계를 증분 갱신한다.
+회차를 추첨하면 집계를 비우고 다음 회차 판매분부터 다시 센다.
+  - NumberExposure: 번호별·번호 쌍별 티켓 수 (45 + 990행)
+  - ComboExposure: 번호 조합(비트마스크)별 티켓 수
+
+후보 당첨 번호의 1~3등 예상 당첨자 수는 그 조합과 5개 이상 일치하는 조합
+(자기 자신 + 번호 하나만 다른 6 x 39개)의 ComboExposure를 한 번에 조회해 구하므로
+티켓 테이블을 읽지 않는다.
+"""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Value, When
+
+from .models import ComboExposure, NumberExposure, Round, Ticket
+from .utils import mask_to_numbers, number_cooccurrence, top_tier_masks
+
+
+def add_counts(model, key_field, counts, make_row):
+    """
+    키별 티켓 수를 더함
+
+    없는 행은 먼저 만들고, 더할 값이 같은 키끼리 묶어 한 번의 UPDATE로 증가시킨다.
+    """
+    if not counts:
+        return
+    model.objects.bulk_create([make_row(key) for key in counts], ignore_conflicts=True)
+    keys_by_count = defaultdict(list)
+    for key, count in counts.items():
+        keys_by_count[count].append(key)
+    model.objects.filter(**{f'{key_field}__in': list(counts)}).update(
+        ticket_count=F('ticket_count') + Case(
+            *(When(**{f'{key_field}__in': keys}, then=Value(count)) for count, keys in keys_by_count.items()),
+            default=Value(0),
+        )
+    )
+
+
+def record_exposure(masks):
+    """
+    새로 판매한 티켓을 노출 집계에 반영
+
+    Args:
+        masks: 판매한 티켓들의 번호 비트마스크 목록
+    """
+    cells = Counter()
+    for mask in masks:
+        numbers = mask_to_numbers(mask)
+        for i, first in enumerate(numbers):
+            for second in numbers[i:]:
+                cells[NumberExposure.cell_id(first, second)] += 1
+    add_counts(NumberExposure, 'id', cells, NumberExposure.for_cell)
+    add_counts(ComboExposure, 'mask', Counter(masks), lambda mask: ComboExposure(mask=mask))
+
+
+def reset_exposure():
+    """노출 집계 비우기 (회차 추첨 시)"""
+    NumberExposure.objects.all().delete()
+    ComboExposure.objects.all().delete()
+
+
+def rebuild_exposure(tickets=None, batch_size=50000):
+    """
+    티켓으로부터 노출 집계를 다시 계산
+
+    Args:
+        tickets: 집계할 티켓 queryset (기본값: 현재 회차 티켓)
+
+    Returns:
+        tuple: (번호·쌍 행 수, 조합 행 수)
+    """
+    if tickets is None:
+        tickets = Ticket.objects.filter(round=Round.current())
+    matrix = number_cooccurrence([])
+    last_pk = 0
+    while True:
+        batch = list(
+            tickets.filter(pk__gt=last_pk).order_by('pk').values_list('id', 'numbers_mask')[:batch_size]
+        )
+        if not batch:
+            break
+        matrix += number_cooccurrence([mask for _, mask in batch])
+        last_pk = batch[-1][0]
+
+    combos = tickets.order_by().values_list('numbers_mask').annotate(count=Count('id'))
+    with transaction.atomic():
+        reset_exposure()
+        cells = NumberExposure.objects.bulk_create(
+            NumberExposure.for_cell(NumberExposure.cell_id(first, second), int(matrix[first, second]))
+            for first in range(1, 46)
+            for second in range(first, 46)
+            if matrix[first, second]
+        )
+        combo_rows = ComboExposure.objects.bulk_create(
+            (ComboExposure(mask=mask, ticket_count=count) for mask, count in combos.iterator()),
+            batch_size=1000,
+        )
+    return len(cells), len(combo_rows)
+
+
+def projected_winners(numbers, bonus_number=None):
+    """
+    후보 당첨 번호로 추첨했을 때의 1~3등 예상 당첨 티켓 수 (티켓 테이블을 읽지 않음)
+
+    Args:
+        numbers: 후보 당첨 번호 6개
+        bonus_number: 후보 보너스 번호 (없으면 5개 일치는 모두 3등으로 셈)
+
+    Returns:
+        dict: {1: 1등 수, 2: 2등 수, 3: 3등 수}
+    """
+    grades = top_tier_masks(numbers, bonus_number)
+    counts = ComboExposure.objects.filter(mask__in=list(grades)).values_list('mask', 'ticket_count')
+    result = {1: 0, 2: 0, 3: 0}
+    for mask, count in counts:
+        result[grades[mask]] += count
+    return result
+
+
+def exposure_heatmap(top_pairs=20):
+    """
+    번호 노출 화면용 집계
+
+    Returns:
+        dict: numbers (번호, 티켓 수, 최다 번호 대비 비율 0~1) 45개, top_pairs (번호1, 번호2, 티켓 수)
+    """
+    singles = dict(
+        NumberExposure.objects.filter(first=F('second')).values_list('first', 'ticket_count')
+    )
+    peak = max(singles.values(), default=0) or 1
+    pairs = (
+        NumberExposure.objects.filter(first__lt=F('second'))
+        .order_by('-ticket_count', 'first', 'second')
+        .values_list('first', 'second', 'ticket_count')[:top_pairs]
+    )
+    return {
+        "numbers": [(n, singles.get(n, 0), round(singles.get(n, 0) / peak, 2)) for n in range(1, 46)],
+        "top_pairs": list(pairs),
+    }
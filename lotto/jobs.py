@@ -0,0 +1,183 @@
+"""
+DB 기반 추첨 정산 작업 큐
+
+추첨 요청은 티켓 기본키 범위를 여러 SettlementJob으로 나눠 등록만 하고 즉시 반환한다.
+실제 정산은 `python manage.py settlement_worker` 프로세스가 작업을 하나씩 가져가 처리한다.
+워커를 여러 개 띄우면 각자 다른 범위를 나눠 처리한다.
+"""
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import SettlementJob, Ticket
+from .settlement import partition_pk_range, record_draw_result, settle_draw
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_settlement(draw, tickets=None, partitions=None, sales_round=None):
+    """
+    추첨 정산 작업을 티켓 기본키 범위별로 나눠 등록
+
+    Args:
+        draw: 추첨 (Draw)
+        tickets: 정산할 티켓 queryset (기본값: sales_round의 티켓, 없으면 전체 티켓)
+        partitions: 나눌 작업 수 (기본값: settings.LOTTO_SETTLEMENT_PARTITIONS)
+        sales_round: 정산할 회차 (Round, 워커는 범위 안에서도 이 회차의 티켓만 정산)
+
+    Returns:
+        list: 등록된 SettlementJob 목록
+    """
+    if tickets is None:
+        tickets = sales_round.tickets.all() if sales_round else Ticket.objects.all()
+    partitions = partitions or settings.LOTTO_SETTLEMENT_PARTITIONS
+
+    ranges = partition_pk_range(tickets, partitions)
+    if not ranges:
+        # 정산할 티켓이 없어도 진행 상황이 완료로 보이도록 빈 범위 작업 하나를 등록
+        ranges = [(1, 0)]
+    jobs = [SettlementJob(draw=draw, round=sales_round, start_pk=start, end_pk=end) for start, end in ranges]
+    return SettlementJob.objects.bulk_create(jobs)
+
+
+def claim_next_job(worker_name=None):
+    """
+    대기 중인 작업 하나를 가져와 진행 중으로 표시
+
+    상태 조건부 UPDATE로 선점하므로 여러 워커가 동시에 호출해도 같은 작업을 가져가지 않는다.
+
+    Returns:
+        SettlementJob 또는 None
+    """
+    worker_name = worker_name or default_worker_name()
+    candidates = SettlementJob.objects.filter(
+        status=SettlementJob.STATUS_PENDING
+    ).values_list('id', flat=True)[:10]
+    for job_id in candidates:
+        now = timezone.now()
+        claimed = SettlementJob.objects.filter(
+            pk=job_id, status=SettlementJob.STATUS_PENDING
+        ).update(status=SettlementJob.STATUS_RUNNING, worker=worker_name, started_at=now, updated_at=now)
+        if claimed:
+            return SettlementJob.objects.select_related('draw').get(pk=job_id)
+    return None
+
+
+def run_job(job):
+    """작업 하나의 기본키 범위를 정산"""
+    tickets = Ticket.objects.filter(pk__range=(job.start_pk, job.end_pk))
+    if job.round_id:
+        tickets = tickets.filter(round_id=job.round_id)
+
+    # 다시 대기열에 들어가 다른 워커가 가져간 작업이면 이 워커는 아무것도 기록하지 않는다
+    owned = SettlementJob.objects.filter(pk=job.pk, status=SettlementJob.STATUS_RUNNING, worker=job.worker)
+
+    def report_progress(report):
+        owned.update(
+            processed=report.processed, last_pk=report.last_pk, updated_at=timezone.now()
+        )
+
+    try:
+        report = settle_draw(job.draw, tickets=tickets, record_result=False, progress=report_progress)
+    except Exception:
+        logger.exception("정산 작업 %s 실패", job.pk)
+        owned.update(
+            status=SettlementJob.STATUS_FAILED, error=traceback.format_exc(), finished_at=timezone.now()
+        )
+        raise
+
+    # 결과 누적과 완료 표시를 함께 커밋해야 작업이 다시 실행돼도 중복 집계되지 않는다
+    # 완료 표시를 먼저 해서 이 워커가 아직 작업을 가진 경우에만 결과를 누적한다
+    with transaction.atomic():
+        now = timezone.now()
+        finished = owned.update(
+            status=SettlementJob.STATUS_DONE,
+            processed=report.processed,
+            last_pk=job.end_pk,
+            updated_at=now,
+            finished_at=now,
+        )
+        if finished:
+            record_draw_result(job.draw, report.grade_counts)
+    if not finished:
+        logger.warning("정산 작업 %s는 다른 워커가 다시 가져가 결과를 기록하지 않음", job.pk)
+        return report
+    logger.info("정산 작업 %s 완료: %s", job.pk, report)
+    return report
+
+
+def run_pending_jobs(worker_name=None):
+    """대기 중인 작업이 없을 때까지 처리하고 처리한 작업 수를 반환"""
+    count = 0
+    while True:
+        job = claim_next_job(worker_name)
+        if job is None:
+            return count
+        try:
+            run_job(job)
+        except Exception:
+            pass  # 실패 내용은 작업에 기록됨, 다음 작업 계속 진행
+        count += 1
+
+
+def requeue_stale_jobs(stale_after=None):
+    """
+    갱신이 끊긴 진행 중 작업을 다시 대기 상태로 되돌림 (워커 비정상 종료 대비)
+
+    정산은 같은 결과를 다시 쓰므로 범위를 처음부터 다시 처리해도 안전하다.
+    """
+    stale_after = stale_after or settings.LOTTO_SETTLEMENT_STALE_AFTER
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    return SettlementJob.objects.filter(
+        status=SettlementJob.STATUS_RUNNING, updated_at__lt=cutoff
+    ).update(status=SettlementJob.STATUS_PENDING, worker='', processed=0, last_pk=None)
+
+
+def draw_progress(draw):
+    """추첨 정산 진행 상황 요약 (draw는 Draw 또는 CurrentDraw)"""
+    jobs = list(SettlementJob.objects.filter(draw_id=draw.id))
+    statuses = {job.status for job in jobs}
+    if not jobs:
+        status = None
+    elif SettlementJob.STATUS_FAILED in statuses:
+        status = SettlementJob.STATUS_FAILED
+    elif statuses == {SettlementJob.STATUS_DONE}:
+        status = SettlementJob.STATUS_DONE
+    elif statuses == {SettlementJob.STATUS_PENDING}:
+        status = SettlementJob.STATUS_PENDING
+    else:
+        status = SettlementJob.STATUS_RUNNING
+
+    spans = [max(job.end_pk - job.start_pk + 1, 1) for job in jobs]
+    total_span = sum(spans)
+    percent = (
+        100.0 * sum(job.progress * span for job, span in zip(jobs, spans)) / total_span
+        if total_span else 0.0
+    )
+    return {
+        "draw_id": draw.id,
+        "status": status,
+        "percent": round(percent, 1),
+        "processed": sum(job.processed for job in jobs),
+        "jobs": [
+            {
+                "id": job.id,
+                "start_pk": job.start_pk,
+                "end_pk": job.end_pk,
+                "status": job.status,
+                "processed": job.processed,
+                "worker": job.worker,
+            }
+            for job in jobs
+        ],
+    }
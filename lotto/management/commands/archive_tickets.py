@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from lotto.archive import archivable_rounds, archive_round
+from lotto.models import Round
+
+
+class Command(BaseCommand):
+    help = "정산이 끝난 이전 회차의 티켓을 보관 테이블(ArchivedTicket)로 옮김"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-rounds', type=int, default=None,
+            help="티켓 테이블에 남겨 둘 최근 추첨 회차 수 (기본값: settings.LOTTO_ARCHIVE_KEEP_ROUNDS)",
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help="한 트랜잭션에서 옮길 티켓 수 (기본값: settings.LOTTO_ARCHIVE_BATCH_SIZE)",
+        )
+        parser.add_argument('--round', type=int, dest='round_number', help="이 회차만 보관 (보관 가능한 회차여야 함)")
+        parser.add_argument('--dry-run', action='store_true', help="보관할 회차와 티켓 수만 출력")
+
+    def handle(self, *args, **options):
+        keep_rounds = options['keep_rounds']
+        if keep_rounds is not None and keep_rounds < 1:
+            raise CommandError("--keep-rounds는 1 이상이어야 합니다.")
+
+        rounds = archivable_rounds(keep_rounds)
+        if options['round_number'] is not None:
+            rounds = rounds.filter(number=options['round_number'])
+            if not rounds.exists():
+                status = Round.objects.filter(number=options['round_number']).first()
+                raise CommandError(
+                    f"제{options['round_number']}회는 보관할 수 없습니다"
+                    + (f" ({status.get_status_display()}, 최근 회차이거나 정산 중)." if status else " (없는 회차).")
+                )
+
+        rounds = list(rounds)
+        if not rounds:
+            self.stdout.write("보관할 회차가 없습니다.")
+            return
+
+        for sales_round in rounds:
+            count = sales_round.tickets.count()
+            if options['dry_run']:
+                self.stdout.write(f"제{sales_round.number}회: {count:,}장")
+                continue
+            started = time.monotonic()
+            moved = archive_round(
+                sales_round,
+                batch_size=options['batch_size'],
+                progress=lambda done, total=count, number=sales_round.number: self.stdout.write(
+                    f"  제{number}회 {done:,}/{total:,}"
+                ),
+            )
+            elapsed = time.monotonic() - started
+            self.stdout.write(self.style.SUCCESS(f"제{sales_round.number}회: {moved:,}장 보관 ({elapsed:.2f}초)"))
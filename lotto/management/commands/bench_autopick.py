@@ -0,0 +1,46 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from lotto.autopick import generate_picks, make_rng, picks_to_masks
+from lotto.utils import numbers_to_mask
+
+
+class Command(BaseCommand):
+    help = "자동 번호 생성 처리량 측정 (한 장씩 random.sample vs NumPy 일괄 생성)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=1000000, help="생성할 게임 수")
+        parser.add_argument(
+            '--baseline-count', type=int, default=200000,
+            help="random.sample 방식으로 생성할 게임 수 (느리므로 따로 지정)",
+        )
+        parser.add_argument('--seed', type=int, default=0, help="시드 난수원 시드")
+
+    def handle(self, *args, **options):
+        count = options['count']
+        seed = options['seed']
+        cases = [
+            ("random.sample (한 장씩)", options['baseline_count'], self._baseline),
+            ("numpy 시드", count, lambda n: picks_to_masks(generate_picks(n, make_rng(seed)))),
+            ("numpy 시드 + 중복 제거", count,
+             lambda n: picks_to_masks(generate_picks(n, make_rng(seed), unique=True))),
+            ("os.urandom", count, lambda n: picks_to_masks(generate_picks(n, make_rng(secure=True)))),
+            ("os.urandom + 중복 제거", count,
+             lambda n: picks_to_masks(generate_picks(n, make_rng(secure=True), unique=True))),
+        ]
+
+        self.stdout.write(f"{'방식':<24} {'게임 수':>12} {'시간(초)':>10} {'게임/초':>14} {'배율':>8}")
+        baseline = None
+        for label, n, func in cases:
+            started = time.perf_counter()
+            func(n)
+            elapsed = time.perf_counter() - started
+            rate = n / elapsed
+            baseline = baseline or rate
+            self.stdout.write(f"{label:<24} {n:>12,} {elapsed:>10.2f} {rate:>14,.0f} {rate / baseline:>7.1f}x")
+
+    def _baseline(self, count):
+        """기존 구매 경로와 같은 방식: 한 장씩 번호 생성·정렬 후 비트마스크 계산"""
+        return [numbers_to_mask(sorted(random.sample(range(1, 46), 6))) for _ in range(count)]
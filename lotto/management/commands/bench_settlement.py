@@ -0,0 +1,66 @@
+import os
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from lotto.autopick import iter_pick_batches, make_rng
+from lotto.models import Draw, Ticket
+from lotto.settlement import settle_tickets_parallel
+
+BENCH_USERNAME = '__bench_settlement__'
+
+
+class Command(BaseCommand):
+    help = "합성 티켓으로 parallel 정산의 워커 수별 처리량을 측정"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tickets', type=int, default=200000, help="생성할 합성 티켓 수")
+        parser.add_argument(
+            '--workers', default=None,
+            help="측정할 워커 수 목록 (쉼표로 구분, 기본값: 1부터 CPU 수까지 2배씩)",
+        )
+        parser.add_argument('--chunk-size', type=int, default=None, help="워커별 청크 크기")
+        parser.add_argument('--seed', type=int, default=0, help="합성 데이터 난수 시드")
+        parser.add_argument('--keep', action='store_true', help="측정 후 합성 데이터를 지우지 않음")
+
+    def handle(self, *args, **options):
+        workers_list = self._workers_list(options['workers'])
+        user, _ = User.objects.get_or_create(username=BENCH_USERNAME)
+        tickets = Ticket.objects.filter(user=user)
+
+        self.stdout.write(f"합성 티켓 {options['tickets']:,}장 생성 중...")
+        self._create_tickets(user, options['tickets'], options['seed'])
+        draw = Draw.objects.create(numbers="3,11,19,27,35,43", bonus_number=7, is_active=False)
+
+        try:
+            self.stdout.write(f"{'워커':>6} {'시간(초)':>10} {'장/초':>12} {'속도 향상':>10}")
+            baseline = None
+            for workers in workers_list:
+                started = time.perf_counter()
+                settle_tickets_parallel(draw, tickets=tickets, workers=workers, chunk_size=options['chunk_size'])
+                elapsed = time.perf_counter() - started
+                baseline = baseline or elapsed
+                self.stdout.write(
+                    f"{workers:>6} {elapsed:>10.2f} {options['tickets'] / elapsed:>12,.0f} {baseline / elapsed:>9.2f}x"
+                )
+        finally:
+            if not options['keep']:
+                tickets.delete()
+                draw.delete()
+                user.delete()
+
+    def _workers_list(self, value):
+        if value:
+            return [int(w) for w in value.split(',')]
+        workers, limit = [1], os.cpu_count() or 1
+        while workers[-1] * 2 <= limit:
+            workers.append(workers[-1] * 2)
+        return workers
+
+    def _create_tickets(self, user, count, seed, batch_size=10000):
+        for picks, masks in iter_pick_batches(count, batch_size, make_rng(seed)):
+            Ticket.objects.bulk_create(
+                Ticket(user=user, numbers=",".join(map(str, row)), numbers_mask=int(mask), is_auto=True)
+                for row, mask in zip(picks.tolist(), masks.tolist())
+            )
@@ -0,0 +1,90 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+
+from lotto.benchmarks import compare_results, query_growth, run_suite
+from lotto.draws import invalidate_current_draw
+
+
+class Command(BaseCommand):
+    help = "정산·구매·조회 성능 측정 (JSON 결과, 기준 결과와 비교해 회귀 검출)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default='10000,100000',
+            help="회차별 판매 티켓 수 목록 (쉼표로 구분, 예: 10000,100000,1000000)",
+        )
+        parser.add_argument(
+            '--modes', default='chunked,sql',
+            help="측정할 정산 방식 (쉼표로 구분, parallel은 파일 DB에서만 의미 있음)",
+        )
+        parser.add_argument('--users', type=int, default=1000, help="합성 사용자 수")
+        parser.add_argument('--repeat', type=int, default=20, help="화면별 반복 요청 수")
+        parser.add_argument('--grade-samples', type=int, default=200000, help="등급 계산 처리량 측정 게임 수")
+        parser.add_argument('--seed', type=int, default=0, help="난수 시드")
+        parser.add_argument('--output', help="결과 JSON 파일 경로 (없으면 표준 출력)")
+        parser.add_argument('--baseline', help="비교할 기준 결과 JSON 파일")
+        parser.add_argument(
+            '--threshold', type=float, default=0.25,
+            help="기준 대비 허용 시간 증가 비율 (기본 0.25 = 25%%)",
+        )
+        parser.add_argument(
+            '--in-place', action='store_true',
+            help="임시 테스트 DB를 만들지 않고 현재 DB에 합성 데이터를 넣어 측정 (측정 전용 DB에서만 사용)",
+        )
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        modes = [mode.strip() for mode in options['modes'].split(',') if mode.strip()]
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as f:
+                baseline = json.load(f)
+
+        # 측정 중 만든 추첨이 실제 서비스 캐시에 남지 않도록 앞뒤로 비움
+        invalidate_current_draw()
+        old_name = None
+        if not options['in_place']:
+            old_name = connection.settings_dict['NAME']
+            connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(ALLOWED_HOSTS=['testserver']):
+                results = run_suite(
+                    sizes,
+                    modes=modes,
+                    users=options['users'],
+                    repeat=options['repeat'],
+                    grade_samples=options['grade_samples'],
+                    seed=options['seed'],
+                    log=self.stderr.write,
+                )
+        finally:
+            if old_name is not None:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+            invalidate_current_draw()
+
+        for record in results['records']:
+            if 'seconds' in record:
+                timing = f"{record['seconds']:.4f}s" + (f" ({record['per_sec']:,}/s)" if record['per_sec'] else "")
+            else:
+                timing = f"p50 {record['p50_ms']:.1f}ms / p95 {record['p95_ms']:.1f}ms"
+            queries = f", 쿼리 {record['queries']}" if 'queries' in record else ""
+            self.stderr.write(f"  {record['name']:<32} {record['size']:>10,}  {timing}{queries}")
+
+        regressions = query_growth(results['records'])
+        if baseline:
+            regressions += compare_results(results, baseline, options['threshold'])
+        results['regressions'] = regressions
+
+        payload = json.dumps(results, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(payload + '\n')
+        else:
+            self.stdout.write(payload)
+
+        if regressions:
+            raise CommandError("성능 회귀 {}건:\n  {}".format(len(regressions), "\n  ".join(regressions)))
+        self.stderr.write(self.style.SUCCESS("회귀 없음"))
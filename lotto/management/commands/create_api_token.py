@@ -0,0 +1,21 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from lotto.models import ApiToken
+
+
+class Command(BaseCommand):
+    help = "JSON API 인증 토큰 발급 (키 원문은 이때 한 번만 출력됨)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help="토큰을 발급할 사용자명")
+        parser.add_argument('--name', default='', help="토큰 이름 (단말기 이름 등)")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"사용자를 찾을 수 없습니다: {options['username']}")
+
+        token, key = ApiToken.issue(user, name=options['name'])
+        self.stdout.write(self.style.SUCCESS(f"토큰이 발급되었습니다 ({token.prefix}…): {key}"))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from lotto.export import EXPORT_KINDS, available_formats, iter_export
+from lotto.models import Draw
+
+
+class Command(BaseCommand):
+    help = "추첨별 티켓 또는 당첨자 전체를 CSV/Parquet 파일로 내보내기 (메모리 사용량 일정)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('draw_id', type=int, help="추첨 ID")
+        parser.add_argument('--kind', choices=EXPORT_KINDS, default='tickets', help="내보낼 대상")
+        parser.add_argument('--format', choices=('csv', 'parquet'), default='csv', help="파일 형식")
+        parser.add_argument('--output', '-o', default=None, help="저장할 파일 경로 (CSV는 생략하면 표준 출력)")
+
+    def handle(self, *args, **options):
+        draw_id, kind, fmt, output = options['draw_id'], options['kind'], options['format'], options['output']
+        if fmt not in available_formats():
+            raise CommandError("Parquet 형식으로 내보내려면 pyarrow가 필요합니다.")
+        if fmt == 'parquet' and not output:
+            raise CommandError("Parquet 형식은 --output 경로가 필요합니다.")
+        if not Draw.objects.filter(id=draw_id).exists():
+            raise CommandError(f"추첨 {draw_id}을(를) 찾을 수 없습니다.")
+
+        chunks = iter_export(draw_id, kind, fmt)
+        if output is None:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+
+        if fmt == 'parquet':
+            f = open(output, 'wb')
+        else:
+            f = open(output, 'w', encoding='utf-8', newline='')
+        with f:
+            for chunk in chunks:
+                f.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f"{output}에 저장했습니다."))
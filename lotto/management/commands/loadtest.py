@@ -0,0 +1,102 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "실행 중인 서버에 동시 요청을 보내 처리량과 응답 시간을 측정 "
+        "(WSGI/ASGI 서버 주소를 함께 넘기면 나란히 비교)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'urls', nargs='+',
+            help="측정할 URL (예: http://127.0.0.1:8000/my-tickets/ http://127.0.0.1:8001/my-tickets/)",
+        )
+        parser.add_argument('--concurrency', type=int, default=100, help="동시 요청 수")
+        parser.add_argument('--requests', type=int, default=2000, help="URL별 총 요청 수")
+        parser.add_argument('--session', default=None, help="로그인 세션 쿠키(sessionid) 값")
+        parser.add_argument(
+            '--header', action='append', default=[],
+            help="추가 요청 헤더 (예: --header 'Authorization: Token ...', 여러 번 지정 가능)",
+        )
+        parser.add_argument('--timeout', type=float, default=30.0, help="요청별 제한 시간(초)")
+
+    def handle(self, *args, **options):
+        headers = [h.strip() for h in options['header']]
+        if options['session']:
+            headers.append(f"Cookie: sessionid={options['session']}")
+
+        self.stdout.write(
+            f"{'URL':<45} {'요청/초':>10} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'오류':>6}"
+        )
+        for url in options['urls']:
+            report = asyncio.run(self._run(url, headers, options))
+            self.stdout.write(
+                f"{url:<45} {report['rps']:>10,.1f} {report['p50']:>9.1f} "
+                f"{report['p95']:>9.1f} {report['p99']:>9.1f} {report['errors']:>6}"
+            )
+
+    async def _run(self, url, headers, options):
+        parts = urlsplit(url)
+        if parts.scheme != 'http' or not parts.hostname:
+            raise CommandError(f"http:// 주소만 측정할 수 있습니다: {url}")
+        target = (parts.hostname, parts.port or 80)
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        request = "\r\n".join([
+            f"GET {path} HTTP/1.1",
+            f"Host: {parts.netloc}",
+            "Connection: close",
+            *headers,
+            "", "",
+        ]).encode()
+
+        remaining = options['requests']
+        latencies, errors = [], 0
+
+        async def worker():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                try:
+                    status = await asyncio.wait_for(self._request(target, request), options['timeout'])
+                except (OSError, asyncio.TimeoutError):
+                    status = None
+                if status is None or status >= 400:
+                    errors += 1
+                else:
+                    latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(options['concurrency'])))
+        elapsed = time.perf_counter() - started
+
+        if len(latencies) < 2:
+            raise CommandError(f"성공한 응답이 부족합니다 ({url}, 오류 {errors}건)")
+        cuts = statistics.quantiles(latencies, n=100)
+        return {
+            "rps": len(latencies) / elapsed,
+            "p50": cuts[49],
+            "p95": cuts[94],
+            "p99": cuts[98],
+            "errors": errors,
+        }
+
+    async def _request(self, target, request):
+        reader, writer = await asyncio.open_connection(*target)
+        try:
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+            # 본문까지 모두 받아야 응답 시간에 포함된다
+            await reader.read()
+            return int(status_line.split()[1])
+        except (IndexError, ValueError):
+            return None
+        finally:
+            writer.close()
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from lotto.exposure import rebuild_exposure
+
+
+class Command(BaseCommand):
+    help = "현재 회차 티켓으로부터 번호·조합 노출 집계(NumberExposure, ComboExposure)를 다시 계산"
+
+    def handle(self, *args, **options):
+        cells, combos = rebuild_exposure()
+        self.stdout.write(self.style.SUCCESS(f"번호·쌍 {cells}행, 조합 {combos}행을 다시 만들었습니다."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from lotto.sales import rebuild_sales_rollup
+
+
+class Command(BaseCommand):
+    help = "티켓 테이블 전체로부터 판매 집계(SalesRollup, UserSalesRollup, SalesTotal, NumberRollup)를 다시 계산"
+
+    def handle(self, *args, **options):
+        count = rebuild_sales_rollup()
+        self.stdout.write(self.style.SUCCESS(f"판매 집계 {count}행을 다시 만들었습니다."))
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from lotto.exposure import rebuild_exposure
+from lotto.sales import rebuild_sales_rollup
+from lotto.seeding import DISTRIBUTIONS, create_seed_users, seed_tickets
+
+
+class Command(BaseCommand):
+    help = "성능 측정용 합성 사용자·티켓 생성 (같은 시드면 같은 데이터)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help="생성할 사용자 수")
+        parser.add_argument('--tickets', type=int, default=100000, help="생성할 티켓 수")
+        parser.add_argument('--auto-ratio', type=float, default=0.7, help="자동 구매 비율 (0~1)")
+        parser.add_argument('--days', type=int, default=30, help="구매 시각을 흩뿌릴 최근 일수")
+        parser.add_argument(
+            '--distribution', choices=DISTRIBUTIONS, default='uniform',
+            help="구매 시각 분포 (uniform: 고르게, recent: 최근일수록 많이)",
+        )
+        parser.add_argument('--workers', type=int, default=1, help="생성 프로세스 수 (SQLite는 항상 1)")
+        parser.add_argument('--batch-size', type=int, default=10000, help="한 번에 넣을 티켓 수")
+        parser.add_argument('--seed', type=int, default=0, help="난수 시드")
+        parser.add_argument('--prefix', default='seed_user_', help="합성 사용자명 접두사")
+        parser.add_argument(
+            '--no-rebuild', action='store_true',
+            help="판매 집계·노출 집계를 다시 계산하지 않음 (여러 번 나눠 생성할 때 마지막에만 계산)",
+        )
+
+    def handle(self, *args, **options):
+        if not 0 <= options['auto_ratio'] <= 1:
+            raise CommandError("--auto-ratio는 0~1 사이여야 합니다.")
+        if options['users'] < 1 or options['tickets'] < 0:
+            raise CommandError("--users는 1 이상, --tickets는 0 이상이어야 합니다.")
+
+        user_ids = create_seed_users(options['users'], prefix=options['prefix'])
+        self.stdout.write(f"사용자 {len(user_ids):,}명 준비")
+
+        elapsed = seed_tickets(
+            options['tickets'],
+            user_ids,
+            seed=options['seed'],
+            workers=options['workers'],
+            progress=lambda done, total: self.stdout.write(f"  티켓 {done:,}/{total:,}"),
+            auto_ratio=options['auto_ratio'],
+            days=options['days'],
+            distribution=options['distribution'],
+            batch_size=options['batch_size'],
+        )
+        rate = options['tickets'] / elapsed if elapsed else 0
+        self.stdout.write(f"티켓 {options['tickets']:,}장 생성: {elapsed:.2f}초 ({rate:,.0f}장/초)")
+
+        if not options['no_rebuild']:
+            rebuild_sales_rollup()
+            cells, combos = rebuild_exposure()
+            self.stdout.write(f"판매 집계·노출 집계 재계산 완료 (번호·쌍 {cells}행, 조합 {combos:,}행)")
+        self.stdout.write(self.style.SUCCESS("완료"))
@@ -0,0 +1,50 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from lotto.jobs import claim_next_job, default_worker_name, requeue_stale_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = "대기 중인 추첨 정산 작업을 처리하는 워커 (여러 프로세스를 동시에 실행 가능)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help="대기 중인 작업을 모두 처리하면 종료",
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=settings.LOTTO_SETTLEMENT_POLL_INTERVAL,
+            help="작업이 없을 때 다시 확인하기까지 대기할 시간(초)",
+        )
+        parser.add_argument(
+            '--name', default=None,
+            help="작업에 기록할 워커 이름 (기본값: 호스트명:PID)",
+        )
+
+    def handle(self, *args, **options):
+        worker_name = options['name'] or default_worker_name()
+        self.stdout.write(f"정산 워커 시작: {worker_name}")
+
+        while True:
+            requeued = requeue_stale_jobs()
+            if requeued:
+                self.stdout.write(self.style.WARNING(f"중단된 작업 {requeued}개를 다시 대기열에 넣었습니다."))
+
+            job = claim_next_job(worker_name)
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            self.stdout.write(f"작업 시작: {job}")
+            try:
+                report = run_job(job)
+            except Exception as exc:
+                self.stderr.write(self.style.ERROR(f"작업 {job.id} 실패: {exc}"))
+                continue
+            self.stdout.write(self.style.SUCCESS(f"작업 {job.id} 완료: {report}"))
+
+        self.stdout.write("정산 워커 종료")
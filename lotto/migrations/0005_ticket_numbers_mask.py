@@ -0,0 +1,38 @@
+from django.db import migrations, models
+
+
+def fill_numbers_mask(apps, schema_editor):
+    """기존 티켓의 번호 문자열로부터 비트마스크 채우기"""
+    from lotto.utils import numbers_to_mask
+
+    Ticket = apps.get_model('lotto', 'Ticket')
+    last_pk = 0
+    while True:
+        batch = list(
+            Ticket.objects.filter(pk__gt=last_pk).order_by('pk').only('id', 'numbers')[:2000]
+        )
+        if not batch:
+            break
+        for ticket in batch:
+            if ticket.numbers:
+                ticket.numbers_mask = numbers_to_mask(
+                    int(n.strip()) for n in ticket.numbers.split(',')
+                )
+        Ticket.objects.bulk_update(batch, ['numbers_mask'])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotto', '0004_alter_draw_options_alter_ticket_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='numbers_mask',
+            field=models.BigIntegerField(default=0, verbose_name='번호 비트마스크'),
+        ),
+        migrations.RunPython(fill_numbers_mask, migrations.RunPython.noop),
+    ]
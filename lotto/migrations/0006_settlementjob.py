@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotto', '0005_ticket_numbers_mask'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SettlementJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_pk', models.BigIntegerField(verbose_name='시작 티켓 ID')),
+                ('end_pk', models.BigIntegerField(verbose_name='끝 티켓 ID')),
+                ('last_pk', models.BigIntegerField(blank=True, null=True, verbose_name='마지막 처리 티켓 ID')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '진행 중'), ('done', '완료'), ('failed', '실패')], default='pending', max_length=10, verbose_name='상태')),
+                ('processed', models.IntegerField(default=0, verbose_name='처리한 티켓 수')),
+                ('worker', models.CharField(blank=True, max_length=100, verbose_name='워커')),
+                ('error', models.TextField(blank=True, verbose_name='오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일시')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='시작일시')),
+                ('updated_at', models.DateTimeField(blank=True, null=True, verbose_name='최근 갱신일시')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='완료일시')),
+                ('draw', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='settlement_jobs', to='lotto.draw', verbose_name='추첨')),
+            ],
+            options={
+                'verbose_name': '정산 작업',
+                'verbose_name_plural': '정산 작업',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'id'], name='lotto_job_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_draw_results(apps, schema_editor):
+    """이미 정산된 추첨의 결과 요약 채우기"""
+    Draw = apps.get_model('lotto', 'Draw')
+    DrawResult = apps.get_model('lotto', 'DrawResult')
+    Ticket = apps.get_model('lotto', 'Ticket')
+    for draw in Draw.objects.all():
+        counts = dict(
+            Ticket.objects.filter(draw=draw).order_by()
+            .values_list('winning_grade').annotate(count=Count('id'))
+        )
+        if not counts:
+            continue
+        DrawResult.objects.create(
+            draw=draw,
+            total_tickets=sum(counts.values()),
+            **{f'grade{grade}_count': counts.get(grade, 0) for grade in range(1, 6)},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotto', '0006_settlementjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DrawResult',
+            fields=[
+                ('draw', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='result', serialize=False, to='lotto.draw', verbose_name='추첨')),
+                ('total_tickets', models.IntegerField(default=0, verbose_name='정산한 티켓 수')),
+                ('grade1_count', models.IntegerField(default=0, verbose_name='1등 수')),
+                ('grade2_count', models.IntegerField(default=0, verbose_name='2등 수')),
+                ('grade3_count', models.IntegerField(default=0, verbose_name='3등 수')),
+                ('grade4_count', models.IntegerField(default=0, verbose_name='4등 수')),
+                ('grade5_count', models.IntegerField(default=0, verbose_name='5등 수')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='최근 갱신일시')),
+            ],
+            options={
+                'verbose_name': '추첨 결과 요약',
+                'verbose_name_plural': '추첨 결과 요약',
+            },
+        ),
+        migrations.RunPython(fill_draw_results, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotto', '0007_drawresult'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='lotto_ticket_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(condition=models.Q(('winning_grade__gt', 0)), fields=['draw', '-winning_grade', 'created_at'], name='lotto_ticket_draw_winner_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['created_at'], name='lotto_ticket_created_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def fill_sales_rollup(apps, schema_editor):
+    """기존 티켓으로 판매 집계 채우기"""
+    SalesRollup = apps.get_model('lotto', 'SalesRollup')
+    Ticket = apps.get_model('lotto', 'Ticket')
+    rows = (
+        Ticket.objects.order_by()
+        .annotate(date=TruncDate('created_at'))
+        .values_list('date', 'user_id', 'is_auto')
+        .annotate(count=Count('id'))
+    )
+    SalesRollup.objects.bulk_create(
+        (
+            SalesRollup(date=date, user_id=user_id, is_auto=is_auto, ticket_count=count)
+            for date, user_id, is_auto, count in rows
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotto', '0008_ticket_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='판매일')),
+                ('is_auto', models.BooleanField(verbose_name='자동 구매')),
+                ('ticket_count', models.IntegerField(default=0, verbose_name='판매 수')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales_rollups', to=settings.AUTH_USER_MODEL, verbose_name='사용자')),
+            ],
+            options={
+                'verbose_name': '판매 집계',
+                'verbose_name_plural': '판매 집계',
+                'ordering': ['-date'],
+                'constraints': [models.UniqueConstraint(fields=('date', 'user', 'is_auto'), name='lotto_sales_rollup_unique')],
+            },
+        ),
+        migrations.RunPython(fill_sales_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotto', '0009_salesrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApiToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=100, verbose_name='이름')),
+                ('key_hash', models.CharField(max_length=64, unique=True, verbose_name='키 해시')),
+                ('prefix', models.CharField(max_length=8, verbose_name='키 앞자리')),
+                ('is_active', models.BooleanField(default=True, verbose_name='활성화')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일시')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='api_tokens', to=settings.AUTH_USER_MODEL, verbose_name='사용자')),
+            ],
+            options={
+                'verbose_name': 'API 토큰',
+                'verbose_name_plural': 'API 토큰',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_ticket_numbers(apps, schema_editor):
+    """기존 티켓의 번호 비트마스크로부터 번호별 행 채우기"""
+    from lotto.utils import mask_to_numbers
+
+    Ticket = apps.get_model('lotto', 'Ticket')
+    TicketNumber = apps.get_model('lotto', 'TicketNumber')
+    last_pk = 0
+    while True:
+        batch = list(
+            Ticket.objects.filter(pk__gt=last_pk).order_by('pk').values_list('id', 'numbers_mask')[:2000]
+        )
+        if not batch:
+            break
+        TicketNumber.objects.bulk_create(
+            TicketNumber(ticket_id=ticket_id, number=n)
+            for ticket_id, mask in batch
+            for n in mask_to_numbers(mask)
+        )
+        last_pk = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotto', '0010_apitoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketNumber',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveSmallIntegerField(verbose_name='번호')),
+                ('ticket', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='number_rows', to='lotto.ticket')),
+            ],
+            options={
+                'verbose_name': '티켓 번호',
+                'verbose_name_plural': '티켓 번호',
+                'indexes': [models.Index(fields=['number', 'ticket'], name='lotto_ticketnumber_number_idx')],
+                'constraints': [models.UniqueConstraint(fields=('ticket', 'number'), name='lotto_ticketnumber_unique')],
+            },
+        ),
+        migrations.RunPython(fill_ticket_numbers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:43
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_exposure(apps, schema_editor):
+    """기존 티켓으로 번호·조합 노출 집계 채우기"""
+    from lotto.utils import number_cooccurrence
+
+    Ticket = apps.get_model('lotto', 'Ticket')
+    NumberExposure = apps.get_model('lotto', 'NumberExposure')
+    ComboExposure = apps.get_model('lotto', 'ComboExposure')
+
+    matrix = number_cooccurrence([])
+    last_pk = 0
+    while True:
+        batch = list(
+            Ticket.objects.filter(pk__gt=last_pk).order_by('pk').values_list('id', 'numbers_mask')[:20000]
+        )
+        if not batch:
+            break
+        matrix += number_cooccurrence([mask for _, mask in batch])
+        last_pk = batch[-1][0]
+
+    NumberExposure.objects.bulk_create(
+        NumberExposure(id=first * 46 + second, first=first, second=second, ticket_count=int(matrix[first, second]))
+        for first in range(1, 46)
+        for second in range(first, 46)
+        if matrix[first, second]
+    )
+    ComboExposure.objects.bulk_create(
+        (
+            ComboExposure(mask=mask, ticket_count=count)
+            for mask, count in Ticket.objects.order_by().values_list('numbers_mask').annotate(count=Count('id'))
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotto', '0011_ticketnumber'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComboExposure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mask', models.BigIntegerField(unique=True, verbose_name='번호 비트마스크')),
+                ('ticket_count', models.IntegerField(default=0, verbose_name='티켓 수')),
+            ],
+            options={
+                'verbose_name': '조합 노출',
+                'verbose_name_plural': '조합 노출',
+            },
+        ),
+        migrations.CreateModel(
+            name='NumberExposure',
+            fields=[
+                ('id', models.PositiveSmallIntegerField(primary_key=True, serialize=False)),
+                ('first', models.PositiveSmallIntegerField(verbose_name='번호 1')),
+                ('second', models.PositiveSmallIntegerField(verbose_name='번호 2')),
+                ('ticket_count', models.BigIntegerField(default=0, verbose_name='티켓 수')),
+            ],
+            options={
+                'verbose_name': '번호 노출',
+                'verbose_name_plural': '번호 노출',
+            },
+        ),
+        migrations.RunPython(fill_exposure, migrations.RunPython.noop),
+    ]
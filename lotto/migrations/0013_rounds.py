@@ -0,0 +1,100 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:02
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def assign_rounds(apps, schema_editor):
+    """
+    기존 추첨마다 회차를 만들고 티켓을 구매 시각으로 회차에 묶기
+
+    이전 추첨 이후 ~ 이 추첨 시각까지 산 티켓이 그 추첨의 회차이고,
+    마지막 추첨 이후에 산 티켓은 새로 여는 판매 중 회차로 간다.
+    노출 집계는 판매 중 회차 티켓만으로 다시 계산한다.
+    """
+    from lotto.utils import number_cooccurrence
+
+    Round = apps.get_model('lotto', 'Round')
+    Draw = apps.get_model('lotto', 'Draw')
+    Ticket = apps.get_model('lotto', 'Ticket')
+    NumberExposure = apps.get_model('lotto', 'NumberExposure')
+    ComboExposure = apps.get_model('lotto', 'ComboExposure')
+
+    opened_at = Ticket.objects.aggregate(first=Min('created_at'))['first'] or django.utils.timezone.now()
+    number = 0
+    for draw in Draw.objects.filter(drawn_at__isnull=False).order_by('drawn_at', 'id'):
+        number += 1
+        drawn_round = Round.objects.create(
+            number=number, status='drawn', opened_at=opened_at, closed_at=draw.drawn_at, draw=draw,
+        )
+        Ticket.objects.filter(round__isnull=True, created_at__lte=draw.drawn_at).update(round=drawn_round)
+        opened_at = draw.drawn_at
+
+    open_round = Round.objects.create(number=number + 1, status='open', opened_at=opened_at)
+    Ticket.objects.filter(round__isnull=True).update(round=open_round)
+    if not number:
+        return
+
+    tickets = Ticket.objects.filter(round=open_round)
+    matrix = number_cooccurrence(list(tickets.values_list('numbers_mask', flat=True)))
+    NumberExposure.objects.all().delete()
+    ComboExposure.objects.all().delete()
+    NumberExposure.objects.bulk_create(
+        NumberExposure(id=first * 46 + second, first=first, second=second, ticket_count=int(matrix[first, second]))
+        for first in range(1, 46)
+        for second in range(first, 46)
+        if matrix[first, second]
+    )
+    ComboExposure.objects.bulk_create(
+        (
+            ComboExposure(mask=mask, ticket_count=count)
+            for mask, count in tickets.order_by().values_list('numbers_mask').annotate(count=Count('id'))
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotto', '0012_exposure'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Round',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField(unique=True, verbose_name='회차')),
+                ('status', models.CharField(choices=[('open', '판매 중'), ('closed', '판매 마감'), ('drawn', '추첨 완료')], default='open', max_length=10, verbose_name='상태')),
+                ('opened_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='판매 시작일시')),
+                ('sales_close_at', models.DateTimeField(blank=True, null=True, verbose_name='판매 마감 예정일시')),
+                ('closed_at', models.DateTimeField(blank=True, null=True, verbose_name='판매 마감일시')),
+                ('draw', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='round', to='lotto.draw', verbose_name='추첨')),
+            ],
+            options={
+                'verbose_name': '회차',
+                'verbose_name_plural': '회차',
+                'ordering': ['-number'],
+            },
+        ),
+        migrations.AddField(
+            model_name='settlementjob',
+            name='round',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='settlement_jobs', to='lotto.round', verbose_name='회차'),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='round',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='tickets', to='lotto.round', verbose_name='회차'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['round', 'id'], name='lotto_ticket_round_idx'),
+        ),
+        migrations.RunPython(assign_rounds, migrations.RunPython.noop),
+    ]
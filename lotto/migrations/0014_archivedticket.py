@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:08
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotto', '0013_rounds'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='round',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='티켓 보관일시'),
+        ),
+        migrations.CreateModel(
+            name='ArchivedTicket',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('numbers', models.CharField(max_length=100)),
+                ('numbers_mask', models.BigIntegerField(default=0, verbose_name='번호 비트마스크')),
+                ('is_auto', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('winning_grade', models.IntegerField(choices=[(0, '낙첨'), (1, '1등'), (2, '2등'), (3, '3등'), (4, '4등'), (5, '5등')], default=0, verbose_name='당첨 등급')),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='보관일시')),
+                ('draw', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_tickets', to='lotto.draw')),
+                ('round', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archived_tickets', to='lotto.round', verbose_name='회차')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tickets', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '보관 티켓',
+                'verbose_name_plural': '보관 티켓',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', '-created_at', '-id'], name='lotto_archived_user_idx'), models.Index(condition=models.Q(('winning_grade__gt', 0)), fields=['draw', 'winning_grade', 'id'], name='lotto_archived_winner_idx'), models.Index(fields=['round', 'id'], name='lotto_archived_round_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotto', '0014_archivedticket'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='drawresult',
+            name='top_tiers_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='1~3등 확정일시'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['round', 'numbers_mask'], name='lotto_ticket_round_combo_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:40
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_number_rollup(apps, schema_editor):
+    """기존 티켓·보관 티켓의 번호 조합으로 번호별 판매 집계 채우기"""
+    from lotto.utils import mask_to_numbers
+
+    NumberRollup = apps.get_model('lotto', 'NumberRollup')
+    counts = Counter()
+    for name in ('Ticket', 'ArchivedTicket'):
+        model = apps.get_model('lotto', name)
+        combos = model.objects.order_by().values_list('numbers_mask').annotate(count=Count('id'))
+        for mask, count in combos.iterator():
+            for number in mask_to_numbers(mask):
+                counts[number] += count
+    NumberRollup.objects.bulk_create(
+        NumberRollup(number=number, ticket_count=count) for number, count in counts.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotto', '0015_top_tier_lookup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NumberRollup',
+            fields=[
+                ('number', models.PositiveSmallIntegerField(primary_key=True, serialize=False, verbose_name='번호')),
+                ('ticket_count', models.BigIntegerField(default=0, verbose_name='티켓 수')),
+            ],
+            options={
+                'verbose_name': '번호별 판매 집계',
+                'verbose_name_plural': '번호별 판매 집계',
+            },
+        ),
+        migrations.RunPython(fill_number_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotto', '0016_number_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='round',
+            name='archiving_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='티켓 보관 시작일시'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def fill_sales_totals(apps, schema_editor):
+    """기존 판매 집계로 사용자별·구매 방식별 전체 집계 채우기"""
+    SalesRollup = apps.get_model('lotto', 'SalesRollup')
+    UserSalesRollup = apps.get_model('lotto', 'UserSalesRollup')
+    SalesTotal = apps.get_model('lotto', 'SalesTotal')
+    rollups = SalesRollup.objects.order_by()
+    UserSalesRollup.objects.bulk_create(
+        (
+            UserSalesRollup(user_id=user_id, ticket_count=count)
+            for user_id, count in rollups.values_list('user_id').annotate(count=Sum('ticket_count')).iterator()
+        ),
+        batch_size=1000,
+    )
+    SalesTotal.objects.bulk_create(
+        SalesTotal(is_auto=is_auto, ticket_count=count)
+        for is_auto, count in rollups.values_list('is_auto').annotate(count=Sum('ticket_count'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('lotto', '0017_round_archiving_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesTotal',
+            fields=[
+                ('is_auto', models.BooleanField(primary_key=True, serialize=False, verbose_name='자동 구매')),
+                ('ticket_count', models.BigIntegerField(default=0, verbose_name='판매 수')),
+            ],
+            options={
+                'verbose_name': '전체 판매 집계',
+                'verbose_name_plural': '전체 판매 집계',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserSalesRollup',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='sales_total', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='사용자')),
+                ('ticket_count', models.BigIntegerField(default=0, verbose_name='판매 수')),
+            ],
+            options={
+                'verbose_name': '사용자별 판매 집계',
+                'verbose_name_plural': '사용자별 판매 집계',
+                'indexes': [models.Index(fields=['-ticket_count'], name='lotto_user_sales_count_idx')],
+            },
+        ),
+        migrations.RunPython(fill_sales_totals, migrations.RunPython.noop),
+    ]
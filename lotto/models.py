@@ -1,5 +1,13 @@
-from django.db import models
+import hashlib
+import secrets
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, models, transaction
 from django.contrib.auth.models import User
+from django.utils import timezone
+from .utils import numbers_to_mask
 
 class Ticket(models.Model):
     WINNING_GRADE_CHOICES = [
@@ -13,24 +21,232 @@ class Ticket(models.Model):
     
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     numbers = models.CharField(max_length=100)  # "1,2,3,4,5,6" 이런 식
+    numbers_mask = models.BigIntegerField(default=0, verbose_name='번호 비트마스크')  # n번 번호 → n번째 비트
     is_auto = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     winning_grade = models.IntegerField(default=0, choices=WINNING_GRADE_CHOICES, verbose_name='당첨 등급')
     draw = models.ForeignKey('Draw', on_delete=models.SET_NULL, null=True, blank=True, related_name='tickets')
+    # 구매 시 판매 중인 회차 (인덱스는 아래 (round, id) 복합 인덱스 사용)
+    round = models.ForeignKey(
+        'Round', on_delete=models.PROTECT, null=True, blank=True, related_name='tickets',
+        db_index=False, verbose_name='회차',
+    )
 
     class Meta:
         verbose_name = '로또 티켓'
         verbose_name_plural = '로또 티켓'
         ordering = ['-created_at']
+        indexes = [
+            # 추첨 정산: 회차의 티켓만 기본키 순으로 읽음
+            models.Index(fields=['round', 'id'], name='lotto_ticket_round_idx'),
+            # 1~3등 먼저 찾기: 회차 안에서 번호 조합(비트마스크)으로 조회
+            models.Index(fields=['round', 'numbers_mask'], name='lotto_ticket_round_combo_idx'),
+            # my_tickets: 사용자별 최신순
+            models.Index(fields=['user', '-created_at', '-id'], name='lotto_ticket_user_created_idx'),
+            # admin_winners: 추첨별 당첨 티켓 (낙첨 티켓은 색인하지 않음)
+            models.Index(
+                fields=['draw', '-winning_grade', 'created_at'],
+                name='lotto_ticket_draw_winner_idx',
+                condition=models.Q(winning_grade__gt=0),
+            ),
+            # admin_sales: 기간별 판매 통계
+            models.Index(fields=['created_at'], name='lotto_ticket_created_idx'),
+        ]
 
     def __str__(self):
         return f"티켓 {self.id} - {self.user.username}"
 
+    def save(self, *args, **kwargs):
+        # 번호 문자열이 바뀌어도 비트마스크가 항상 함께 저장되도록 한다
+        if self.numbers:
+            self.numbers_mask = numbers_to_mask(self.get_numbers_list())
+        adding = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        if adding and self.round_id is None:
+            self.round = Round.current()
+        super().save(*args, **kwargs)
+        # 번호별 행(TicketNumber)도 함께 맞춘다 (bulk_create는 issue_tickets에서 직접 처리)
+        if self.numbers and (update_fields is None or 'numbers' in update_fields):
+            if not adding:
+                self.number_rows.all().delete()
+            TicketNumber.objects.bulk_create(TicketNumber.rows_for(self.id, self.get_numbers_list()))
+
     def get_numbers_list(self):
         """번호 문자열을 리스트로 변환"""
         return [int(n.strip()) for n in self.numbers.split(',')]
 
 
+class TicketNumber(models.Model):
+    """티켓 번호 정규화 테이블 (티켓당 번호 6행, 번호별 검색·집계용)"""
+    ticket = models.ForeignKey(Ticket, on_delete=models.CASCADE, related_name='number_rows')
+    number = models.PositiveSmallIntegerField(verbose_name='번호')
+
+    class Meta:
+        verbose_name = '티켓 번호'
+        verbose_name_plural = '티켓 번호'
+        constraints = [
+            models.UniqueConstraint(fields=['ticket', 'number'], name='lotto_ticketnumber_unique'),
+        ]
+        indexes = [
+            # 번호별 티켓 검색·번호별 선택 횟수 집계 (인덱스만 읽음)
+            models.Index(fields=['number', 'ticket'], name='lotto_ticketnumber_number_idx'),
+        ]
+
+    def __str__(self):
+        return f"티켓 {self.ticket_id} - {self.number}"
+
+    @classmethod
+    def rows_for(cls, ticket_id, numbers):
+        """티켓 하나의 번호 행 목록 (저장 전)"""
+        return [cls(ticket_id=ticket_id, number=n) for n in numbers]
+
+
+class ArchivedTicket(models.Model):
+    """
+    보관 티켓 (정산이 끝난 회차의 티켓을 archive_tickets 명령으로 Ticket에서 옮김)
+
+    기본키를 그대로 유지하므로 티켓 번호(URL)는 보관 후에도 같다.
+    번호별 행(TicketNumber)은 보관하지 않는다.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_tickets')
+    numbers = models.CharField(max_length=100)
+    numbers_mask = models.BigIntegerField(default=0, verbose_name='번호 비트마스크')
+    is_auto = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    winning_grade = models.IntegerField(default=0, choices=Ticket.WINNING_GRADE_CHOICES, verbose_name='당첨 등급')
+    draw = models.ForeignKey(
+        'Draw', on_delete=models.SET_NULL, null=True, blank=True, related_name='archived_tickets',
+    )
+    round = models.ForeignKey(
+        'Round', on_delete=models.PROTECT, null=True, blank=True, related_name='archived_tickets',
+        db_index=False, verbose_name='회차',
+    )
+    archived_at = models.DateTimeField(default=timezone.now, verbose_name='보관일시')
+
+    class Meta:
+        verbose_name = '보관 티켓'
+        verbose_name_plural = '보관 티켓'
+        ordering = ['-created_at']
+        indexes = [
+            # 내 티켓 목록에서 이전 회차까지 이어 볼 때
+            models.Index(fields=['user', '-created_at', '-id'], name='lotto_archived_user_idx'),
+            # 보관 회차의 당첨자 내보내기
+            models.Index(
+                fields=['draw', 'winning_grade', 'id'],
+                name='lotto_archived_winner_idx',
+                condition=models.Q(winning_grade__gt=0),
+            ),
+            models.Index(fields=['round', 'id'], name='lotto_archived_round_idx'),
+        ]
+
+    def __str__(self):
+        return f"보관 티켓 {self.id} - {self.user.username}"
+
+    def get_numbers_list(self):
+        """번호 문자열을 리스트로 변환"""
+        return [int(n.strip()) for n in self.numbers.split(',')]
+
+
+class Round(models.Model):
+    """
+    추첨 회차 (판매 기간 단위)
+
+    티켓은 구매 시 판매 중인 회차에 묶이고, 추첨은 그 회차의 티켓만 정산한다.
+    추첨하지 않은 회차는 항상 하나이며, 추첨하면 다음 회차가 바로 열린다.
+    """
+    STATUS_OPEN = 'open'
+    STATUS_CLOSED = 'closed'
+    STATUS_DRAWN = 'drawn'
+    STATUS_CHOICES = [
+        (STATUS_OPEN, '판매 중'),
+        (STATUS_CLOSED, '판매 마감'),
+        (STATUS_DRAWN, '추첨 완료'),
+    ]
+
+    number = models.PositiveIntegerField(unique=True, verbose_name='회차')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_OPEN, verbose_name='상태')
+    opened_at = models.DateTimeField(default=timezone.now, verbose_name='판매 시작일시')
+    sales_close_at = models.DateTimeField(null=True, blank=True, verbose_name='판매 마감 예정일시')
+    closed_at = models.DateTimeField(null=True, blank=True, verbose_name='판매 마감일시')
+    archiving_at = models.DateTimeField(null=True, blank=True, verbose_name='티켓 보관 시작일시')
+    archived_at = models.DateTimeField(null=True, blank=True, verbose_name='티켓 보관일시')
+    draw = models.OneToOneField(
+        'Draw', on_delete=models.SET_NULL, null=True, blank=True, related_name='round', verbose_name='추첨',
+    )
+
+    class Meta:
+        verbose_name = '회차'
+        verbose_name_plural = '회차'
+        ordering = ['-number']
+
+    def __str__(self):
+        return f"제{self.number}회 ({self.get_status_display()})"
+
+    def lock_shared(self):
+        """
+        회차 행을 공유 잠금(FOR SHARE)으로 잡고 상태를 다시 읽음 (트랜잭션 안에서만, PostgreSQL·MySQL)
+
+        여러 구매가 함께 잡을 수 있어 구매끼리는 기다리지 않고, 판매 마감·추첨의 행 잠금
+        (Round.current(for_update=True))과는 서로 기다린다. 다른 DB에서는 아무것도 하지 않는다.
+        """
+        if connection.vendor not in ('postgresql', 'mysql'):
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT 1 FROM {connection.ops.quote_name(self._meta.db_table)} WHERE id = %s FOR SHARE", [self.pk],
+            )
+        self.refresh_from_db(fields=['status', 'sales_close_at'])
+
+    def is_on_sale(self, now=None):
+        """판매 중 여부 (마감 처리 전이라도 마감 예정 시각이 지나면 판매 불가)"""
+        if self.status != self.STATUS_OPEN:
+            return False
+        return self.sales_close_at is None or (now or timezone.now()) < self.sales_close_at
+
+    @classmethod
+    def current(cls, for_update=False):
+        """
+        아직 추첨하지 않은 회차 (없으면 다음 회차를 열어서 반환)
+
+        Args:
+            for_update: 회차 행을 잠금 (트랜잭션 안에서만, 판매 마감·추첨용). 구매는 같은 행을
+                공유 잠금(lock_shared)으로 잡으므로, 마감·추첨은 진행 중인 구매가 끝난 뒤에 진행된다.
+
+        Returns:
+            Round
+        """
+        rounds = cls.objects.exclude(status=cls.STATUS_DRAWN).order_by('number')
+        if for_update:
+            rounds = rounds.select_for_update()
+        current = rounds.first()
+        if current is None:
+            current = cls.open_next()
+            if for_update:
+                current = rounds.get(pk=current.pk)
+        return current
+
+    @classmethod
+    def open_next(cls):
+        """
+        다음 회차를 열기 (판매 마감 예정 시각은 settings.LOTTO_ROUND_SALES_HOURS)
+
+        여러 요청이 동시에 열려고 하면 회차 번호 중복으로 하나만 만들어지고 나머지는 그 회차를 받는다.
+        """
+        last = cls.objects.order_by('-number').values_list('number', flat=True).first() or 0
+        now = timezone.now()
+        hours = settings.LOTTO_ROUND_SALES_HOURS
+        try:
+            with transaction.atomic():
+                return cls.objects.create(
+                    number=last + 1,
+                    opened_at=now,
+                    sales_close_at=now + timedelta(hours=hours) if hours else None,
+                )
+        except IntegrityError:
+            return cls.objects.exclude(status=cls.STATUS_DRAWN).order_by('number').first()
+
+
 class Draw(models.Model):
     numbers = models.CharField(max_length=100, verbose_name='당첨 번호')  # 당첨 번호 "1,2,3,4,5,6"
     bonus_number = models.IntegerField(null=True, blank=True, verbose_name='보너스 번호')
@@ -50,3 +266,230 @@ class Draw(models.Model):
     def get_numbers_list(self):
         """당첨번호 문자열을 리스트로 변환"""
         return [int(n.strip()) for n in self.numbers.split(',')]
+
+    def get_numbers_mask(self):
+        """당첨번호를 비트마스크로 변환"""
+        return numbers_to_mask(self.get_numbers_list())
+
+
+class SettlementJob(models.Model):
+    """추첨 정산 작업 (티켓 기본키 범위 단위로 분할)"""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, '대기'),
+        (STATUS_RUNNING, '진행 중'),
+        (STATUS_DONE, '완료'),
+        (STATUS_FAILED, '실패'),
+    ]
+
+    draw = models.ForeignKey(Draw, on_delete=models.CASCADE, related_name='settlement_jobs', verbose_name='추첨')
+    # 정산할 회차 (없으면 기본키 범위의 모든 티켓)
+    round = models.ForeignKey(
+        Round, on_delete=models.CASCADE, null=True, blank=True, related_name='settlement_jobs', verbose_name='회차',
+    )
+    start_pk = models.BigIntegerField(verbose_name='시작 티켓 ID')
+    end_pk = models.BigIntegerField(verbose_name='끝 티켓 ID')
+    last_pk = models.BigIntegerField(null=True, blank=True, verbose_name='마지막 처리 티켓 ID')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name='상태')
+    processed = models.IntegerField(default=0, verbose_name='처리한 티켓 수')
+    worker = models.CharField(max_length=100, blank=True, verbose_name='워커')
+    error = models.TextField(blank=True, verbose_name='오류')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일시')
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='시작일시')
+    updated_at = models.DateTimeField(null=True, blank=True, verbose_name='최근 갱신일시')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='완료일시')
+
+    class Meta:
+        verbose_name = '정산 작업'
+        verbose_name_plural = '정산 작업'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'id'], name='lotto_job_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"정산 작업 {self.id} - 추첨 {self.draw_id} ({self.start_pk}~{self.end_pk}, {self.get_status_display()})"
+
+    @property
+    def progress(self):
+        """기본키 범위 기준 진행률 (0.0 ~ 1.0)"""
+        if self.status == self.STATUS_DONE:
+            return 1.0
+        if self.last_pk is None:
+            return 0.0
+        span = self.end_pk - self.start_pk + 1
+        return min((self.last_pk - self.start_pk + 1) / span, 1.0)
+
+
+class DrawResult(models.Model):
+    """추첨별 당첨 통계 요약 (정산 시 함께 기록)"""
+    draw = models.OneToOneField(Draw, on_delete=models.CASCADE, primary_key=True, related_name='result', verbose_name='추첨')
+    total_tickets = models.IntegerField(default=0, verbose_name='정산한 티켓 수')
+    grade1_count = models.IntegerField(default=0, verbose_name='1등 수')
+    grade2_count = models.IntegerField(default=0, verbose_name='2등 수')
+    grade3_count = models.IntegerField(default=0, verbose_name='3등 수')
+    grade4_count = models.IntegerField(default=0, verbose_name='4등 수')
+    grade5_count = models.IntegerField(default=0, verbose_name='5등 수')
+    # 1~3등을 전체 정산보다 먼저 확정한 시각 (이후 정산은 1~3등 수를 다시 더하지 않음)
+    top_tiers_at = models.DateTimeField(null=True, blank=True, verbose_name='1~3등 확정일시')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='최근 갱신일시')
+
+    class Meta:
+        verbose_name = '추첨 결과 요약'
+        verbose_name_plural = '추첨 결과 요약'
+
+    def __str__(self):
+        return f"추첨 {self.draw_id} 결과 ({self.total_tickets}장)"
+
+    def get_grade_counts(self):
+        """등급별 당첨 수 딕셔너리 (1~5등)"""
+        return {grade: getattr(self, f'grade{grade}_count') for grade in range(1, 6)}
+
+    @property
+    def winner_count(self):
+        return sum(self.get_grade_counts().values())
+
+
+class SalesRollup(models.Model):
+    """일별·사용자별·구매 방식별 판매 집계 (구매 시 증분 갱신)"""
+    date = models.DateField(verbose_name='판매일')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sales_rollups', verbose_name='사용자')
+    is_auto = models.BooleanField(verbose_name='자동 구매')
+    ticket_count = models.IntegerField(default=0, verbose_name='판매 수')
+
+    class Meta:
+        verbose_name = '판매 집계'
+        verbose_name_plural = '판매 집계'
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'user', 'is_auto'], name='lotto_sales_rollup_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.user_id} {'자동' if self.is_auto else '수동'}: {self.ticket_count}장"
+
+
+class UserSalesRollup(models.Model):
+    """사용자별 전체 판매 수 (구매 시 증분 갱신, 판매 실적 화면의 상위 사용자)"""
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name='sales_total', verbose_name='사용자',
+    )
+    ticket_count = models.BigIntegerField(default=0, verbose_name='판매 수')
+
+    class Meta:
+        verbose_name = '사용자별 판매 집계'
+        verbose_name_plural = '사용자별 판매 집계'
+        indexes = [
+            # 판매 수 상위 사용자
+            models.Index(fields=['-ticket_count'], name='lotto_user_sales_count_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.ticket_count}장"
+
+
+class SalesTotal(models.Model):
+    """구매 방식별 전체 판매 수 (구매 시 증분 갱신, 판매 실적 화면의 합계)"""
+    is_auto = models.BooleanField(primary_key=True, verbose_name='자동 구매')
+    ticket_count = models.BigIntegerField(default=0, verbose_name='판매 수')
+
+    class Meta:
+        verbose_name = '전체 판매 집계'
+        verbose_name_plural = '전체 판매 집계'
+
+    def __str__(self):
+        return f"{'자동' if self.is_auto else '수동'}: {self.ticket_count}장"
+
+
+class NumberRollup(models.Model):
+    """번호별 판매 티켓 수 (구매 시 증분 갱신, 보관된 티켓 포함 전체 기간)"""
+    number = models.PositiveSmallIntegerField(primary_key=True, verbose_name='번호')
+    ticket_count = models.BigIntegerField(default=0, verbose_name='티켓 수')
+
+    class Meta:
+        verbose_name = '번호별 판매 집계'
+        verbose_name_plural = '번호별 판매 집계'
+
+    def __str__(self):
+        return f"{self.number}: {self.ticket_count}장"
+
+
+class NumberExposure(models.Model):
+    """
+    번호·번호 쌍별 판매 티켓 수 (구매 시 증분 갱신)
+
+    first == second인 행은 그 번호를 고른 티켓 수, first < second인 행은 두 번호를 함께 고른 티켓 수.
+    기본키는 first * 46 + second로 정해 두어 여러 칸을 기본키 목록 하나로 갱신할 수 있다.
+    """
+    id = models.PositiveSmallIntegerField(primary_key=True)
+    first = models.PositiveSmallIntegerField(verbose_name='번호 1')
+    second = models.PositiveSmallIntegerField(verbose_name='번호 2')
+    ticket_count = models.BigIntegerField(default=0, verbose_name='티켓 수')
+
+    class Meta:
+        verbose_name = '번호 노출'
+        verbose_name_plural = '번호 노출'
+
+    def __str__(self):
+        if self.first == self.second:
+            return f"{self.first}: {self.ticket_count}장"
+        return f"{self.first}-{self.second}: {self.ticket_count}장"
+
+    @staticmethod
+    def cell_id(first, second):
+        return first * 46 + second
+
+    @classmethod
+    def for_cell(cls, cell_id, ticket_count=0):
+        first, second = divmod(cell_id, 46)
+        return cls(id=cell_id, first=first, second=second, ticket_count=ticket_count)
+
+
+class ComboExposure(models.Model):
+    """번호 조합별 판매 티켓 수 (구매 시 증분 갱신, 1~3등 예상 당첨자 계산용)"""
+    mask = models.BigIntegerField(unique=True, verbose_name='번호 비트마스크')
+    ticket_count = models.IntegerField(default=0, verbose_name='티켓 수')
+
+    class Meta:
+        verbose_name = '조합 노출'
+        verbose_name_plural = '조합 노출'
+
+    def __str__(self):
+        return f"{self.mask}: {self.ticket_count}장"
+
+
+class ApiToken(models.Model):
+    """JSON API 인증 토큰 (키 원문은 저장하지 않고 SHA-256 해시만 저장)"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='api_tokens', verbose_name='사용자')
+    name = models.CharField(max_length=100, blank=True, verbose_name='이름')  # 단말기 이름 등
+    key_hash = models.CharField(max_length=64, unique=True, verbose_name='키 해시')
+    prefix = models.CharField(max_length=8, verbose_name='키 앞자리')
+    is_active = models.BooleanField(default=True, verbose_name='활성화')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일시')
+
+    class Meta:
+        verbose_name = 'API 토큰'
+        verbose_name_plural = 'API 토큰'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.prefix}… - {self.user.username}"
+
+    @staticmethod
+    def hash_key(key):
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    @classmethod
+    def issue(cls, user, name=''):
+        """
+        새 토큰 발급
+
+        Returns:
+            tuple: (ApiToken, 키 원문) - 키 원문은 이때만 확인할 수 있다
+        """
+        key = secrets.token_hex(20)
+        token = cls.objects.create(user=user, name=name, key_hash=cls.hash_key(key), prefix=key[:8])
+        return token, key
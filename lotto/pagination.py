@@ -0,0 +1,87 @@
+"""
+(created_at, id) 기준 키셋(커서) 페이지네이션
+
+OFFSET 방식은 뒤 페이지로 갈수록 앞의 행을 모두 건너뛰어야 하지만,
+키셋 방식은 마지막으로 본 티켓 다음부터 인덱스를 바로 읽으므로
+보유 티켓 수와 무관하게 페이지 비용이 일정하다.
+"""
+from datetime import datetime, timezone as dt_timezone
+
+from django.db.models import Q
+
+
+def encode_cursor(created_at, pk):
+    """(created_at, id)를 URL에 넣을 수 있는 커서 문자열로 변환"""
+    micros = int(created_at.timestamp()) * 1_000_000 + created_at.microsecond
+    return f"{micros}-{pk}"
+
+
+def decode_cursor(cursor):
+    """
+    커서 문자열을 (created_at, id)로 변환
+
+    Raises:
+        ValueError: 잘못된 커서
+    """
+    micros, pk = (int(part) for part in cursor.split('-'))
+    if not 0 < pk < 2 ** 63:
+        raise ValueError("잘못된 커서")
+    seconds, micro = divmod(micros, 1_000_000)
+    try:
+        created_at = datetime.fromtimestamp(seconds, tz=dt_timezone.utc).replace(microsecond=micro)
+    except (OverflowError, OSError):
+        raise ValueError("잘못된 커서")
+    return created_at, pk
+
+
+def _page_queryset(queryset, cursor, page_size):
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    # 다음 페이지가 있는지 알기 위해 하나 더 읽는다
+    return queryset.order_by('-created_at', '-id')[:page_size + 1]
+
+
+def _finish_page(items, page_size):
+    if len(items) <= page_size:
+        return items, None
+
+    items = items[:page_size]
+    last = items[-1]
+    if isinstance(last, dict):
+        return items, encode_cursor(last['created_at'], last['id'])
+    return items, encode_cursor(last.created_at, last.id)
+
+
+def paginate_tickets(queryset, cursor=None, page_size=50, archive=None):
+    """
+    최신순(created_at, id 내림차순)으로 한 페이지 조회
+
+    archive를 주면 queryset을 다 읽은 뒤 같은 커서로 보관 티켓을 이어 읽는다.
+    보관 티켓은 모두 queryset의 티켓보다 먼저 판매된 것이어야 한다 (archive.py 참고).
+
+    Args:
+        queryset: 티켓 queryset (모델 인스턴스 또는 values() 모두 가능)
+        cursor: 이전 페이지가 돌려준 커서 (없으면 첫 페이지)
+        page_size: 페이지 크기
+        archive: 이어 읽을 보관 티켓 queryset (옵션, queryset과 같은 형태)
+
+    Returns:
+        tuple: (티켓 목록, 다음 페이지 커서 또는 None)
+
+    Raises:
+        ValueError: 잘못된 커서
+    """
+    items = list(_page_queryset(queryset, cursor, page_size))
+    if archive is not None and len(items) <= page_size:
+        # 남은 자리만큼 (다음 페이지 확인용 하나 포함) 보관 티켓으로 채움
+        items += _page_queryset(archive, cursor, page_size - len(items))
+    return _finish_page(items, page_size)
+
+
+async def apaginate_tickets(queryset, cursor=None, page_size=50, archive=None):
+    """paginate_tickets의 비동기 버전"""
+    items = [item async for item in _page_queryset(queryset, cursor, page_size)]
+    if archive is not None and len(items) <= page_size:
+        items += [item async for item in _page_queryset(archive, cursor, page_size - len(items))]
+    return _finish_page(items, page_size)
@@ -0,0 +1,191 @@
+"""
+관리자용 요청 프로파일링 (재배포 없이 느린 화면의 병목 확인)
+
+superuser가 ?_profile=1 쿼리 매개변수나 X-Lotto-Profile: 1 헤더를 붙여 요청하면
+ProfilingMiddleware가 뷰를 cProfile로 감싸 실행하고 결과를 디스크에 저장한다.
+  - <id>.prof: pstats 형식 원본 (python -m pstats, snakeviz 등으로 열어 볼 수 있음)
+  - <id>.json: 요청 정보, 누적 시간 상위 함수, SQL(매개변수 제외)별 실행 횟수·시간
+
+저장 디렉터리(settings.LOTTO_PROFILE_DIR)는 최근 settings.LOTTO_PROFILE_KEEP개만 남기는 링 버퍼로,
+새 프로파일을 저장할 때 오래된 것부터 지운다. 목록은 관리자 화면(admin_profiles)에서 본다.
+비동기 뷰는 프로파일링하지 않는다 (cProfile은 await 사이에 나뉜 실행을 제대로 잇지 못함).
+"""
+import cProfile
+import json
+import pstats
+import re
+import time
+import uuid
+from contextlib import ExitStack
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+PROFILE_PARAM = '_profile'
+PROFILE_HEADER = 'X-Lotto-Profile'
+PROFILE_ID_HEADER = 'X-Lotto-Profile-Id'
+
+# 프로파일 요약에 남길 누적 시간 상위 함수 수
+TOP_FUNCTIONS = 40
+
+_PROFILE_ID = re.compile(r'^\d{8}-\d{6}-\d{6}-[0-9a-f]{8}$')
+
+
+def profiling_requested(request):
+    """프로파일링을 요청한 superuser의 요청인지 여부"""
+    if not settings.LOTTO_PROFILING_ENABLED:
+        return False
+    # request.user는 세션과 사용자를 DB에서 읽으므로 요청 표시가 있을 때만 확인한다
+    if request.GET.get(PROFILE_PARAM) != '1' and request.headers.get(PROFILE_HEADER) != '1':
+        return False
+    user = getattr(request, 'user', None)
+    return user is not None and user.is_superuser
+
+
+class SqlBreakdown:
+    """SQL(매개변수 제외)별 실행 횟수와 시간을 모으는 execute_wrapper"""
+
+    def __init__(self):
+        self.statements = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            entry = self.statements.setdefault(sql, [0, 0.0])
+            entry[0] += 1
+            entry[1] += (time.perf_counter() - started) * 1000
+
+    def rows(self):
+        """시간이 오래 걸린 SQL부터 [{"sql", "count", "ms"}]"""
+        return [
+            {"sql": sql, "count": count, "ms": round(ms, 3)}
+            for sql, (count, ms) in sorted(self.statements.items(), key=lambda item: -item[1][1])
+        ]
+
+
+def top_functions(profiler, limit=TOP_FUNCTIONS):
+    """누적 시간 상위 함수 [{"function", "file", "line", "calls", "tottime_ms", "cumtime_ms"}]"""
+    stats = pstats.Stats(profiler).stats
+    rows = sorted(stats.items(), key=lambda item: -item[1][3])[:limit]
+    return [
+        {
+            "function": name,
+            "file": filename,
+            "line": line,
+            "calls": calls,
+            "tottime_ms": round(tottime * 1000, 3),
+            "cumtime_ms": round(cumtime * 1000, 3),
+        }
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in rows
+    ]
+
+
+def profile_dir():
+    return Path(settings.LOTTO_PROFILE_DIR)
+
+
+def save_profile(profiler, summary):
+    """
+    프로파일 원본과 요약을 저장하고 보관 개수를 넘는 오래된 프로파일을 지움
+
+    Returns:
+        str: 프로파일 ID (저장 시각 순으로 정렬됨)
+    """
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    profile_id = f"{timezone.now():%Y%m%d-%H%M%S-%f}-{uuid.uuid4().hex[:8]}"
+    profiler.dump_stats(directory / f"{profile_id}.prof")
+    # 목록은 .json으로 찾으므로 원본을 먼저 쓴다
+    (directory / f"{profile_id}.json").write_text(
+        json.dumps({"id": profile_id, **summary}, ensure_ascii=False), encoding='utf-8'
+    )
+    prune_profiles(settings.LOTTO_PROFILE_KEEP)
+    return profile_id
+
+
+def prune_profiles(keep):
+    """최근 keep개만 남기고 오래된 프로파일 삭제"""
+    for path in sorted(profile_dir().glob('*.json'), reverse=True)[keep:]:
+        path.unlink(missing_ok=True)
+        path.with_suffix('.prof').unlink(missing_ok=True)
+
+
+def list_profiles():
+    """저장된 프로파일 요약 목록 (최신순, 읽을 수 없는 파일은 건너뜀)"""
+    profiles = []
+    for path in sorted(profile_dir().glob('*.json'), reverse=True):
+        try:
+            profiles.append(json.loads(path.read_text(encoding='utf-8')))
+        except (OSError, ValueError):
+            continue
+    return profiles
+
+
+def profile_path(profile_id, suffix='.json'):
+    """프로파일 파일 경로 (ID 형식이 아니거나 파일이 없으면 None)"""
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    path = profile_dir() / f"{profile_id}{suffix}"
+    return path if path.exists() else None
+
+
+def load_profile(profile_id):
+    """프로파일 요약 (없으면 None)"""
+    path = profile_path(profile_id)
+    return json.loads(path.read_text(encoding='utf-8')) if path else None
+
+
+class ProfilingMiddleware:
+    """
+    프로파일링을 요청한 superuser 요청의 뷰를 cProfile로 실행하고 결과를 저장하는 미들웨어
+
+    다른 미들웨어의 process_view(CSRF 검사 등)가 먼저 실행되도록 MIDDLEWARE 맨 뒤에 둔다.
+    저장한 프로파일 ID는 X-Lotto-Profile-Id 응답 헤더로 돌려준다.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        # 뷰는 process_view에서 감싸므로 요청·응답은 그대로 넘긴다
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if iscoroutinefunction(view_func) or not profiling_requested(request):
+            return None
+
+        profiler = cProfile.Profile()
+        sql = SqlBreakdown()
+        started_at = timezone.now()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(sql))
+            started = time.perf_counter()
+            response = profiler.runcall(view_func, request, *view_args, **view_kwargs)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+        queries = sql.rows()
+        profile_id = save_profile(profiler, {
+            "created_at": started_at.isoformat(),
+            "method": request.method,
+            "path": request.get_full_path(),
+            "view": request.resolver_match.view_name if request.resolver_match else None,
+            "user": request.user.get_username(),
+            "status": response.status_code,
+            "total_ms": round(elapsed_ms, 3),
+            "query_count": sum(row["count"] for row in queries),
+            "db_ms": round(sum(row["ms"] for row in queries), 3),
+            "queries": queries,
+            "functions": top_functions(profiler),
+        })
+        response[PROFILE_ID_HEADER] = profile_id
+        return response
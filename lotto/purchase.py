@@ -0,0 +1,194 @@
+"""
+티켓 발급
+
+단건 구매와 여러 게임을 한 번에 사는 일괄 구매 모두 issue_tickets를 거친다.
+번호 검증은 NumPy로 모든 게임을 한 번에 처리하고, 저장은 bulk_create 한 번으로 끝낸다.
+판매·노출 집계는 구매가 커밋된 뒤 따로 갱신한다 (record_rollups).
+티켓은 판매 중인 회차에 묶이며, 판매가 마감된 회차에는 발급하지 않는다.
+"""
+import json
+from functools import partial
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .autopick import generate_picks, picks_to_masks
+from .exposure import record_exposure
+from .models import Round, Ticket, TicketNumber
+from .sales import record_sales
+
+
+def auto_pick():
+    """자동 번호 6개 생성 (정렬됨)"""
+    return generate_picks(1)[0].tolist()
+
+
+def parse_numbers(value):
+    """
+    "1,5,12,20,33,42" 문자열 또는 숫자 리스트를 정수 리스트로 변환
+
+    Raises:
+        ValidationError: 숫자가 아닌 값이 있을 때
+    """
+    if isinstance(value, str):
+        value = value.split(',')
+    try:
+        return [int(str(n).strip()) for n in value]
+    except (TypeError, ValueError):
+        raise ValidationError("번호는 숫자만 입력해야 합니다.")
+
+
+def validate_picks(picks):
+    """
+    여러 게임의 번호를 한 번에 검증하고 정렬
+
+    Args:
+        picks: 게임별 번호 리스트의 리스트
+
+    Returns:
+        numpy.ndarray: (게임 수, 6) 정렬된 번호 배열
+
+    Raises:
+        ValidationError: 잘못된 게임이 있을 때 (게임 번호는 1부터)
+    """
+    errors = [
+        ValidationError(f"{i}번째 게임: 번호는 반드시 6개를 입력해야 합니다.")
+        for i, nums in enumerate(picks, start=1) if len(nums) != 6
+    ]
+    if errors:
+        raise ValidationError(errors)
+
+    # int64를 넘는 값은 NumPy 변환에서 OverflowError가 나므로 범위는 파이썬 정수로 먼저 검사하고,
+    # 범위를 벗어난 게임은 중복 검사용 배열에 넣지 않는다
+    out_of_range = np.array([not all(1 <= n <= 45 for n in nums) for nums in picks], dtype=bool)
+    games = np.asarray(
+        [range(1, 7) if bad else nums for nums, bad in zip(picks, out_of_range.tolist())], dtype=np.int64,
+    )
+    games = np.sort(games.reshape(-1, 6), axis=1)
+    duplicated = (np.diff(games, axis=1) == 0).any(axis=1)
+
+    for i in np.flatnonzero(out_of_range | duplicated).tolist():
+        if out_of_range[i]:
+            errors.append(ValidationError(f"{i + 1}번째 게임: 로또 번호는 1~45 사이여야 합니다."))
+        else:
+            errors.append(ValidationError(f"{i + 1}번째 게임: 번호는 중복 없이 6개를 입력해야 합니다."))
+    if errors:
+        raise ValidationError(errors)
+    return games
+
+
+def parse_slip_request(body):
+    """
+    일괄 구매 요청 본문(JSON)에서 게임 목록과 자동 게임 수를 꺼냄
+
+    Raises:
+        ValidationError: JSON 형식이 잘못되었을 때
+    """
+    try:
+        payload = json.loads(body)
+        games = payload.get("games", [])
+        auto_count = int(payload.get("auto_count", 0))
+        if not isinstance(games, list) or auto_count < 0:
+            raise ValueError
+    except (ValueError, TypeError, AttributeError):
+        raise ValidationError("잘못된 요청 형식입니다.")
+    return games, auto_count
+
+
+def build_slip(games, auto_count=0):
+    """
+    일괄 구매 요청의 게임 목록을 검증된 번호 배열로 변환
+
+    Args:
+        games: 게임 목록. 각 항목은 {"numbers": [...]} / {"numbers": "1,2,..."} (수동),
+            {"auto": true} (자동) 또는 번호 리스트
+        auto_count: 추가로 구매할 자동 게임 수
+
+    Returns:
+        tuple: (정렬된 번호 배열, 게임별 자동 구매 여부 리스트)
+
+    Raises:
+        ValidationError: 게임 수 초과 또는 잘못된 번호
+    """
+    max_games = settings.LOTTO_MAX_GAMES_PER_SLIP
+    if not 1 <= len(games) + auto_count <= max_games:
+        raise ValidationError(f"한 번에 1~{max_games}게임까지 구매할 수 있습니다.")
+
+    games = [game if isinstance(game, dict) else {"numbers": game} for game in games]
+    games += [{"auto": True}] * auto_count
+    auto_flags = [bool(game.get("auto")) for game in games]
+
+    # 자동 게임은 한 번에 생성 (한 용지 안에서 자동 번호 조합이 겹치지 않음)
+    auto_picks = iter(generate_picks(sum(auto_flags), unique=True).tolist())
+    picks = [
+        next(auto_picks) if is_auto else parse_numbers(game.get("numbers", ""))
+        for game, is_auto in zip(games, auto_flags)
+    ]
+    return validate_picks(picks), auto_flags
+
+
+def issue_tickets(user, games, auto_flags):
+    """
+    검증된 번호로 티켓을 한 번에 발급
+
+    Args:
+        user: 구매자
+        games: (게임 수, 6) 정렬된 번호 배열 (validate_picks 결과)
+        auto_flags: 게임별 자동 구매 여부
+
+    Returns:
+        list: 저장된 Ticket 목록 (id 포함)
+
+    Raises:
+        ValidationError: 현재 회차 판매가 마감되었을 때
+    """
+    games = np.asarray(games, dtype=np.int64).reshape(-1, 6)
+    masks = picks_to_masks(games)
+    with transaction.atomic():
+        # 판매 마감·추첨(rounds.py)이 잠그는 회차 행을 공유 잠금으로 잡아, 마감 이후에는 이 회차에 티켓이
+        # 들어가지 않게 한다 (구매끼리는 서로 기다리지 않음)
+        sales_round = Round.current()
+        sales_round.lock_shared()
+        if not sales_round.is_on_sale():
+            raise ValidationError(f"제{sales_round.number}회 판매가 마감되었습니다. 추첨 후 다음 회차를 구매해 주세요.")
+        tickets = [
+            Ticket(
+                user=user,
+                numbers=",".join(str(n) for n in nums),
+                numbers_mask=mask,
+                is_auto=bool(is_auto),
+                round=sales_round,
+            )
+            for nums, mask, is_auto in zip(games.tolist(), masks.tolist(), auto_flags)
+        ]
+        tickets = Ticket.objects.bulk_create(tickets)
+        TicketNumber.objects.bulk_create(
+            row
+            for ticket, nums in zip(tickets, games.tolist())
+            for row in TicketNumber.rows_for(ticket.id, nums)
+        )
+        # 모든 구매가 함께 갱신하는 집계 행은 커밋 뒤 따로 갱신한다 (record_rollups)
+        transaction.on_commit(partial(record_rollups, sales_round.id, tickets, masks.tolist()), robust=True)
+    return tickets
+
+
+def record_rollups(round_id, tickets, masks):
+    """
+    커밋된 구매를 판매·노출 집계에 반영 (issue_tickets가 커밋 직후 호출)
+
+    번호별·전체 판매 집계와 번호 노출 행은 모든 구매가 함께 갱신하므로, 구매 트랜잭션 안에서 갱신하면
+    동시 구매가 앞선 구매의 커밋까지 이 행들의 잠금을 기다린다. 구매 트랜잭션 밖의 짧은 트랜잭션에서
+    갱신해 잠금은 UPDATE 몇 번 동안만 잡는다. 그 대신 집계는 구매 커밋보다 잠깐 늦게 반영되고,
+    그 사이 프로세스가 죽거나 갱신이 실패하면(로그만 남김) 그 구매분이 빠지므로
+    rebuild_sales_rollup / rebuild_exposure로 다시 맞춘다.
+    """
+    with transaction.atomic():
+        record_sales(tickets)
+    with transaction.atomic():
+        sales_round = Round.objects.get(pk=round_id)
+        sales_round.lock_shared()
+        # 그 사이 추첨된 회차면 노출 집계는 이미 다음 회차 기준으로 비워졌으므로 반영하지 않는다
+        if sales_round.status != Round.STATUS_DRAWN:
+            record_exposure(masks)
@@ -0,0 +1,82 @@
+"""
+추첨 회차 진행
+
+판매 중인 회차(Round) → 판매 마감 → 추첨 → 다음 회차 판매 순서로 진행한다.
+티켓은 구매 시 회차에 묶이므로 추첨 정산은 그 회차의 티켓만 (round, id) 인덱스로 읽고,
+이전 회차 티켓의 당첨 결과는 다시 계산하거나 덮어쓰지 않는다.
+정산 비용은 누적 티켓 수가 아니라 한 회차의 판매량에 비례한다.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .exposure import reset_exposure
+from .models import Draw, Round
+from .utils import calculate_winning_grade_mask
+
+
+def close_sales(now=None):
+    """
+    판매 중인 회차의 판매 마감
+
+    회차 행을 잠그므로 진행 중인 구매(purchase.issue_tickets, 공유 잠금)가 끝난 뒤 마감되고,
+    마감 뒤에 잠금을 얻은 구매는 마감된 회차를 보고 거절된다.
+
+    Returns:
+        Round: 마감한 회차 (이미 마감된 회차면 그대로 반환)
+    """
+    with transaction.atomic():
+        current = Round.current(for_update=True)
+        if current.status == Round.STATUS_OPEN:
+            current.status = Round.STATUS_CLOSED
+            current.closed_at = now or timezone.now()
+            current.save(update_fields=['status', 'closed_at'])
+    return current
+
+
+def draw_round(numbers, bonus_number):
+    """
+    현재 회차를 마감하고 추첨한 뒤 다음 회차를 엶
+
+    기존 활성 추첨은 비활성화되고, 노출 집계는 새 회차 기준으로 비운다.
+    마감한 회차 행의 잠금은 추첨과 다음 회차 열기가 커밋될 때까지 유지된다.
+    정산은 호출한 쪽에서 반환된 회차의 티켓(sales_round.tickets)으로 진행한다.
+
+    Args:
+        numbers: 당첨 번호 6개 (정렬됨)
+        bonus_number: 보너스 번호
+
+    Returns:
+        tuple: (Draw, 추첨한 Round)
+    """
+    with transaction.atomic():
+        sales_round = close_sales()
+        Draw.objects.filter(is_active=True).update(is_active=False)
+        draw = Draw.objects.create(
+            numbers=",".join(str(n) for n in numbers),
+            bonus_number=bonus_number,
+            is_active=True,
+        )
+        sales_round.status = Round.STATUS_DRAWN
+        sales_round.draw = draw
+        sales_round.save(update_fields=['status', 'draw'])
+        Round.open_next()
+        reset_exposure()
+    return draw, sales_round
+
+
+def ticket_result(ticket):
+    """
+    티켓이 판매된 회차의 추첨 결과 (Ticket 또는 ArchivedTicket, round__draw를 함께 읽어 두면 추가 쿼리 없음)
+
+    정산된 티켓은 저장된 당첨 등급을, 회차는 추첨했지만 아직 정산되지 않은 티켓은
+    그 회차 당첨번호로 계산한 등급을 돌려준다 (저장하지 않음).
+
+    Returns:
+        tuple: (추첨 Draw, 당첨 등급). 회차 추첨 전이면 (None, None)
+    """
+    draw = ticket.round.draw if ticket.round_id else None
+    if draw is None:
+        return None, None
+    if ticket.draw_id == draw.id:
+        return draw, ticket.winning_grade
+    return draw, calculate_winning_grade_mask(ticket.numbers_mask, draw.get_numbers_mask(), draw.bonus_number)
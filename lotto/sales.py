@@ -0,0 +1,164 @@
+"""
+판매 집계(SalesRollup) 갱신 및 조회
+
+티켓을 판매할 때마다 (판매일, 사용자, 구매 방식) 단위 집계와 사용자별·구매 방식별 전체 집계
+(UserSalesRollup, SalesTotal), 번호별 집계(NumberRollup)를 증분 갱신해 두고, 판매 실적 화면은
+티켓·티켓 번호 테이블 대신 이 작은 집계 테이블만 읽는다. 합계·상위 사용자는 전체 집계 행만,
+일별 판매량은 최근 기간의 행만 읽으므로 화면 비용이 누적 판매 기간에 따라 늘지 않는다.
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .exposure import add_counts
+from .models import ArchivedTicket, NumberRollup, SalesRollup, SalesTotal, Ticket, UserSalesRollup
+from .utils import mask_to_numbers
+
+
+def record_sales(tickets):
+    """
+    새로 판매한 티켓을 판매 집계에 반영
+
+    Args:
+        tickets: 저장된 Ticket 목록 (created_at이 채워져 있어야 함)
+    """
+    counts = Counter(
+        (timezone.localdate(ticket.created_at), ticket.user_id, ticket.is_auto)
+        for ticket in tickets
+    )
+    for (date, user_id, is_auto), count in counts.items():
+        _increment(date, user_id, is_auto, count)
+    add_counts(
+        UserSalesRollup, 'user_id', Counter(ticket.user_id for ticket in tickets),
+        lambda user_id: UserSalesRollup(user_id=user_id),
+    )
+    add_counts(
+        SalesTotal, 'is_auto', Counter(ticket.is_auto for ticket in tickets),
+        lambda is_auto: SalesTotal(is_auto=is_auto),
+    )
+    numbers = Counter(n for ticket in tickets for n in mask_to_numbers(ticket.numbers_mask))
+    add_counts(NumberRollup, 'number', numbers, lambda number: NumberRollup(number=number))
+
+
+def _increment(date, user_id, is_auto, count):
+    rollup = SalesRollup.objects.filter(date=date, user_id=user_id, is_auto=is_auto)
+    if rollup.update(ticket_count=F('ticket_count') + count):
+        return
+    try:
+        with transaction.atomic():
+            SalesRollup.objects.create(date=date, user_id=user_id, is_auto=is_auto, ticket_count=count)
+    except IntegrityError:
+        # 다른 요청이 같은 행을 먼저 만든 경우
+        rollup.update(ticket_count=F('ticket_count') + count)
+
+
+def rebuild_number_rollup():
+    """
+    티켓 테이블과 보관 티켓 테이블 전체로부터 번호별 판매 집계를 다시 계산
+
+    Returns:
+        int: 생성한 집계 행 수
+    """
+    counts = Counter()
+    for model in (Ticket, ArchivedTicket):
+        combos = model.objects.order_by().values_list('numbers_mask').annotate(count=Count('id'))
+        for mask, count in combos.iterator():
+            for number in mask_to_numbers(mask):
+                counts[number] += count
+    with transaction.atomic():
+        NumberRollup.objects.all().delete()
+        created = NumberRollup.objects.bulk_create(
+            NumberRollup(number=number, ticket_count=count) for number, count in counts.items()
+        )
+    return len(created)
+
+
+def rebuild_sales_rollup(batch_size=1000):
+    """
+    티켓 테이블과 보관 티켓 테이블 전체로부터 판매 집계(번호별 집계 포함)를 다시 계산
+
+    Returns:
+        int: 생성한 집계 행 수
+    """
+    counts = Counter()
+    for model in (Ticket, ArchivedTicket):
+        rows = (
+            model.objects.order_by()
+            .annotate(date=TruncDate('created_at'))
+            .values_list('date', 'user_id', 'is_auto')
+            .annotate(count=Count('id'))
+        )
+        for date, user_id, is_auto, count in rows.iterator():
+            counts[date, user_id, is_auto] += count
+    with transaction.atomic():
+        SalesRollup.objects.all().delete()
+        created = SalesRollup.objects.bulk_create(
+            (
+                SalesRollup(date=date, user_id=user_id, is_auto=is_auto, ticket_count=count)
+                for (date, user_id, is_auto), count in counts.items()
+            ),
+            batch_size=batch_size,
+        )
+        _rebuild_totals(counts, batch_size)
+    rebuild_number_rollup()
+    return len(created)
+
+
+def _rebuild_totals(counts, batch_size):
+    """(판매일, 사용자, 구매 방식)별 판매 수로 사용자별·구매 방식별 전체 집계를 다시 만듦"""
+    by_user = Counter()
+    by_method = Counter()
+    for (_, user_id, is_auto), count in counts.items():
+        by_user[user_id] += count
+        by_method[is_auto] += count
+    UserSalesRollup.objects.all().delete()
+    UserSalesRollup.objects.bulk_create(
+        (UserSalesRollup(user_id=user_id, ticket_count=count) for user_id, count in by_user.items()),
+        batch_size=batch_size,
+    )
+    SalesTotal.objects.all().delete()
+    SalesTotal.objects.bulk_create(
+        SalesTotal(is_auto=is_auto, ticket_count=count) for is_auto, count in by_method.items()
+    )
+
+
+def sales_summary(days=30, top_users=10, top_numbers=10):
+    """
+    판매 실적 화면용 집계
+
+    Returns:
+        dict: total_tickets, auto_tickets, manual_tickets, user_stats, daily_stats,
+            number_stats (많이 선택된 번호와 티켓 수)
+    """
+    by_method = dict(SalesTotal.objects.values_list('is_auto', 'ticket_count'))
+    auto_tickets = by_method.get(True, 0)
+    manual_tickets = by_method.get(False, 0)
+
+    user_stats = (
+        UserSalesRollup.objects.filter(ticket_count__gt=0)
+        .order_by('-ticket_count')
+        .values('user__username', 'ticket_count')[:top_users]
+    )
+    daily_stats = (
+        SalesRollup.objects.filter(date__gt=timezone.localdate() - timedelta(days=days))
+        .order_by()
+        .values('date')
+        .annotate(count=Sum('ticket_count'))
+        .order_by('-date')
+    )
+    return {
+        "total_tickets": auto_tickets + manual_tickets,
+        "auto_tickets": auto_tickets,
+        "manual_tickets": manual_tickets,
+        "user_stats": user_stats,
+        "daily_stats": daily_stats,
+        "number_stats": list(
+            NumberRollup.objects.filter(ticket_count__gt=0)
+            .order_by('-ticket_count', 'number')
+            .values_list('number', 'ticket_count')[:top_numbers]
+        ),
+    }
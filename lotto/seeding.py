@@ -0,0 +1,245 @@
+"""
+성능 측정용 합성 데이터 생성 (manage.py seed_tickets)
+
+사용자와 티켓을 배치 단위로 빠르게 만든다.
+  - SQLite 등: bulk_create
+  - PostgreSQL: 시퀀스에서 ID를 미리 받아 COPY로 적재
+  - 여러 프로세스: 티켓 수를 나눠 워커마다 다른 시드로 생성 (SQLite는 쓰기가 직렬화되므로 한 프로세스)
+
+같은 시드와 옵션이면 같은 번호·구매 방식·구매 시각이 만들어진다.
+티켓은 현재 회차에 묶이고, 티켓 번호 행(TicketNumber)은 티켓과 함께 넣는다.
+판매 집계와 노출 집계는 끝난 뒤 다시 계산한다.
+"""
+import csv
+import io
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import timedelta
+
+import django
+import numpy as np
+from django.contrib.auth.models import User
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from .autopick import generate_picks, picks_to_masks
+from .models import Round, Ticket, TicketNumber
+
+logger = logging.getLogger(__name__)
+
+DISTRIBUTIONS = ('uniform', 'recent')
+
+# 수동 번호 선택 가중치: 생일 범위(1~31)를 더 자주 고르는 경향을 흉내 낸다
+MANUAL_WEIGHTS = np.array([2.0] * 31 + [1.0] * 14)
+
+
+def create_seed_users(count, prefix='seed_user_', batch_size=5000):
+    """
+    합성 사용자 생성 (이미 있는 사용자명은 건너뜀, 로그인 불가 비밀번호)
+
+    Returns:
+        list: prefix로 시작하는 사용자 ID 목록
+    """
+    existing = set(User.objects.filter(username__startswith=prefix).values_list('username', flat=True))
+    User.objects.bulk_create(
+        (
+            User(username=f"{prefix}{i}", password='!')
+            for i in range(count)
+            if f"{prefix}{i}" not in existing
+        ),
+        batch_size=batch_size,
+    )
+    return list(
+        User.objects.filter(username__startswith=prefix).order_by('id').values_list('id', flat=True)[:count]
+    )
+
+
+def manual_picks(count, rng):
+    """사람이 고른 것 같은 수동 번호 (가중치를 둔 비복원 추출, Gumbel top-k)"""
+    keys = np.log(rng.random((count, 45))) / MANUAL_WEIGHTS
+    picks = np.argpartition(-keys, 6, axis=1)[:, :6] + 1
+    return np.sort(picks, axis=1).astype(np.int64)
+
+
+def random_created_at(count, rng, days, distribution, now):
+    """구매 시각 생성 (최근 days일 안, uniform: 고르게 / recent: 최근일수록 많이)"""
+    span = days * 86400.0
+    if distribution == 'recent':
+        ages = np.minimum(rng.exponential(span / 4, count), span)
+    else:
+        ages = rng.random(count) * span
+    return [now - timedelta(seconds=age) for age in ages.tolist()]
+
+
+def generate_batch(count, user_ids, rng, auto_ratio, days, distribution, now):
+    """
+    티켓 한 배치 분량의 열 데이터 생성
+
+    Returns:
+        dict: user_id, picks, masks, is_auto, created_at (길이 count)
+    """
+    is_auto = rng.random(count) < auto_ratio
+    picks = np.empty((count, 6), dtype=np.int64)
+    picks[is_auto] = generate_picks(int(is_auto.sum()), rng)
+    picks[~is_auto] = manual_picks(int((~is_auto).sum()), rng)
+    return {
+        "user_id": np.asarray(user_ids)[rng.integers(0, len(user_ids), count)].tolist(),
+        "picks": picks.tolist(),
+        "masks": picks_to_masks(picks).tolist(),
+        "is_auto": is_auto.tolist(),
+        "created_at": random_created_at(count, rng, days, distribution, now),
+    }
+
+
+@contextmanager
+def _explicit_created_at():
+    """bulk_create가 created_at(auto_now_add)을 현재 시각으로 덮어쓰지 않도록 잠시 끔"""
+    field = Ticket._meta.get_field('created_at')
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def _insert_bulk_create(batch, round_id):
+    tickets = [
+        Ticket(
+            round_id=round_id,
+            user_id=user_id,
+            numbers=",".join(map(str, nums)),
+            numbers_mask=mask,
+            is_auto=is_auto,
+            created_at=created_at,
+        )
+        for user_id, nums, mask, is_auto, created_at in zip(
+            batch["user_id"], batch["picks"], batch["masks"], batch["is_auto"], batch["created_at"]
+        )
+    ]
+    with _explicit_created_at():
+        tickets = Ticket.objects.bulk_create(tickets)
+    # 번호 행은 티켓의 6배라 모델 객체를 만들지 않고 executemany로 넣는다
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {TicketNumber._meta.db_table} (ticket_id, number) VALUES (%s, %s)",
+            [(ticket.id, n) for ticket, nums in zip(tickets, batch["picks"]) for n in nums],
+        )
+
+
+def _next_ids(cursor, table, count):
+    cursor.execute(
+        f"SELECT nextval(pg_get_serial_sequence('{table}', 'id')) FROM generate_series(1, %s)", [count]
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _copy_rows(cursor, table, columns, rows):
+    """PostgreSQL COPY FROM STDIN (psycopg 3 / psycopg2 모두 지원)"""
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    raw = cursor.cursor
+    if hasattr(raw, 'copy'):
+        with raw.copy(sql) as copy:
+            for row in rows:
+                copy.write_row(row)
+        return
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    raw.copy_expert(sql, buffer)
+
+
+def _insert_copy(batch, round_id):
+    ticket_table = Ticket._meta.db_table
+    number_table = TicketNumber._meta.db_table
+    count = len(batch["masks"])
+    with connection.cursor() as cursor:
+        ticket_ids = _next_ids(cursor, ticket_table, count)
+        _copy_rows(
+            cursor, ticket_table,
+            ('id', 'round_id', 'user_id', 'numbers', 'numbers_mask', 'is_auto', 'created_at', 'winning_grade'),
+            (
+                (pk, round_id, user_id, ",".join(map(str, nums)), mask, is_auto, created_at.isoformat(), 0)
+                for pk, user_id, nums, mask, is_auto, created_at in zip(
+                    ticket_ids, batch["user_id"], batch["picks"], batch["masks"],
+                    batch["is_auto"], batch["created_at"],
+                )
+            ),
+        )
+        number_ids = iter(_next_ids(cursor, number_table, count * 6))
+        _copy_rows(
+            cursor, number_table, ('id', 'ticket_id', 'number'),
+            ((next(number_ids), pk, n) for pk, nums in zip(ticket_ids, batch["picks"]) for n in nums),
+        )
+
+
+def seed_ticket_range(count, user_ids, seed, auto_ratio=0.7, days=30, distribution='uniform',
+                      batch_size=10000, now=None, round_id=None):
+    """
+    티켓 count장 생성 (현재 프로세스, 배치마다 커밋, round_id가 없으면 현재 회차)
+
+    Returns:
+        int: 생성한 티켓 수
+    """
+    rng = np.random.default_rng(seed)
+    now = now or timezone.now()
+    round_id = round_id or Round.current().id
+    insert = _insert_copy if connection.vendor == 'postgresql' else _insert_bulk_create
+    for offset in range(0, count, batch_size):
+        batch = generate_batch(min(batch_size, count - offset), user_ids, rng, auto_ratio, days, distribution, now)
+        with transaction.atomic():
+            insert(batch, round_id)
+    return count
+
+
+def _init_seed_worker():
+    """프로세스 풀 워커 초기화 (spawn 방식에서는 Django 설정부터 필요)"""
+    django.setup()
+
+
+def seed_tickets(count, user_ids, seed=0, workers=1, progress=None, **options):
+    """
+    티켓 count장을 workers개 프로세스로 나눠 생성
+
+    워커 i는 시드 (seed, i)로 자기 몫을 만들므로 같은 옵션이면 같은 데이터가 만들어진다.
+    SQLite는 쓰기가 직렬화되므로 항상 현재 프로세스에서 처리한다.
+
+    Args:
+        count: 생성할 티켓 수
+        user_ids: 티켓을 나눠 줄 사용자 ID 목록
+        seed: 난수 시드
+        workers: 프로세스 수
+        progress: 워커 하나가 끝날 때마다 (완료 티켓 수, 전체)로 호출되는 함수 (옵션)
+        **options: seed_ticket_range 옵션 (auto_ratio, days, distribution, batch_size, round_id)
+
+    Returns:
+        float: 걸린 시간(초)
+    """
+    started = time.monotonic()
+    options.setdefault('now', timezone.now())
+    options.setdefault('round_id', Round.current().id)
+    if connection.vendor == 'sqlite':
+        workers = 1
+    shares = [count // workers + (1 if i < count % workers else 0) for i in range(workers)]
+
+    if workers <= 1:
+        seed_ticket_range(count, user_ids, [seed, 0], **options)
+        if progress:
+            progress(count, count)
+        return time.monotonic() - started
+
+    done = 0
+    # 부모 프로세스의 연결을 자식 프로세스가 물려받아 함께 쓰지 않도록 먼저 닫는다
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_seed_worker) as executor:
+        futures = [
+            executor.submit(seed_ticket_range, share, user_ids, [seed, i], **options)
+            for i, share in enumerate(shares) if share
+        ]
+        for future in as_completed(futures):
+            done += future.result()
+            logger.info("합성 티켓 생성 진행: %s/%s", done, count)
+            if progress:
+                progress(done, count)
+    return time.monotonic() - started
@@ -0,0 +1,386 @@
+"""
+비트마스크 기반 당첨 등급 일괄 계산 엔진
+
+티켓마다 번호 문자열을 파싱해 set을 만드는 대신, 저장된 비트마스크를
+NumPy 배열로 모아 popcount로 일치 개수를 한 번에 계산한다.
+결과는 utils.calculate_winning_grade와 동일하다.
+
+정산 방식 (settings.LOTTO_SETTLEMENT_MODE):
+    chunked: 티켓을 청크 단위로 읽어 NumPy로 계산 후 일괄 UPDATE
+    sql: 티켓을 파이썬으로 읽지 않고 DB 안에서 등급별 UPDATE로 계산
+    parallel: 티켓 기본키 범위를 나눠 여러 프로세스에서 chunked 방식으로 계산
+
+1~3등은 당첨 조합과 5개 이상 일치하는 조합(1 + 6 x 39개)의 티켓뿐이므로, 전체 정산 전에
+settle_top_tiers로 번호 조합 인덱스만 조회해 먼저 확정할 수 있다.
+"""
+import itertools
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+import numpy as np
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.db.models import Case, F, IntegerField, Max, Min, Value, When
+from django.db.models.lookups import Exact
+from django.utils import timezone
+
+from .models import Draw, DrawResult, Ticket
+from .utils import top_tier_masks
+
+logger = logging.getLogger(__name__)
+
+
+def grades_from_masks(masks, draw_mask, bonus_number=None):
+    """
+    티켓 비트마스크 배열에 대한 당첨 등급 배열 계산
+
+    Args:
+        masks: 티켓 비트마스크 배열 (int64)
+        draw_mask: 당첨번호 비트마스크
+        bonus_number: 보너스 번호 (옵션)
+
+    Returns:
+        numpy.ndarray: 당첨 등급 배열 (int8, 0: 낙첨, 1~5: 등급)
+    """
+    masks = np.asarray(masks, dtype=np.int64)
+    match_counts = np.bitwise_count(masks & np.int64(draw_mask))
+
+    grades = np.zeros(masks.shape, dtype=np.int8)
+    grades[match_counts == 3] = 5
+    grades[match_counts == 4] = 4
+    grades[match_counts == 5] = 3
+    if bonus_number:
+        has_bonus = (masks & np.int64(1 << bonus_number)) != 0
+        grades[(match_counts == 5) & has_bonus] = 2
+    grades[match_counts == 6] = 1
+    return grades
+
+
+class SettlementReport:
+    """정산 진행 상황 및 처리량 보고"""
+
+    def __init__(self, draw):
+        self.draw = draw
+        self.processed = 0
+        self.chunks = 0
+        self.grade_counts = {grade: 0 for grade in range(0, 6)}
+        self.last_pk = None
+        self.started_at = time.monotonic()
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self):
+        """초당 처리한 티켓 수"""
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    def add_counts(self, grade_counts):
+        """등급별 티켓 수를 누적"""
+        for grade, count in grade_counts.items():
+            self.grade_counts[grade] += count
+            self.processed += count
+        self.chunks += 1
+        self.elapsed = time.monotonic() - self.started_at
+
+    def add_chunk(self, grades, last_pk=None):
+        counts = np.bincount(grades, minlength=6)
+        self.last_pk = last_pk
+        self.add_counts({grade: int(counts[grade]) for grade in range(0, 6)})
+
+    def __str__(self):
+        return f"{self.processed}장 / {self.chunks}청크 / {self.elapsed:.2f}초 ({self.throughput:,.0f}장/초)"
+
+
+def iter_ticket_chunks(tickets, chunk_size):
+    """
+    기본키 순서로 고정 크기 청크를 스트리밍
+
+    Yields:
+        numpy.ndarray: (N, 2) 배열 - [id, numbers_mask]
+    """
+    last_pk = 0
+    while True:
+        rows = (
+            tickets.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('id', 'numbers_mask')[:chunk_size]
+        )
+        chunk = np.fromiter(
+            itertools.chain.from_iterable(rows.iterator(chunk_size=chunk_size)),
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        if not len(chunk):
+            return
+        yield chunk
+        last_pk = int(chunk[-1, 0])
+
+
+def settle_tickets(draw, tickets=None, chunk_size=None, progress=None):
+    """
+    티켓의 당첨 등급을 청크 단위로 계산해 저장
+
+    청크마다 하나의 트랜잭션에서 기본키 범위 UPDATE로 낙첨을 먼저 기록하고,
+    당첨 티켓만 등급별 UPDATE로 덮어쓴다.
+
+    Args:
+        draw: 추첨 (Draw)
+        tickets: 정산할 티켓 queryset (기본값: 전체 티켓)
+        chunk_size: 청크 크기 (기본값: settings.LOTTO_SETTLEMENT_CHUNK_SIZE)
+        progress: 청크마다 SettlementReport를 받아 호출되는 함수 (옵션)
+
+    Returns:
+        SettlementReport: 처리 결과
+    """
+    if tickets is None:
+        tickets = Ticket.objects.all()
+    chunk_size = chunk_size or settings.LOTTO_SETTLEMENT_CHUNK_SIZE
+    draw_mask = draw.get_numbers_mask()
+    report = SettlementReport(draw)
+
+    for chunk in iter_ticket_chunks(tickets, chunk_size):
+        ids = chunk[:, 0]
+        grades = grades_from_masks(chunk[:, 1], draw_mask, draw.bonus_number)
+
+        with transaction.atomic():
+            tickets.filter(pk__range=(int(ids[0]), int(ids[-1]))).update(winning_grade=0, draw=draw)
+            for grade in range(1, 6):
+                winner_ids = ids[grades == grade].tolist()
+                if winner_ids:
+                    Ticket.objects.filter(pk__in=winner_ids).update(winning_grade=grade)
+
+        report.add_chunk(grades, last_pk=int(ids[-1]))
+        logger.info("추첨 %s 정산 진행: %s", draw.pk, report)
+        if progress:
+            progress(report)
+
+    report.elapsed = time.monotonic() - report.started_at
+    return report
+
+
+def _has_number(number):
+    """numbers_mask에 해당 번호가 있으면 1, 없으면 0인 SQL 식"""
+    return F('numbers_mask').bitrightshift(number).bitand(1)
+
+
+def winning_grade_expression(draw_numbers, bonus_number=None):
+    """
+    numbers_mask로부터 당첨 등급을 계산하는 SQL 식
+
+    일치 개수는 당첨번호 6개 각각의 비트를 더해 구한다.
+    (DB마다 다른 popcount 함수에 의존하지 않기 위함)
+    """
+    match_count = _has_number(draw_numbers[0])
+    for number in draw_numbers[1:]:
+        match_count = match_count + _has_number(number)
+
+    if bonus_number:
+        second_or_third = Case(
+            When(Exact(_has_number(bonus_number), 1), then=Value(2)),
+            default=Value(3),
+        )
+    else:
+        second_or_third = Value(3)
+
+    return Case(
+        When(Exact(match_count, 6), then=Value(1)),
+        When(Exact(match_count, 5), then=second_or_third),
+        When(Exact(match_count, 4), then=Value(4)),
+        When(Exact(match_count, 3), then=Value(5)),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def settle_tickets_sql(draw, tickets=None, progress=None, **kwargs):
+    """
+    티켓을 파이썬으로 읽지 않고 DB 안에서 당첨 등급을 계산해 저장
+
+    티켓 수와 무관하게 등급별 UPDATE 6번(낙첨 포함)만 실행하고, 각 UPDATE가 바꾼 행 수를
+    그 등급의 티켓 수로 센다. UPDATE마다 커밋하고 progress를 호출하므로 오래 걸리는 정산도
+    작업 갱신 시각이 멈추지 않는다.
+
+    Args:
+        progress: 등급별 UPDATE마다 SettlementReport를 받아 호출되는 함수 (옵션)
+
+    Returns:
+        SettlementReport: 처리 결과
+    """
+    if tickets is None:
+        tickets = Ticket.objects.all()
+    report = SettlementReport(draw)
+    grade = winning_grade_expression(draw.get_numbers_list(), draw.bonus_number)
+
+    for value in (1, 2, 3, 4, 5, 0):
+        count = tickets.filter(Exact(grade, value)).update(winning_grade=value, draw=draw)
+        report.add_counts({value: count})
+        if progress:
+            progress(report)
+
+    logger.info("추첨 %s 정산 완료 (SQL): %s", draw.pk, report)
+    return report
+
+
+def _init_partition_worker():
+    """프로세스 풀 워커 초기화 (spawn 방식에서는 Django 설정부터 필요)"""
+    django.setup()
+
+
+def _settle_partition(draw_id, ticket_query, start_pk, end_pk, chunk_size):
+    """워커 프로세스에서 기본키 범위 하나를 정산하고 등급별 티켓 수를 반환"""
+    draw = Draw.objects.get(pk=draw_id)
+    tickets = Ticket.objects.all()
+    tickets.query = ticket_query
+    report = settle_tickets(draw, tickets=tickets.filter(pk__range=(start_pk, end_pk)), chunk_size=chunk_size)
+    return report.grade_counts
+
+
+def partition_pk_range(tickets, partitions):
+    """티켓 기본키 범위를 거의 같은 크기의 (시작, 끝) 구간 목록으로 분할"""
+    bounds = tickets.aggregate(low=Min('pk'), high=Max('pk'))
+    low, high = bounds['low'], bounds['high']
+    if low is None:
+        return []
+    step = -(-(high - low + 1) // partitions)  # 올림 나눗셈
+    return [(start, min(start + step - 1, high)) for start in range(low, high + 1, step)]
+
+
+def settle_tickets_parallel(draw, tickets=None, workers=None, chunk_size=None, progress=None):
+    """
+    티켓 기본키 범위를 나눠 여러 프로세스에서 동시에 정산
+
+    각 워커 프로세스는 자신의 DB 연결을 열고 settle_tickets로 범위 하나를 처리한다.
+    워커가 1개이거나 프로세스 간에 공유할 수 없는 DB(SQLite 메모리 DB)이면
+    현재 프로세스에서 chunked 방식으로 처리한다.
+
+    Args:
+        draw: 추첨 (Draw)
+        tickets: 정산할 티켓 queryset (기본값: 전체 티켓)
+        workers: 워커 프로세스 수 (기본값: settings.LOTTO_SETTLEMENT_WORKERS)
+        chunk_size: 워커별 청크 크기 (기본값: settings.LOTTO_SETTLEMENT_CHUNK_SIZE)
+        progress: 범위 하나가 끝날 때마다 SettlementReport를 받아 호출되는 함수 (옵션)
+
+    Returns:
+        SettlementReport: 처리 결과
+    """
+    if tickets is None:
+        tickets = Ticket.objects.all()
+    workers = workers or settings.LOTTO_SETTLEMENT_WORKERS
+    chunk_size = chunk_size or settings.LOTTO_SETTLEMENT_CHUNK_SIZE
+
+    if workers <= 1 or (connection.vendor == 'sqlite' and connection.is_in_memory_db()):
+        return settle_tickets(draw, tickets=tickets, chunk_size=chunk_size, progress=progress)
+
+    report = SettlementReport(draw)
+    ranges = partition_pk_range(tickets, workers)
+
+    # 부모 프로세스의 연결을 자식 프로세스가 물려받아 함께 쓰지 않도록 먼저 닫는다
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_partition_worker) as executor:
+        futures = [
+            executor.submit(_settle_partition, draw.pk, tickets.query, start, end, chunk_size)
+            for start, end in ranges
+        ]
+        for future in as_completed(futures):
+            report.add_counts(future.result())
+            logger.info("추첨 %s 병렬 정산 진행: %s", draw.pk, report)
+            if progress:
+                progress(report)
+
+    report.elapsed = time.monotonic() - report.started_at
+    return report
+
+
+SETTLEMENT_MODES = {
+    'chunked': settle_tickets,
+    'sql': settle_tickets_sql,
+    'parallel': settle_tickets_parallel,
+}
+
+
+def settle_top_tiers(draw, tickets=None):
+    """
+    1~3등 티켓만 먼저 찾아 정산 (전체 정산 전에 실행)
+
+    당첨 조합과 5개 이상 일치하는 조합의 티켓을 번호 조합 인덱스로 조회하므로
+    티켓 수와 무관하게 쿼리 몇 번으로 끝난다. 1~3등 수는 DrawResult에 바로 기록하고
+    top_tiers_at을 남겨, 이후 전체 정산이 같은 티켓을 다시 세지 않게 한다.
+
+    Args:
+        draw: 추첨 (Draw)
+        tickets: 정산할 티켓 queryset (기본값: 전체 티켓)
+
+    Returns:
+        dict: {1: 1등 수, 2: 2등 수, 3: 3등 수}
+    """
+    if tickets is None:
+        tickets = Ticket.objects.all()
+    grades = top_tier_masks(draw.get_numbers_list(), draw.bonus_number)
+    winner_ids = {1: [], 2: [], 3: []}
+    for pk, mask in tickets.filter(numbers_mask__in=list(grades)).values_list('id', 'numbers_mask'):
+        winner_ids[grades[mask]].append(pk)
+
+    with transaction.atomic():
+        for grade, ids in winner_ids.items():
+            if ids:
+                Ticket.objects.filter(pk__in=ids).update(winning_grade=grade, draw=draw)
+        DrawResult.objects.get_or_create(draw=draw)
+        DrawResult.objects.filter(draw=draw).update(
+            top_tiers_at=timezone.now(),
+            updated_at=timezone.now(),
+            **{f'grade{grade}_count': len(ids) for grade, ids in winner_ids.items()},
+        )
+
+    counts = {grade: len(ids) for grade, ids in winner_ids.items()}
+    logger.info("추첨 %s 1~3등 확정: %s", draw.pk, counts)
+    return counts
+
+
+def record_draw_result(draw, grade_counts):
+    """
+    정산한 등급별 티켓 수를 추첨 결과 요약(DrawResult)에 누적
+
+    범위별로 나눠 정산하는 경우 범위마다 한 번씩 호출된다.
+    settle_top_tiers로 1~3등을 먼저 확정한 추첨이면 1~3등 수는 더하지 않는다.
+    """
+    DrawResult.objects.get_or_create(draw=draw)
+    DrawResult.objects.filter(draw=draw).update(
+        total_tickets=F('total_tickets') + sum(grade_counts.values()),
+        updated_at=timezone.now(),
+        **{
+            f'grade{grade}_count': Case(
+                When(top_tiers_at__isnull=True, then=F(f'grade{grade}_count') + grade_counts.get(grade, 0)),
+                default=F(f'grade{grade}_count'),
+            )
+            for grade in range(1, 4)
+        },
+        **{
+            f'grade{grade}_count': F(f'grade{grade}_count') + grade_counts.get(grade, 0)
+            for grade in range(4, 6)
+        },
+    )
+
+
+def settle_draw(draw, tickets=None, mode=None, record_result=True, **kwargs):
+    """
+    설정된 방식으로 추첨 정산 실행
+
+    Args:
+        draw: 추첨 (Draw)
+        tickets: 정산할 티켓 queryset (기본값: 전체 티켓)
+        mode: 정산 방식 (기본값: settings.LOTTO_SETTLEMENT_MODE)
+        record_result: 정산 결과를 DrawResult에 누적할지 여부
+        **kwargs: 각 정산 함수에 전달할 옵션 (chunk_size, progress 등)
+
+    Returns:
+        SettlementReport: 처리 결과
+    """
+    mode = mode or settings.LOTTO_SETTLEMENT_MODE
+    try:
+        settle = SETTLEMENT_MODES[mode]
+    except KeyError:
+        raise ValueError(f"알 수 없는 정산 방식입니다: {mode}")
+    report = settle(draw, tickets=tickets, **kwargs)
+    if record_result:
+        record_draw_result(draw, report.grade_counts)
+    return report
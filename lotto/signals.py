@@ -0,0 +1,24 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .draws import invalidate_current_draw, publish_current_draw
+from .models import Draw
+from .timing import install_query_hook
+
+
+@receiver(post_save, sender=Draw)
+@receiver(post_delete, sender=Draw)
+def draw_changed(sender, **kwargs):
+    """추첨이 저장·삭제되면 현재 추첨 캐시 무효화 (DrawAdmin에서의 수정 포함)"""
+    invalidate_current_draw()
+    # 커밋 전에 다른 요청이 이전 값으로 캐시를 다시 채웠을 수 있으므로
+    # 커밋 후 새 스냅샷을 미리 만들어 캐시를 덮어쓴다
+    transaction.on_commit(publish_current_draw)
+
+
+@receiver(connection_created)
+def connection_opened(sender, connection, **kwargs):
+    """새 DB 연결에 요청 계측 훅을 건다 (lotto.timing)"""
+    install_query_hook(connection)
@@ -1,12 +1,51 @@
-from django.test import TestCase, Client
+from asgiref.sync import sync_to_async
+from django.test import TestCase, Client, override_settings
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import unittest
+from io import StringIO
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
 from django.urls import reverse
-from .models import Ticket, Draw
-from .utils import calculate_winning_grade
+from .models import ApiToken, ArchivedTicket, ComboExposure, NumberExposure, NumberRollup, Round, Ticket, TicketNumber, Draw, DrawResult, SalesRollup, SalesTotal, SettlementJob, UserSalesRollup
+from .utils import calculate_winning_grade, numbers_to_mask, mask_to_numbers
+from .settlement import (
+    grades_from_masks, partition_pk_range, settle_draw, settle_tickets, settle_tickets_parallel, settle_tickets_sql,
+    settle_top_tiers,
+)
+from .jobs import claim_next_job, enqueue_settlement, requeue_stale_jobs, run_job
+from . import draws
+from .draws import get_current_draw, invalidate_current_draw, publish_current_draw
+from .purchase import issue_tickets
+from .rounds import close_sales, draw_round
+from .exposure import projected_winners, rebuild_exposure
+from .export import iter_export, pa as export_pa
+from .sales import rebuild_sales_rollup
+from .ticket_numbers import filter_tickets_by_numbers, number_frequency, parse_number_query
+from .archive import archivable_rounds, archive_round
+from .profiling import list_profiles, load_profile
+from .benchmarks import compare_results, query_growth
+from .autopick import COMBINATIONS, generate_picks, make_rng, picks_to_masks
+from collections import Counter
+import json
 import random
+import tempfile
+from datetime import timedelta
+from django.utils import timezone
+import numpy as np
 
 
-class TicketModelTest(TestCase):
+class LottoTestCase(TestCase):
+    """테스트마다 현재 추첨 캐시를 비우는 TestCase (롤백으로는 Draw 시그널이 발생하지 않음)"""
+
+    @classmethod
+    def _pre_setup(cls):
+        super()._pre_setup()
+        invalidate_current_draw()
+
+
+class TicketModelTest(LottoTestCase):
     """Ticket 모델 테스트"""
     
     def setUp(self):
@@ -39,7 +78,7 @@ class TicketModelTest(TestCase):
         self.assertEqual(numbers, [1, 2, 3, 4, 5, 6])
 
 
-class DrawModelTest(TestCase):
+class DrawModelTest(LottoTestCase):
     """Draw 모델 테스트"""
     
     def test_draw_creation(self):
@@ -63,7 +102,7 @@ class DrawModelTest(TestCase):
         self.assertEqual(numbers, [1, 2, 3, 4, 5, 6])
 
 
-class WinningGradeCalculationTest(TestCase):
+class WinningGradeCalculationTest(LottoTestCase):
     """당첨 등급 계산 테스트"""
     
     def test_1등_당첨(self):
@@ -110,7 +149,143 @@ class WinningGradeCalculationTest(TestCase):
         self.assertEqual(grade, 0)
 
 
-class UserViewTest(TestCase):
+class BitmaskSettlementTest(LottoTestCase):
+    """비트마스크 일괄 계산 엔진 테스트"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+
+    def test_mask_roundtrip(self):
+        """번호 ↔ 비트마스크 변환"""
+        mask = numbers_to_mask([1, 5, 12, 20, 33, 45])
+        self.assertEqual(mask_to_numbers(mask), [1, 5, 12, 20, 33, 45])
+
+    def test_ticket_stores_mask(self):
+        """티켓 저장 시 비트마스크가 함께 저장됨"""
+        ticket = Ticket.objects.create(user=self.user, numbers="1,2,3,4,5,6")
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.numbers_mask, numbers_to_mask([1, 2, 3, 4, 5, 6]))
+
+    def test_grades_match_reference(self):
+        """일괄 계산 결과가 calculate_winning_grade와 동일"""
+        rng = random.Random(42)
+        draw_nums = [3, 11, 19, 27, 35, 43]
+        bonus = 7
+        tickets = [sorted(rng.sample(range(1, 46), 6)) for _ in range(2000)]
+        # 상위 등급이 반드시 포함되도록 추가
+        tickets += [draw_nums, [3, 11, 19, 27, 35, 7], [3, 11, 19, 27, 35, 1]]
+
+        grades = grades_from_masks([numbers_to_mask(t) for t in tickets], numbers_to_mask(draw_nums), bonus)
+        expected = [calculate_winning_grade(t, draw_nums, bonus) for t in tickets]
+        self.assertEqual(grades.tolist(), expected)
+
+    def test_settle_tickets(self):
+        """추첨 결과가 티켓에 저장됨"""
+        first = Ticket.objects.create(user=self.user, numbers="1,2,3,4,5,6")
+        second = Ticket.objects.create(user=self.user, numbers="1,2,3,4,5,7")
+        loser = Ticket.objects.create(user=self.user, numbers="40,41,42,43,44,45")
+        draw = Draw.objects.create(numbers="1,2,3,4,5,6", bonus_number=7)
+
+        report = settle_tickets(draw)
+
+        self.assertEqual(report.processed, 3)
+        self.assertEqual(report.grade_counts[1], 1)
+        self.assertEqual(report.grade_counts[2], 1)
+        for ticket, grade in ((first, 1), (second, 2), (loser, 0)):
+            ticket.refresh_from_db()
+            self.assertEqual(ticket.winning_grade, grade)
+            self.assertEqual(ticket.draw, draw)
+
+    def test_settle_tickets_in_chunks(self):
+        """청크 단위 정산 및 진행 상황 보고"""
+        for _ in range(5):
+            Ticket.objects.create(user=self.user, numbers="1,2,3,10,11,12")
+        draw = Draw.objects.create(numbers="1,2,3,4,5,6", bonus_number=7)
+        progress = []
+
+        report = settle_tickets(draw, chunk_size=2, progress=lambda r: progress.append(r.processed))
+
+        self.assertEqual(progress, [2, 4, 5])
+        self.assertEqual(report.chunks, 3)
+        self.assertEqual(Ticket.objects.filter(draw=draw, winning_grade=5).count(), 5)
+
+
+class SettlementModeTest(LottoTestCase):
+    """정산 방식별 결과가 calculate_winning_grade와 동일한지 검증"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        rng = random.Random(7)
+        self.draw_nums = [2, 9, 17, 23, 31, 44]
+        self.bonus = 12
+        picks = [sorted(rng.sample(range(1, 46), 6)) for _ in range(300)]
+        picks += [
+            self.draw_nums,
+            [2, 9, 17, 23, 31, 12],
+            [2, 9, 17, 23, 31, 45],
+            [2, 9, 17, 23, 1, 3],
+            [2, 9, 17, 1, 3, 4],
+        ]
+        for nums in picks:
+            Ticket.objects.create(user=self.user, numbers=",".join(str(n) for n in nums))
+        self.draw = Draw.objects.create(
+            numbers=",".join(str(n) for n in self.draw_nums),
+            bonus_number=self.bonus,
+        )
+
+    def assertMatchesReference(self, report):
+        expected_counts = {grade: 0 for grade in range(0, 6)}
+        for ticket in Ticket.objects.all():
+            expected = calculate_winning_grade(ticket.get_numbers_list(), self.draw_nums, self.bonus)
+            self.assertEqual(ticket.winning_grade, expected, ticket.numbers)
+            self.assertEqual(ticket.draw_id, self.draw.id)
+            expected_counts[expected] += 1
+        self.assertEqual(report.grade_counts, expected_counts)
+        self.assertEqual(report.processed, Ticket.objects.count())
+
+    def test_sql_settlement(self):
+        """SQL 정산 결과"""
+        self.assertMatchesReference(settle_tickets_sql(self.draw))
+
+    def test_chunked_settlement(self):
+        """청크 정산 결과"""
+        self.assertMatchesReference(settle_tickets(self.draw, chunk_size=64))
+
+    def test_parallel_settlement(self):
+        """병렬 정산 결과 (메모리 DB에서는 현재 프로세스에서 처리)"""
+        self.assertMatchesReference(settle_tickets_parallel(self.draw, workers=4))
+
+    def test_partition_pk_range(self):
+        """기본키 범위 분할"""
+        ranges = partition_pk_range(Ticket.objects.all(), 4)
+        ids = list(Ticket.objects.order_by('pk').values_list('pk', flat=True))
+        self.assertEqual(len(ranges), 4)
+        self.assertEqual((ranges[0][0], ranges[-1][1]), (ids[0], ids[-1]))
+        self.assertEqual(partition_pk_range(Ticket.objects.none(), 4), [])
+
+    def test_sql_settlement_query_count(self):
+        """SQL 정산은 티켓 수와 무관하게 쿼리 수가 일정"""
+        # 등급별 UPDATE (1~5등, 낙첨)
+        with self.assertNumQueries(6):
+            settle_tickets_sql(self.draw)
+
+    def test_progress_reported_in_every_mode(self):
+        """sql·parallel 방식도 진행 상황을 알려 작업 갱신 시각이 멈추지 않음"""
+        for settle, expected_calls in ((settle_tickets_sql, 6), (settle_tickets_parallel, None)):
+            reports = []
+            settle(self.draw, progress=reports.append)
+            self.assertTrue(reports, settle.__name__)
+            if expected_calls:
+                self.assertEqual(len(reports), expected_calls)
+            self.assertEqual(reports[-1].processed, Ticket.objects.count())
+
+    def test_settle_draw_unknown_mode(self):
+        """알 수 없는 정산 방식"""
+        with self.assertRaises(ValueError):
+            settle_draw(self.draw, mode='unknown')
+
+
+class UserViewTest(LottoTestCase):
     """사용자 뷰 테스트"""
     
     def setUp(self):
@@ -187,7 +362,7 @@ class UserViewTest(TestCase):
         self.assertEqual(ticket.numbers, '1,2,3,4,5,6')
 
 
-class AdminViewTest(TestCase):
+class AdminViewTest(LottoTestCase):
     """관리자 뷰 테스트"""
     
     def setUp(self):
@@ -240,6 +415,9 @@ class AdminViewTest(TestCase):
         response = self.client.post(reverse('admin_draw'))
         self.assertEqual(response.status_code, 302)  # 리다이렉트
         self.assertTrue(Draw.objects.filter(is_active=True).exists())
+        response = self.client.get(reverse('admin_draw'))
+        self.assertContains(response, '<title>추첨 진행 - 로또 사이트</title>')
+        self.assertContains(response, '<script>', count=1)
     
     def test_admin_winners_requires_superuser(self):
         """당첨자 확인은 superuser만 접근 가능"""
@@ -253,3 +431,1340 @@ class AdminViewTest(TestCase):
         self.client.login(username='admin', password='adminpass123')
         response = self.client.get(reverse('admin_winners'))
         self.assertEqual(response.status_code, 200)
+
+
+class SettlementJobTest(LottoTestCase):
+    """백그라운드 정산 작업 테스트"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.admin = User.objects.create_superuser(username='admin', password='adminpass123')
+        for _ in range(10):
+            Ticket.objects.create(user=self.user, numbers="1,2,3,4,5,6")
+
+    def test_enqueue_splits_id_range(self):
+        """티켓 기본키 범위를 작업 여러 개로 분할"""
+        draw = Draw.objects.create(numbers="1,2,3,4,5,6", bonus_number=7)
+        jobs = enqueue_settlement(draw, partitions=3)
+        ids = list(Ticket.objects.order_by('pk').values_list('pk', flat=True))
+        self.assertEqual(len(jobs), 3)
+        self.assertEqual(jobs[0].start_pk, ids[0])
+        self.assertEqual(jobs[-1].end_pk, ids[-1])
+        for before, after in zip(jobs, jobs[1:]):
+            self.assertEqual(before.end_pk + 1, after.start_pk)
+
+    def test_claim_is_exclusive(self):
+        """같은 작업을 두 워커가 가져가지 않음"""
+        draw = Draw.objects.create(numbers="1,2,3,4,5,6", bonus_number=7)
+        enqueue_settlement(draw, partitions=2)
+        first = claim_next_job('worker-1')
+        second = claim_next_job('worker-2')
+        self.assertNotEqual(first.id, second.id)
+        self.assertIsNone(claim_next_job('worker-3'))
+
+    def test_admin_draw_enqueues_and_worker_settles(self):
+        """추첨 요청은 작업만 등록하고, 워커가 정산"""
+        self.client.login(username='admin', password='adminpass123')
+        response = self.client.post(reverse('admin_draw'))
+        self.assertEqual(response.status_code, 302)
+        draw = Draw.objects.get(is_active=True)
+        self.assertTrue(SettlementJob.objects.filter(draw=draw, status=SettlementJob.STATUS_PENDING).exists())
+        self.assertFalse(Ticket.objects.filter(draw=draw).exists())
+
+        call_command('settlement_worker', '--once', stdout=StringIO())
+
+        self.assertEqual(Ticket.objects.filter(draw=draw).count(), 10)
+        response = self.client.get(reverse('admin_draw_progress', args=[draw.id]))
+        data = response.json()
+        self.assertEqual(data['status'], SettlementJob.STATUS_DONE)
+        self.assertEqual(data['percent'], 100.0)
+        self.assertEqual(data['processed'], 10)
+
+    def test_requeued_job_counted_once(self):
+        """다시 대기열에 들어간 느린 작업을 두 워커가 모두 끝내도 결과는 한 번만 누적"""
+        draw = Draw.objects.create(numbers="1,2,3,4,5,6", bonus_number=7)
+        enqueue_settlement(draw, partitions=1)
+        slow = claim_next_job('worker-1')
+        SettlementJob.objects.filter(pk=slow.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale_jobs(stale_after=60), 1)
+        fast = claim_next_job('worker-2')
+        self.assertEqual(fast.pk, slow.pk)
+
+        run_job(fast)
+        with self.assertLogs('lotto.jobs', 'WARNING'):
+            run_job(slow)
+
+        result = DrawResult.objects.get(draw=draw)
+        self.assertEqual(result.total_tickets, 10)
+        self.assertEqual(result.grade1_count, 10)
+        self.assertEqual(SettlementJob.objects.get(pk=fast.pk).worker, 'worker-2')
+
+    @override_settings(LOTTO_SETTLEMENT_BACKGROUND=False)
+    def test_admin_draw_synchronous(self):
+        """백그라운드 정산을 끄면 요청 안에서 정산"""
+        self.client.login(username='admin', password='adminpass123')
+        self.client.post(reverse('admin_draw'))
+        draw = Draw.objects.get(is_active=True)
+        self.assertEqual(Ticket.objects.filter(draw=draw).count(), 10)
+        self.assertFalse(SettlementJob.objects.exists())
+
+
+class DrawResultTest(LottoTestCase):
+    """추첨 결과 요약 테스트"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.admin = User.objects.create_superuser(username='admin', password='adminpass123')
+        Ticket.objects.create(user=self.user, numbers="1,2,3,4,5,6")
+        Ticket.objects.create(user=self.user, numbers="1,2,3,4,5,7")
+        Ticket.objects.create(user=self.user, numbers="1,2,3,10,11,12")
+        Ticket.objects.create(user=self.user, numbers="40,41,42,43,44,45")
+        self.draw = Draw.objects.create(numbers="1,2,3,4,5,6", bonus_number=7)
+
+    def test_settlement_records_result(self):
+        """정산 시 등급별 당첨 수가 기록됨"""
+        settle_draw(self.draw)
+        result = DrawResult.objects.get(draw=self.draw)
+        self.assertEqual(result.total_tickets, 4)
+        self.assertEqual(result.get_grade_counts(), {1: 1, 2: 1, 3: 0, 4: 0, 5: 1})
+
+    def test_partitioned_jobs_accumulate_result(self):
+        """범위별 작업 결과가 누적됨"""
+        enqueue_settlement(self.draw, partitions=4)
+        call_command('settlement_worker', '--once', stdout=StringIO())
+        result = DrawResult.objects.get(draw=self.draw)
+        self.assertEqual(result.total_tickets, 4)
+        self.assertEqual(result.winner_count, 3)
+
+    def test_admin_winners_reads_summary(self):
+        """당첨자 확인 페이지는 요약의 당첨 수를 사용"""
+        settle_draw(self.draw)
+        self.client.login(username='admin', password='adminpass123')
+        response = self.client.get(reverse('admin_winners'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['winners_by_grade'][1]['count'], 1)
+        self.assertEqual(response.context['winners_by_grade'][3]['count'], 0)
+        self.assertEqual(len(response.context['all_winning_tickets']), 3)
+
+    def test_top_tiers_settled_before_bulk(self):
+        """1~3등을 먼저 확정해도 전체 정산 후 결과가 중복 집계되지 않음"""
+        self.assertEqual(settle_top_tiers(self.draw), {1: 1, 2: 1, 3: 0})
+        self.assertEqual(
+            set(Ticket.objects.filter(draw=self.draw).values_list('numbers', 'winning_grade')),
+            {("1,2,3,4,5,6", 1), ("1,2,3,4,5,7", 2)},
+        )
+        result = DrawResult.objects.get(draw=self.draw)
+        self.assertIsNotNone(result.top_tiers_at)
+        self.assertEqual(result.total_tickets, 0)
+
+        enqueue_settlement(self.draw, partitions=4)
+        call_command('settlement_worker', '--once', stdout=StringIO())
+        result.refresh_from_db()
+        self.assertEqual(result.total_tickets, 4)
+        self.assertEqual(result.get_grade_counts(), {1: 1, 2: 1, 3: 0, 4: 0, 5: 1})
+
+
+class RoundTest(LottoTestCase):
+    """회차별 판매·정산 테스트"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.admin = User.objects.create_superuser(username='admin', password='adminpass123')
+        self.client.login(username='admin', password='adminpass123')
+
+    def buy(self, count):
+        return issue_tickets(self.user, [[1, 2, 3, 4, 5, 6]] * count, [False] * count)
+
+    @unittest.skipUnless(connection.vendor in ('postgresql', 'mysql'), "행 공유 잠금(FOR SHARE) 미지원 DB")
+    def test_purchase_and_close_lock_round_row(self):
+        """구매는 회차 행을 공유 잠금으로, 판매 마감은 배타 잠금으로 잡음"""
+        for action, lock in ((lambda: self.buy(1), 'FOR SHARE'), (close_sales, 'FOR UPDATE')):
+            with CaptureQueriesContext(connection) as ctx:
+                action()
+            table = connection.ops.quote_name('lotto_round')
+            self.assertTrue([q['sql'] for q in ctx.captured_queries if table in q['sql'] and lock in q['sql']])
+
+    @override_settings(LOTTO_SETTLEMENT_BACKGROUND=False)
+    def test_draw_settles_only_its_round(self):
+        """추첨은 그 회차 티켓만 정산하고 이전 회차 결과는 그대로 둠"""
+        first_round_tickets = self.buy(3)
+        self.client.post(reverse('admin_draw'))
+        first_draw = Draw.objects.get(is_active=True)
+        first_round = Round.objects.get(draw=first_draw)
+        self.assertEqual(first_round.status, Round.STATUS_DRAWN)
+        self.assertEqual(Round.current().number, first_round.number + 1)
+
+        second_round_tickets = self.buy(2)
+        self.assertTrue(all(t.round_id == Round.current().id for t in second_round_tickets))
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(reverse('admin_draw'))
+        second_draw = Draw.objects.get(is_active=True)
+
+        self.assertEqual(Ticket.objects.filter(draw=first_draw).count(), 3)
+        self.assertEqual(Ticket.objects.filter(draw=second_draw).count(), 2)
+        self.assertEqual(second_draw.result.total_tickets, 2)
+        self.assertEqual(
+            set(Ticket.objects.filter(id__in=[t.id for t in first_round_tickets]).values_list('draw_id', flat=True)),
+            {first_draw.id},
+        )
+        ticket_updates = [q['sql'] for q in ctx.captured_queries
+                          if q['sql'].startswith('UPDATE "lotto_ticket"')]
+        self.assertTrue(ticket_updates)
+        self.assertTrue(all('"round_id"' in sql for sql in ticket_updates))
+
+    def test_sales_cutoff(self):
+        """판매 마감 예정 시각이 지났거나 마감한 회차는 구매 불가, 추첨 후 다음 회차 구매 가능"""
+        current = Round.current()
+        current.sales_close_at = timezone.now() - timedelta(minutes=1)
+        current.save()
+        with self.assertRaises(ValidationError):
+            self.buy(1)
+
+        self.client.login(username='testuser', password='testpass123')
+        response = self.client.post(reverse('buy_ticket'), {'is_auto': 'on'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].non_field_errors())
+        self.assertFalse(Ticket.objects.exists())
+
+        self.client.login(username='admin', password='adminpass123')
+        self.client.post(reverse('admin_draw'))
+        self.assertEqual(len(self.buy(1)), 1)
+
+    def test_close_sales(self):
+        """관리자 판매 마감"""
+        self.buy(1)
+        self.client.post(reverse('admin_draw'), {'action': 'close_sales'})
+        current = Round.current()
+        self.assertEqual(current.status, Round.STATUS_CLOSED)
+        self.assertFalse(Draw.objects.exists())
+        with self.assertRaises(ValidationError):
+            self.buy(1)
+
+    @override_settings(LOTTO_ROUND_SALES_HOURS=2)
+    def test_next_round_sales_window(self):
+        """새 회차는 설정된 시간 뒤 판매 마감"""
+        self.client.post(reverse('admin_draw'))
+        current = Round.current()
+        self.assertAlmostEqual(
+            (current.sales_close_at - current.opened_at).total_seconds(), 7200, delta=1
+        )
+
+    def test_background_jobs_scoped_to_round(self):
+        """백그라운드 정산 작업도 회차 티켓만 정산"""
+        self.buy(3)
+        self.client.post(reverse('admin_draw'))
+        call_command('settlement_worker', '--once', stdout=StringIO())
+        self.buy(2)
+        self.client.post(reverse('admin_draw'))
+        draw = Draw.objects.get(is_active=True)
+        self.assertTrue(all(job.round_id == draw.round.id for job in draw.settlement_jobs.all()))
+
+        call_command('settlement_worker', '--once', stdout=StringIO())
+        self.assertEqual(Ticket.objects.filter(draw=draw).count(), 2)
+        self.assertEqual(draw.result.total_tickets, 2)
+
+    def test_ticket_result_follows_own_round(self):
+        """구매 완료·티켓 API는 활성 추첨이 아니라 티켓 회차의 추첨 결과를 보여줌"""
+        first = self.buy(1)[0]
+        first_draw, first_round = draw_round([1, 2, 3, 4, 5, 6], 7)
+        settle_draw(first_draw, tickets=first_round.tickets.all())
+        second = self.buy(1)[0]
+        self.client.login(username='testuser', password='testpass123')
+
+        # 판매 중인 회차의 티켓은 이전 회차 당첨번호와 같아도 추첨 전
+        response = self.client.get(reverse('buy_ticket_done', args=[second.id]))
+        self.assertIsNone(response.context['winning_numbers'])
+        self.assertIsNone(response.context['winning_grade'])
+        self.assertContains(response, '추첨 전')
+
+        # 다음 회차를 추첨해도 이전 회차 당첨 티켓은 저장된 등급 그대로
+        draw_round([40, 41, 42, 43, 44, 45], 1)
+        response = self.client.get(reverse('buy_ticket_done', args=[first.id]))
+        self.assertEqual(response.context['winning_grade'], 1)
+        self.assertEqual(response.context['winning_numbers'], first_draw.numbers)
+        self.assertContains(response, '1등 당첨!')
+
+        # 추첨했지만 아직 정산 전인 회차는 그 회차 당첨번호로 계산
+        response = self.client.get(reverse('buy_ticket_done', args=[second.id]))
+        self.assertEqual(response.context['winning_grade'], 0)
+        self.assertContains(response, '낙첨')
+
+        _, key = ApiToken.issue(self.user, name='단말기')
+        data = self.client.get(
+            reverse('api_ticket_detail', args=[first.id]), HTTP_AUTHORIZATION=f'Token {key}'
+        ).json()['ticket']
+        self.assertEqual((data['round'], data['draw']['id'], data['grade']), (first_round.number, first_draw.id, 1))
+
+    @unittest.skipUnless(connection.vendor == 'sqlite', "SQLite 실행 계획 형식 기준")
+    def test_round_settlement_uses_index(self):
+        """회차 티켓을 기본키 순으로 읽을 때 (round, id) 인덱스 사용"""
+        self.buy(3)
+        plan = Ticket.objects.filter(round=Round.current()).order_by('pk').values_list('id', 'numbers_mask').explain()
+        self.assertIn('lotto_ticket_round_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+
+@override_settings(LOTTO_SETTLEMENT_BACKGROUND=False)
+class ArchiveTest(LottoTestCase):
+    """정산이 끝난 회차의 티켓 보관 테스트"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.admin = User.objects.create_superuser(username='admin', password='adminpass123')
+        self.client.login(username='admin', password='adminpass123')
+        self.tickets = issue_tickets(self.user, [[1, 2, 3, 4, 5, 6], [1, 2, 3, 10, 11, 12], [20, 21, 22, 23, 24, 25]],
+                                     [False] * 3)
+        self.client.post(reverse('admin_draw'))
+        self.first_round = Round.objects.get(number=1)
+        self.tickets += issue_tickets(self.user, [[7, 8, 9, 10, 11, 12]] * 2, [False] * 2)
+        self.client.post(reverse('admin_draw'))
+        self.tickets += issue_tickets(self.user, [[13, 14, 15, 16, 17, 18]], [False])
+
+    def test_archive_moves_settled_rounds(self):
+        """최근 회차를 남기고 이전 회차 티켓을 보관 테이블로 옮김 (기본키·당첨 결과 유지)"""
+        before = dict(Ticket.objects.filter(round=self.first_round).values_list('id', 'winning_grade'))
+        call_command('archive_tickets', keep_rounds=1, batch_size=2, stdout=StringIO())
+
+        self.assertFalse(Ticket.objects.filter(round=self.first_round).exists())
+        self.assertEqual(Ticket.objects.count(), 3)
+        self.assertEqual(TicketNumber.objects.count(), 18)
+        archived = ArchivedTicket.objects.filter(round=self.first_round)
+        self.assertEqual(dict(archived.values_list('id', 'winning_grade')), before)
+        self.assertEqual(set(archived.values_list('draw_id', flat=True)), {self.first_round.draw_id})
+        self.first_round.refresh_from_db()
+        self.assertIsNotNone(self.first_round.archived_at)
+
+        out = StringIO()
+        call_command('archive_tickets', keep_rounds=1, stdout=out)
+        self.assertIn("보관할 회차가 없습니다", out.getvalue())
+
+    def test_active_and_unsettled_rounds_are_kept(self):
+        """활성 추첨 회차와 정산 중인 회차는 보관하지 않음"""
+        self.assertEqual(list(archivable_rounds(keep_rounds=1)), [self.first_round])
+        SettlementJob.objects.create(draw=self.first_round.draw, round=self.first_round, start_pk=1, end_pk=1)
+        self.assertEqual(list(archivable_rounds(keep_rounds=1)), [])
+        self.assertEqual(list(archivable_rounds(keep_rounds=5)), [])
+
+    @override_settings(LOTTO_MY_TICKETS_PAGE_SIZE=2, LOTTO_API_PAGE_SIZE=2)
+    def test_history_reads_continue_into_archive(self):
+        """내 티켓 목록·티켓 조회·내보내기·판매 집계는 보관 티켓까지 그대로 보여 줌"""
+        call_command('archive_tickets', keep_rounds=1, stdout=StringIO())
+        expected = sorted((t.id for t in self.tickets), reverse=True)
+
+        self.client.login(username='testuser', password='testpass123')
+        response = self.client.get(reverse('my_tickets'))
+        seen = [ticket.id for ticket in response.context['tickets']]
+        cursor = response.context['next_cursor']
+        while cursor:
+            data = self.client.get(reverse('my_tickets_more'), {'cursor': cursor}).json()
+            seen += [ticket['id'] for ticket in data['tickets']]
+            cursor = data['next_cursor']
+        self.assertEqual(seen, expected)
+
+        archived_id = self.tickets[0].id
+        response = self.client.get(reverse('buy_ticket_done', args=[archived_id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['ticket'].id, archived_id)
+
+        key = ApiToken.issue(self.user)[1]
+        response = self.client.get(reverse('api_ticket_detail', args=[archived_id]), HTTP_AUTHORIZATION=f'Token {key}')
+        self.assertEqual(response.json()['ticket']['id'], archived_id)
+
+        lines = ''.join(iter_export(self.first_round.draw_id, 'tickets', 'csv')).splitlines()
+        self.assertEqual(len(lines), 4)
+
+        rebuild_sales_rollup()
+        self.assertEqual(sum(SalesRollup.objects.values_list('ticket_count', flat=True)), 6)
+
+    def test_export_during_archiving_reads_both_tables(self):
+        """보관이 중간에 멈춘 회차의 내보내기는 두 테이블을 함께 읽음"""
+        draw_id = self.first_round.draw_id
+        expected = list(iter_export(draw_id, 'tickets', 'csv'))
+        winners = list(iter_export(draw_id, 'winners', 'csv'))
+
+        def stop(moved):
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            archive_round(self.first_round, batch_size=2, progress=stop)
+        self.first_round.refresh_from_db()
+        self.assertIsNotNone(self.first_round.archiving_at)
+        self.assertIsNone(self.first_round.archived_at)
+        self.assertEqual(ArchivedTicket.objects.filter(round=self.first_round).count(), 2)
+        self.assertEqual(list(iter_export(draw_id, 'tickets', 'csv')), expected)
+        self.assertEqual(list(iter_export(draw_id, 'winners', 'csv')), winners)
+
+        self.assertEqual(archive_round(self.first_round, batch_size=2), 1)
+        self.assertEqual(list(iter_export(draw_id, 'tickets', 'csv')), expected)
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', "EXPLAIN QUERY PLAN 형식은 SQLite 기준")
+class TicketIndexTest(LottoTestCase):
+    """주요 뷰의 티켓 조회가 인덱스를 사용하는지 EXPLAIN으로 검증"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.admin = User.objects.create_superuser(username='admin', password='adminpass123')
+        for nums in ("1,2,3,4,5,6", "1,2,3,4,5,7", "1,2,3,10,11,12", "40,41,42,43,44,45"):
+            Ticket.objects.create(user=self.user, numbers=nums)
+        self.draw = Draw.objects.create(numbers="1,2,3,4,5,6", bonus_number=7)
+        settle_draw(self.draw)
+
+    def ticket_query_plans(self, url, marker='"lotto_ticket"'):
+        """뷰가 실행한 티켓 SELECT 쿼리들의 실행 계획"""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        plans = []
+        with connection.cursor() as cursor:
+            for query in ctx.captured_queries:
+                sql = query['sql']
+                if sql.startswith('SELECT') and 'FROM "lotto_ticket"' in sql and marker in sql:
+                    cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                    plans.append((sql, [row[-1] for row in cursor.fetchall()]))
+        self.assertTrue(plans, "티켓 조회 쿼리가 없습니다.")
+        return plans
+
+    def assertUsesIndex(self, plans):
+        for sql, plan in plans:
+            ticket_steps = [step for step in plan if 'lotto_ticket' in step]
+            self.assertTrue(ticket_steps, sql)
+            for step in ticket_steps:
+                self.assertIn('INDEX', step, f"{sql}\n{plan}")
+
+    def assertNoSort(self, plans):
+        for sql, plan in plans:
+            self.assertFalse(any('TEMP B-TREE FOR ORDER BY' in step for step in plan), f"{sql}\n{plan}")
+
+    def test_my_tickets_uses_index(self):
+        self.client.login(username='testuser', password='testpass123')
+        plans = self.ticket_query_plans(reverse('my_tickets'))
+        self.assertUsesIndex(plans)
+        self.assertNoSort(plans)
+
+    def test_admin_winners_uses_index(self):
+        self.client.login(username='admin', password='adminpass123')
+        plans = self.ticket_query_plans(reverse('admin_winners'))
+        self.assertUsesIndex(plans)
+        self.assertNoSort(plans)
+
+    def test_top_tier_lookup_uses_combo_index(self):
+        """1~3등 조회는 회차·번호 조합 인덱스로 처리"""
+        with CaptureQueriesContext(connection) as ctx:
+            settle_top_tiers(self.draw, tickets=Round.current().tickets.all())
+        sql = next(
+            q['sql'] for q in ctx.captured_queries
+            if q['sql'].startswith('SELECT') and '"numbers_mask" IN' in q['sql']
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            plan = [row[-1] for row in cursor.fetchall()]
+        self.assertTrue(any('lotto_ticket_round_combo_idx' in step for step in plan), plan)
+
+    def test_admin_sales_does_not_scan_tickets(self):
+        """판매 실적은 판매 집계 테이블만 조회"""
+        self.client.login(username='admin', password='adminpass123')
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse('admin_sales'))
+        self.assertFalse([q['sql'] for q in ctx.captured_queries if 'FROM "lotto_ticket"' in q['sql']])
+        self.assertFalse([q['sql'] for q in ctx.captured_queries if '"lotto_ticketnumber"' in q['sql']])
+
+
+class TicketNumberTest(LottoTestCase):
+    """번호 정규화 테이블(TicketNumber) 테스트"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.t1 = Ticket.objects.create(user=self.user, numbers="1,2,3,4,5,6")
+        self.t2 = Ticket.objects.create(user=self.user, numbers="1,11,21,31,41,45")
+        self.t3, = issue_tickets(self.user, [[7, 11, 12, 13, 14, 15]], [False])
+
+    def test_rows_maintained(self):
+        """구매·저장 시 번호별 행이 함께 저장됨"""
+        for ticket in (self.t1, self.t2, self.t3):
+            self.assertEqual(
+                sorted(ticket.number_rows.values_list('number', flat=True)), ticket.get_numbers_list()
+            )
+        self.t1.numbers = "2,3,4,5,6,7"
+        self.t1.save()
+        self.assertEqual(sorted(self.t1.number_rows.values_list('number', flat=True)), [2, 3, 4, 5, 6, 7])
+
+    def test_number_frequency(self):
+        """번호별 선택 횟수"""
+        frequency = number_frequency()
+        self.assertEqual(len(frequency), 45)
+        self.assertEqual(frequency[1], 2)
+        self.assertEqual(frequency[11], 2)
+        self.assertEqual(frequency[44], 0)
+        self.assertEqual(number_frequency(Ticket.objects.filter(id=self.t3.id))[1], 0)
+
+    def test_exact_number_search(self):
+        """번호 검색은 부분 문자열이 아닌 정확한 번호로 일치 (1 검색 시 11, 21은 제외)"""
+        tickets = Ticket.objects.all()
+        self.assertEqual(set(filter_tickets_by_numbers(tickets, [1])), {self.t1, self.t2})
+        self.assertEqual(set(filter_tickets_by_numbers(tickets, [11])), {self.t2, self.t3})
+        self.assertEqual(set(filter_tickets_by_numbers(tickets, [1, 45])), {self.t2})
+        self.assertEqual(parse_number_query("1, 5 12"), [1, 5, 12])
+        self.assertIsNone(parse_number_query("testuser"))
+        self.assertIsNone(parse_number_query("46"))
+
+    def test_admin_search(self):
+        """TicketAdmin 번호 검색"""
+        User.objects.create_superuser(username='admin', password='adminpass123')
+        self.client.login(username='admin', password='adminpass123')
+        response = self.client.get('/admin/lotto/ticket/', {'q': '45'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.t2])
+        response = self.client.get('/admin/lotto/ticket/', {'q': 'testuser'})
+        self.assertEqual(response.context['cl'].result_count, 3)
+
+    @unittest.skipUnless(connection.vendor == 'sqlite', "SQLite 실행 계획 형식 기준")
+    def test_number_search_uses_index(self):
+        """번호 검색은 (번호, 티켓) 인덱스 사용"""
+        sql, params = TicketNumber.objects.filter(number=7).values('ticket_id').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        self.assertIn('lotto_ticketnumber_number_idx', plan)
+
+
+class ExposureTest(LottoTestCase):
+    """번호·조합 노출 집계 테스트"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        rng = random.Random(17)
+        draw = [1, 2, 3, 4, 5, 6]
+        picks = [sorted(rng.sample(range(1, 46), 6)) for _ in range(300)]
+        # 후보 번호와 5~6개 일치하는 티켓 (보너스 7 포함)
+        picks += [draw, draw, [1, 2, 3, 4, 5, 7], [1, 2, 3, 4, 6, 7], [2, 3, 4, 5, 6, 40], [1, 2, 3, 4, 5, 45]]
+        # 집계는 구매 커밋 뒤에 갱신되므로 커밋 콜백을 실행한다
+        with self.captureOnCommitCallbacks(execute=True):
+            for offset in range(0, len(picks), 10):
+                issue_tickets(self.user, picks[offset:offset + 10], [False] * len(picks[offset:offset + 10]))
+        self.picks = picks
+
+    def test_incremental_matches_rebuild(self):
+        """구매 시 증분 갱신한 결과와 전체 재계산 결과가 같음"""
+        def snapshot():
+            return (
+                sorted(NumberExposure.objects.values_list('first', 'second', 'ticket_count')),
+                sorted(ComboExposure.objects.values_list('mask', 'ticket_count')),
+            )
+        incremental = snapshot()
+        rebuild_exposure()
+        self.assertEqual(snapshot(), incremental)
+        self.assertEqual(NumberExposure.objects.get(first=1, second=1).ticket_count,
+                         sum(1 in p for p in self.picks))
+        self.assertEqual(NumberExposure.objects.get(first=1, second=2).ticket_count,
+                         sum(1 in p and 2 in p for p in self.picks))
+
+    def test_projected_winners_without_ticket_scan(self):
+        """예상 1~3등 수는 실제 정산 결과와 같고 티켓 테이블을 읽지 않음"""
+        expected = {1: 0, 2: 0, 3: 0}
+        for nums in self.picks:
+            grade = calculate_winning_grade(nums, [1, 2, 3, 4, 5, 6], 7)
+            if grade in expected:
+                expected[grade] += 1
+
+        with CaptureQueriesContext(connection) as ctx:
+            projection = projected_winners([1, 2, 3, 4, 5, 6], 7)
+        self.assertEqual(projection, expected)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn('"lotto_ticket"', ctx.captured_queries[0]['sql'])
+
+    def test_rollups_applied_after_commit(self):
+        """공유 집계 행은 구매 트랜잭션이 아니라 커밋 뒤에 갱신하고, 그 사이 추첨된 회차의 노출은 반영하지 않음"""
+        total = SalesTotal.objects.get(is_auto=False).ticket_count
+        with self.captureOnCommitCallbacks() as callbacks:
+            with CaptureQueriesContext(connection) as ctx:
+                issue_tickets(self.user, [[1, 2, 3, 4, 5, 6]], [False])
+        shared = ('"lotto_numberexposure"', '"lotto_numberrollup"', '"lotto_salestotal"')
+        self.assertFalse([q['sql'] for q in ctx.captured_queries if any(table in q['sql'] for table in shared)])
+        self.assertEqual(len(callbacks), 1)
+
+        draw_round([1, 2, 3, 4, 5, 6], 7)
+        callbacks[0]()
+        self.assertEqual(SalesTotal.objects.get(is_auto=False).ticket_count, total + 1)
+        self.assertFalse(NumberExposure.objects.exists())
+        self.assertFalse(ComboExposure.objects.exists())
+
+    def test_admin_exposure_page(self):
+        """번호 노출 화면"""
+        User.objects.create_superuser(username='admin', password='adminpass123')
+        self.client.login(username='admin', password='adminpass123')
+        response = self.client.get(reverse('admin_exposure'), {'numbers': '1,2,3,4,5,6', 'bonus': '7'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['projection'][1], 2)
+        self.assertEqual(len(response.context['numbers']), 45)
+
+        response = self.client.get(reverse('admin_exposure'), {'numbers': '1,2,3,4,5,6', 'bonus': '6'})
+        self.assertTrue(response.context['errors'])
+
+
+class ExportTest(LottoTestCase):
+    """추첨별 티켓·당첨자 내보내기 테스트"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        User.objects.create_superuser(username='admin', password='adminpass123')
+        for nums in ("1,2,3,4,5,6", "1,2,3,4,5,7", "1,2,3,10,11,12", "40,41,42,43,44,45"):
+            Ticket.objects.create(user=self.user, numbers=nums)
+        self.draw = Draw.objects.create(numbers="1,2,3,4,5,6", bonus_number=7)
+        settle_draw(self.draw)
+        self.client.login(username='admin', password='adminpass123')
+
+    def read_csv(self, response):
+        import csv
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content).decode()
+        return list(csv.DictReader(StringIO(content)))
+
+    def test_winners_csv(self):
+        """당첨자 CSV는 상위 등급부터 모든 당첨 티켓"""
+        response = self.client.get(reverse('admin_export', args=[self.draw.id]), {'kind': 'winners'})
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = self.read_csv(response)
+        self.assertEqual([int(row['winning_grade']) for row in rows], [1, 2, 5])
+        self.assertEqual(rows[0]['numbers'], "1,2,3,4,5,6")
+        self.assertEqual(rows[0]['username'], 'testuser')
+
+    def test_tickets_csv(self):
+        """전체 티켓 CSV"""
+        rows = self.read_csv(self.client.get(reverse('admin_export', args=[self.draw.id])))
+        self.assertEqual(len(rows), 4)
+
+    def test_invalid_request(self):
+        """잘못된 형식은 400, 없는 추첨은 404"""
+        url = reverse('admin_export', args=[self.draw.id])
+        self.assertEqual(self.client.get(url, {'format': 'xlsx'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('admin_export', args=[self.draw.id + 1])).status_code, 404)
+
+    @unittest.skipUnless(export_pa, "pyarrow가 설치되어 있지 않음")
+    def test_parquet(self):
+        """Parquet 내보내기"""
+        import io
+        import pyarrow.parquet as pq
+
+        response = self.client.get(
+            reverse('admin_export', args=[self.draw.id]), {'kind': 'winners', 'format': 'parquet'}
+        )
+        table = pq.read_table(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(table.column('winning_grade').to_pylist(), [1, 2, 5])
+
+    def test_command(self):
+        """export_tickets 명령"""
+        import os
+        import tempfile
+
+        out = StringIO()
+        call_command('export_tickets', self.draw.id, kind='winners', stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 4)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'tickets.csv')
+            call_command('export_tickets', self.draw.id, output=path, stderr=StringIO())
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(len(f.read().splitlines()), 5)
+
+
+class SeedTicketsTest(LottoTestCase):
+    """합성 데이터 생성 명령 테스트"""
+
+    def _seed(self, **options):
+        options = {'users': 5, 'tickets': 500, 'seed': 1, 'days': 10, 'batch_size': 200, **options}
+        call_command('seed_tickets', stdout=StringIO(), **options)
+
+    def test_seed_tickets(self):
+        """티켓·번호 행·집계가 함께 만들어지고 구매 시각이 최근 days일에 흩어짐"""
+        self._seed(auto_ratio=0.8)
+
+        self.assertEqual(User.objects.filter(username__startswith='seed_user_').count(), 5)
+        self.assertEqual(Ticket.objects.count(), 500)
+        self.assertEqual(TicketNumber.objects.count(), 3000)
+        self.assertTrue(350 <= Ticket.objects.filter(is_auto=True).count() <= 450)
+        self.assertEqual(sum(SalesRollup.objects.values_list('ticket_count', flat=True)), 500)
+        self.assertEqual(sum(ComboExposure.objects.values_list('ticket_count', flat=True)), 500)
+
+        created = sorted(Ticket.objects.values_list('created_at', flat=True))
+        self.assertGreater(created[-1] - created[0], timedelta(days=5))
+        self.assertLess(timezone.now() - created[0], timedelta(days=10, minutes=1))
+        for ticket in Ticket.objects.all()[:50]:
+            self.assertEqual(ticket.numbers_mask, numbers_to_mask(ticket.get_numbers_list()))
+            self.assertEqual(sorted(ticket.number_rows.values_list('number', flat=True)),
+                             ticket.get_numbers_list())
+
+    def test_same_seed_same_numbers(self):
+        """같은 시드면 같은 번호, 다른 시드면 다른 번호"""
+        def numbers():
+            return list(Ticket.objects.order_by('id').values_list('numbers', 'is_auto'))
+
+        self._seed(no_rebuild=True)
+        first = numbers()
+        Ticket.objects.all().delete()
+        self._seed(no_rebuild=True)
+        self.assertEqual(numbers(), first)
+        Ticket.objects.all().delete()
+        self._seed(no_rebuild=True, seed=2)
+        self.assertNotEqual(numbers(), first)
+
+
+class BenchSuiteTest(LottoTestCase):
+    """성능 측정 모음 테스트"""
+
+    def test_suite_writes_json(self):
+        """모든 측정 항목이 크기별로 JSON에 기록됨"""
+        import os
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bench.json')
+            call_command('bench_suite', sizes='200,400', users=3, repeat=2, grade_samples=1000,
+                         in_place=True, output=path, stderr=StringIO())
+            with open(path, encoding='utf-8') as f:
+                results = json.load(f)
+
+        names = {(r['name'], r['size']) for r in results['records']}
+        for size in (200, 400):
+            for name in ('settle.chunked', 'settle.sql', 'view.my_tickets', 'view.admin_winners',
+                         'purchase.buy_ticket'):
+                self.assertIn((name, size), names)
+        self.assertIn(('grade.calculate_winning_grade', 1000), names)
+        self.assertEqual(results['regressions'], [])
+        self.assertTrue(all(r.get('status', 200) in (200, 302) for r in results['records']))
+
+    def test_compare_results(self):
+        """시간은 허용 비율·잡음 기준을 넘을 때, 쿼리 수는 늘기만 해도 회귀"""
+        def results(**records):
+            return {"records": [{"name": name, "size": 100, **values} for name, values in records.items()]}
+
+        baseline = results(a={"p50_ms": 10.0, "queries": 3}, b={"seconds": 1.0}, c={"p50_ms": 1.0})
+        current = results(a={"p50_ms": 12.0, "queries": 3}, b={"seconds": 1.1}, c={"p50_ms": 2.0})
+        self.assertEqual(compare_results(current, baseline, threshold=0.25), [])
+
+        current = results(a={"p50_ms": 10.0, "queries": 4}, b={"seconds": 1.5}, c={"p50_ms": 1.0})
+        regressions = compare_results(current, baseline, threshold=0.25)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(any("쿼리 수 3 → 4" in message for message in regressions))
+
+    def test_query_growth(self):
+        """데이터 크기에 따라 쿼리 수가 늘어나는 화면을 찾음"""
+        records = [
+            {"name": "view.ok", "size": 100, "queries": 3},
+            {"name": "view.ok", "size": 1000, "queries": 4},
+            {"name": "view.n_plus_one", "size": 100, "queries": 3},
+            {"name": "view.n_plus_one", "size": 1000, "queries": 53},
+            {"name": "settle.chunked", "size": 1000, "queries": 200},
+        ]
+        self.assertEqual(len(query_growth(records)), 1)
+        self.assertIn("view.n_plus_one", query_growth(records)[0])
+
+
+@override_settings(LOTTO_MY_TICKETS_PAGE_SIZE=3)
+class MyTicketsPaginationTest(LottoTestCase):
+    """내 티켓 목록 커서 페이지네이션 테스트"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.other = User.objects.create_user(username='other', password='testpass123')
+        self.tickets = [Ticket.objects.create(user=self.user, numbers="1,2,3,4,5,6") for _ in range(7)]
+        Ticket.objects.create(user=self.other, numbers="1,2,3,4,5,6")
+        self.client.login(username='testuser', password='testpass123')
+
+    def test_pages_cover_all_tickets_once(self):
+        """커서를 따라가면 내 티켓을 최신순으로 한 번씩 모두 조회"""
+        response = self.client.get(reverse('my_tickets'))
+        seen = [ticket.id for ticket in response.context['tickets']]
+        cursor = response.context['next_cursor']
+        while cursor:
+            data = self.client.get(reverse('my_tickets_more'), {'cursor': cursor}).json()
+            seen += [ticket['id'] for ticket in data['tickets']]
+            cursor = data['next_cursor']
+        expected = sorted((t.id for t in self.tickets), reverse=True)
+        self.assertEqual(seen, expected)
+
+    def test_page_query_count_is_constant(self):
+        """페이지 조회 쿼리 수는 티켓 수와 무관"""
+        response = self.client.get(reverse('my_tickets'))
+        cursor = response.context['next_cursor']
+        # 세션, 사용자, 티켓 페이지
+        with self.assertNumQueries(3):
+            self.client.get(reverse('my_tickets_more'), {'cursor': cursor})
+
+    def test_invalid_cursor(self):
+        """잘못된 커서는 400"""
+        for cursor in ('abc', '99999999999999999999999999-1', '1-99999999999999999999999999'):
+            for name in ('my_tickets', 'my_tickets_more'):
+                response = self.client.get(reverse(name), {'cursor': cursor})
+                self.assertEqual(response.status_code, 400, (name, cursor))
+
+
+class SalesRollupTest(LottoTestCase):
+    """판매 집계 테스트"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.admin = User.objects.create_superuser(username='admin', password='adminpass123')
+
+    def buy(self, is_auto, numbers=''):
+        # 집계는 구매 커밋 뒤에 갱신되므로 커밋 콜백을 실행한다
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('buy_ticket'), {'is_auto': is_auto, 'numbers': numbers})
+
+    def test_purchase_updates_rollup(self):
+        """구매 시 판매 집계가 증분 갱신됨"""
+        self.client.login(username='testuser', password='testpass123')
+        self.buy(True)
+        self.buy(True)
+        self.buy(False, '1,2,3,4,5,6')
+        rollups = {r.is_auto: r.ticket_count for r in SalesRollup.objects.filter(user=self.user)}
+        self.assertEqual(rollups, {True: 2, False: 1})
+
+    def test_rebuild_matches_incremental(self):
+        """다시 계산한 집계가 증분 집계와 동일"""
+        self.client.login(username='testuser', password='testpass123')
+        self.buy(True)
+        self.buy(False, '1,2,3,4,5,6')
+        incremental = set(SalesRollup.objects.values_list('date', 'user_id', 'is_auto', 'ticket_count'))
+
+        out = StringIO()
+        call_command('rebuild_sales_rollup', stdout=out)
+
+        self.assertIn('2행', out.getvalue())
+        self.assertEqual(set(SalesRollup.objects.values_list('date', 'user_id', 'is_auto', 'ticket_count')), incremental)
+
+    def test_totals_maintained(self):
+        """사용자별·구매 방식별 전체 집계가 증분 갱신되고 다시 계산해도 같음"""
+        other = User.objects.create_user(username='other', password='testpass123')
+        with self.captureOnCommitCallbacks(execute=True):
+            issue_tickets(other, [[1, 2, 3, 4, 5, 6]], [False])
+        self.client.login(username='testuser', password='testpass123')
+        self.buy(True)
+        self.buy(True)
+        self.buy(False, '1,2,3,4,5,6')
+        expected = (
+            {self.user.id: 3, other.id: 1},
+            {True: 2, False: 2},
+        )
+        for _ in range(2):
+            self.assertEqual(
+                (dict(UserSalesRollup.objects.values_list('user_id', 'ticket_count')),
+                 dict(SalesTotal.objects.values_list('is_auto', 'ticket_count'))),
+                expected,
+            )
+            rebuild_sales_rollup()
+
+    def test_admin_sales_reads_recent_rollup_rows_only(self):
+        """판매 실적의 합계·상위 사용자는 전체 집계에서, 일별 판매량만 최근 기간 판매 집계에서 읽음"""
+        self.client.login(username='admin', password='adminpass123')
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse('admin_sales'))
+        rollup_queries = [q['sql'] for q in ctx.captured_queries if 'FROM "lotto_salesrollup"' in q['sql']]
+        self.assertEqual(len(rollup_queries), 1)
+        self.assertIn('"lotto_salesrollup"."date" >', rollup_queries[0])
+
+    def test_admin_sales_reads_rollup(self):
+        """판매 실적 화면은 판매 집계를 사용"""
+        self.client.login(username='testuser', password='testpass123')
+        self.buy(True)
+        self.buy(False, '1,2,3,4,5,6')
+        self.client.login(username='admin', password='adminpass123')
+        response = self.client.get(reverse('admin_sales'))
+        self.assertEqual(response.context['total_tickets'], 2)
+        self.assertEqual(response.context['auto_tickets'], 1)
+        self.assertEqual(list(response.context['user_stats']), [{'user__username': 'testuser', 'ticket_count': 2}])
+        self.assertEqual([row['count'] for row in response.context['daily_stats']], [2])
+
+    def test_number_rollup(self):
+        """구매 시 번호별 집계가 증분 갱신되고 다시 계산해도 같음"""
+        self.client.login(username='testuser', password='testpass123')
+        self.buy(False, '1,2,3,4,5,6')
+        self.buy(False, '1,2,3,4,5,7')
+        self.buy(True)
+        expected = Counter(n for ticket in Ticket.objects.all() for n in ticket.get_numbers_list())
+        self.assertEqual(dict(NumberRollup.objects.values_list('number', 'ticket_count')), dict(expected))
+
+        call_command('rebuild_sales_rollup', stdout=StringIO())
+        self.assertEqual(dict(NumberRollup.objects.values_list('number', 'ticket_count')), dict(expected))
+
+        self.client.login(username='admin', password='adminpass123')
+        response = self.client.get(reverse('admin_sales'))
+        top = sorted(expected.items(), key=lambda item: (-item[1], item[0]))[:10]
+        self.assertEqual(response.context['number_stats'], top)
+
+
+class CurrentDrawCacheTest(LottoTestCase):
+    """현재 활성 추첨 캐시 테스트"""
+
+    def setUp(self):
+        self.draw = Draw.objects.create(numbers="1,2,3,4,5,6", bonus_number=7, is_active=True)
+
+    def test_snapshot_is_cached(self):
+        """두 번째 조회부터는 쿼리 없음"""
+        snapshot = get_current_draw()
+        self.assertEqual(snapshot.id, self.draw.id)
+        self.assertEqual(snapshot.numbers_tuple, (1, 2, 3, 4, 5, 6))
+        self.assertEqual(snapshot.bonus_number, 7)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_current_draw(), snapshot)
+
+    def test_invalidated_on_save(self):
+        """추첨이 저장되면 캐시가 무효화됨 (관리자 페이지 수정 포함)"""
+        get_current_draw()
+        self.draw.numbers = "10,11,12,13,14,15"
+        self.draw.save()
+        self.assertEqual(get_current_draw().numbers_tuple, (10, 11, 12, 13, 14, 15))
+
+        self.draw.delete()
+        self.assertIsNone(get_current_draw())
+
+    def test_new_draw_replaces_cached(self):
+        """새 추첨 진행 후 새 추첨이 조회됨"""
+        get_current_draw()
+        Draw.objects.filter(is_active=True).update(is_active=False)
+        new_draw = Draw.objects.create(numbers="7,8,9,10,11,12", bonus_number=1, is_active=True)
+        self.assertEqual(get_current_draw().id, new_draw.id)
+
+    def test_shared_cache_serves_other_processes(self):
+        """공유 캐시에 넣은 스냅샷은 다른 프로세스(프로세스 메모리 캐시 없음)도 DB 조회 없이 읽음"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        with self.settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directory.name,
+        }}):
+            snapshot = publish_current_draw()
+            draws._local_snapshot = (0.0, None)
+            with self.assertNumQueries(0):
+                self.assertEqual(get_current_draw(), snapshot)
+
+
+class DrawPublishTest(LottoTestCase):
+    """추첨 스냅샷을 이용한 당첨 확인 테스트 (DB 쓰기·조회 없음)"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.draw = Draw.objects.create(numbers="1,2,3,4,5,6", bonus_number=7, is_active=True)
+        self.client = Client()
+
+    def test_grade_of_matches_reference(self):
+        """스냅샷 등급 계산은 calculate_winning_grade와 같음"""
+        snapshot = get_current_draw()
+        rng = random.Random(14)
+        picks = [sorted(rng.sample(range(1, 46), 6)) for _ in range(500)]
+        picks += [[1, 2, 3, 4, 5, 6], [1, 2, 3, 4, 5, 7], [1, 2, 3, 4, 5, 8]]
+        for nums in picks:
+            self.assertEqual(
+                snapshot.grade_of(numbers_to_mask(nums)),
+                calculate_winning_grade(nums, [1, 2, 3, 4, 5, 6], 7),
+            )
+
+    def test_published_on_commit(self):
+        """추첨 커밋 직후 스냅샷이 미리 만들어져 첫 조회부터 쿼리 없음"""
+        with self.assertNumQueries(0):
+            self.assertEqual(get_current_draw().id, self.draw.id)
+
+    def test_buy_ticket_done_does_not_write(self):
+        """구매 완료 화면은 당첨 등급을 보여주기만 하고 저장하지 않음"""
+        ticket = Ticket.objects.create(user=self.user, numbers="1,2,3,4,5,7")
+        draw_round([1, 2, 3, 4, 5, 6], 7)
+        self.client.login(username='testuser', password='testpass123')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('buy_ticket_done', args=[ticket.id]))
+        self.assertEqual(response.context['winning_grade'], 2)
+        self.assertContains(response, '2등 당첨!')
+        self.assertFalse([q for q in queries if q['sql'].startswith(('UPDATE "lotto_ticket"', 'INSERT'))])
+
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.winning_grade, 0)
+        self.assertIsNone(ticket.draw_id)
+
+    def test_check_numbers_without_database(self):
+        """번호 확인 API는 DB를 조회하지 않음"""
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse('api_check_numbers'), {'numbers': ['6,5,4,3,2,1', '1,2,3,4,5,7', '40,41,42,43,44,45']}
+            )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['draw']['id'], self.draw.id)
+        self.assertEqual([r['grade'] for r in data['results']], [1, 2, 0])
+        self.assertEqual(data['results'][1]['matched'], [1, 2, 3, 4, 5])
+        self.assertTrue(data['results'][1]['bonus_matched'])
+
+    def test_check_numbers_invalid(self):
+        """잘못된 번호는 400"""
+        response = self.client.get(reverse('api_check_numbers'), {'numbers': '1,2,3,4,5,46'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse('api_check_numbers'), {'numbers': '99999999999999999999999,1,2,3,4,5'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse('api_check_numbers'))
+        self.assertEqual(response.status_code, 400)
+
+
+class AutoPickTest(LottoTestCase):
+    """자동 번호 일괄 생성 테스트"""
+
+    def assertValidPicks(self, picks):
+        self.assertEqual(picks.shape[1], 6)
+        self.assertTrue(((picks >= 1) & (picks <= 45)).all())
+        # 정렬되어 있고 중복 번호 없음
+        self.assertTrue((np.diff(picks, axis=1) > 0).all())
+
+    def test_picks_are_valid(self):
+        """seeded·secure 난수원 모두 1~45 중복 없는 6개"""
+        for rng in (make_rng(1), make_rng(secure=True)):
+            picks = generate_picks(5000, rng)
+            self.assertEqual(len(picks), 5000)
+            self.assertValidPicks(picks)
+
+    def test_seeded_is_reproducible(self):
+        """같은 시드면 같은 번호"""
+        self.assertTrue((generate_picks(100, make_rng(7)) == generate_picks(100, make_rng(7))).all())
+
+    def test_unique(self):
+        """unique면 조합이 겹치지 않음"""
+        picks = generate_picks(20000, make_rng(3), unique=True)
+        self.assertValidPicks(picks)
+        self.assertEqual(len(np.unique(picks_to_masks(picks))), 20000)
+        with self.assertRaises(ValueError):
+            generate_picks(COMBINATIONS + 1, unique=True)
+
+    def test_masks_match_storage_format(self):
+        """비트마스크는 Ticket.numbers_mask와 같은 형식"""
+        picks = generate_picks(100, make_rng(5))
+        self.assertEqual(picks_to_masks(picks).tolist(), [numbers_to_mask(p) for p in picks.tolist()])
+
+    def test_roughly_uniform(self):
+        """번호별 출현 빈도가 고름"""
+        counts = np.bincount(generate_picks(90000, make_rng(11)).ravel(), minlength=46)[1:]
+        # 번호당 기대값 12000, 표준편차 약 106
+        self.assertLess(np.abs(counts - 12000).max(), 600)
+
+
+class BatchPurchaseTest(LottoTestCase):
+    """일괄 구매 테스트"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+
+    def post(self, payload):
+        return self.client.post(reverse('buy_ticket_batch'), json.dumps(payload), content_type='application/json')
+
+    def test_mixed_slip(self):
+        """수동·자동 게임을 한 번에 구매"""
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post({
+                "games": [{"numbers": [6, 5, 4, 3, 2, 1]}, {"numbers": "7,8,9,10,11,12"}, {"auto": True}],
+                "auto_count": 2,
+            })
+        self.assertEqual(response.status_code, 201)
+        tickets = response.json()['tickets']
+        self.assertEqual(len(tickets), 5)
+        self.assertEqual(tickets[0]['numbers'], '1,2,3,4,5,6')
+        self.assertEqual([t['is_auto'] for t in tickets], [False, False, True, True, True])
+
+        saved = Ticket.objects.get(id=tickets[1]['id'])
+        self.assertEqual(saved.numbers_mask, numbers_to_mask([7, 8, 9, 10, 11, 12]))
+        self.assertEqual(SalesRollup.objects.get(user=self.user, is_auto=True).ticket_count, 3)
+
+    def test_slip_uses_single_insert(self):
+        """게임 수와 무관하게 INSERT 한 번"""
+        with CaptureQueriesContext(connection) as ctx:
+            self.post({"auto_count": 10})
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT INTO "lotto_ticket"')]
+        self.assertEqual(len(inserts), 1)
+
+    def test_invalid_game_rejects_whole_slip(self):
+        """잘못된 게임이 있으면 아무것도 구매되지 않음"""
+        response = self.post({"games": [[1, 2, 3, 4, 5, 6], [1, 1, 2, 3, 4, 5], [0, 1, 2, 3, 4, 5]]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.json()['errors']), 2)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_oversized_number_rejected(self):
+        """int64를 넘는 번호도 검증 오류(400)로 처리"""
+        response = self.post({"games": [[10 ** 30, 1, 2, 3, 4, 5], [1, 1, 2, 3, 4, 5]]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'], [
+            "1번째 게임: 로또 번호는 1~45 사이여야 합니다.",
+            "2번째 게임: 번호는 중복 없이 6개를 입력해야 합니다.",
+        ])
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_game_limit(self):
+        """최대 게임 수 초과"""
+        with self.settings(LOTTO_MAX_GAMES_PER_SLIP=3):
+            response = self.post({"auto_count": 4})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Ticket.objects.exists())
+
+
+class JsonApiTest(LottoTestCase):
+    """JSON API 테스트"""
+
+    def setUp(self):
+        self.client = Client(enforce_csrf_checks=True)
+        self.user = User.objects.create_user(username='terminal', password='testpass123')
+        _, self.key = ApiToken.issue(self.user, name='단말기 1')
+        self.auth = {'HTTP_AUTHORIZATION': f'Token {self.key}'}
+
+    def test_requires_token(self):
+        """토큰이 없거나 틀리면 401"""
+        self.assertEqual(self.client.get(reverse('api_tickets')).status_code, 401)
+        response = self.client.get(reverse('api_tickets'), HTTP_AUTHORIZATION='Token wrong')
+        self.assertEqual(response.status_code, 401)
+
+    def test_buy_and_list(self):
+        """토큰으로 구매(CSRF 없이) 후 목록 조회"""
+        response = self.client.post(
+            reverse('api_tickets'),
+            json.dumps({"games": [[1, 2, 3, 4, 5, 6]], "auto_count": 2}),
+            content_type='application/json',
+            **self.auth,
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()['tickets']), 3)
+
+        response = self.client.get(reverse('api_tickets'), **self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['tickets']), 3)
+        self.assertEqual(set(response.json()['tickets'][0]), {'id', 'numbers', 'is_auto', 'created_at', 'winning_grade', 'draw_id'})
+
+    def test_conditional_get(self):
+        """ETag가 같으면 304"""
+        response = self.client.get(reverse('api_tickets'), **self.auth)
+        etag = response['ETag']
+        response = self.client.get(reverse('api_tickets'), HTTP_IF_NONE_MATCH=etag, **self.auth)
+        self.assertEqual(response.status_code, 304)
+
+        Ticket.objects.create(user=self.user, numbers="1,2,3,4,5,6")
+        response = self.client.get(reverse('api_tickets'), HTTP_IF_NONE_MATCH=etag, **self.auth)
+        self.assertEqual(response.status_code, 200)
+
+    def test_ticket_check_does_not_write(self):
+        """티켓 확인은 티켓 회차의 추첨 기준 등급을 계산하되 저장하지 않음"""
+        ticket = Ticket.objects.create(user=self.user, numbers="1,2,3,4,5,7")
+        draw, _ = draw_round([1, 2, 3, 4, 5, 6], 7)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('api_ticket_detail', args=[ticket.id]), **self.auth)
+        self.assertEqual(response.json()['ticket']['grade'], 2)
+        self.assertEqual(response.json()['ticket']['draw']['id'], draw.id)
+        self.assertFalse([q for q in ctx.captured_queries if not q['sql'].startswith('SELECT')])
+
+        other = User.objects.create_user(username='other', password='testpass123')
+        other_ticket = Ticket.objects.create(user=other, numbers="1,2,3,4,5,6")
+        response = self.client.get(reverse('api_ticket_detail', args=[other_ticket.id]), **self.auth)
+        self.assertEqual(response.status_code, 404)
+
+    def test_current_draw(self):
+        """현재 추첨 조회 (캐시 적중 시 쿼리 없음)"""
+        Draw.objects.create(numbers="1,2,3,4,5,6", bonus_number=7, is_active=True)
+        get_current_draw()
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('api_current_draw'))
+        self.assertEqual(response.json()['draw']['numbers'], [1, 2, 3, 4, 5, 6])
+
+
+class AsyncViewTest(LottoTestCase):
+    """비동기 뷰(LOTTO_ASYNC_VIEWS = True) 테스트"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self._use_async_views(True)
+        self.addCleanup(self._use_async_views, False)
+
+    def _use_async_views(self, enabled):
+        from importlib import reload
+        from django.urls import clear_url_caches
+        from lotto_site import urls as root_urls
+        from . import urls
+
+        with self.settings(LOTTO_ASYNC_VIEWS=enabled):
+            reload(urls)
+            reload(root_urls)
+        clear_url_caches()
+
+    async def test_urls_use_async_views(self):
+        """설정을 켜면 구매·조회 화면이 비동기 뷰로 연결"""
+        from django.urls import resolve
+        from . import async_views
+
+        self.assertIs(resolve(reverse('my_tickets')).func, async_views.my_tickets)
+
+    async def test_buy_and_check_ticket(self):
+        """비동기 뷰로 구매 후 당첨 확인"""
+        await self.async_client.aforce_login(self.user)
+
+        # 구매(sync_to_async)는 테스트 스레드의 DB 연결에서 실행되므로 커밋 콜백도 그 스레드에서 잡는다
+        capture = self.captureOnCommitCallbacks(execute=True)
+        await sync_to_async(capture.__enter__)()
+        response = await self.async_client.post(
+            reverse('buy_ticket'), {'is_auto': False, 'numbers': '1,2,3,4,5,7'}
+        )
+        await sync_to_async(capture.__exit__)(None, None, None)
+        ticket = await Ticket.objects.aget(user=self.user)
+        self.assertRedirects(
+            response, reverse('buy_ticket_done', args=[ticket.id]), fetch_redirect_response=False
+        )
+        self.assertEqual(await SalesRollup.objects.filter(user=self.user).acount(), 1)
+
+        response = await self.async_client.get(reverse('buy_ticket_done', args=[ticket.id]))
+        self.assertIsNone(response.context['winning_grade'])
+
+        await sync_to_async(draw_round)([1, 2, 3, 4, 5, 6], 7)
+        response = await self.async_client.get(reverse('buy_ticket_done', args=[ticket.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['winning_grade'], 2)
+
+    async def test_my_tickets_pages(self):
+        """비동기 뷰의 커서 페이지네이션 결과는 동기 뷰와 같음"""
+        tickets = [await Ticket.objects.acreate(user=self.user, numbers="1,2,3,4,5,6") for _ in range(3)]
+        await self.async_client.aforce_login(self.user)
+
+        with self.settings(LOTTO_MY_TICKETS_PAGE_SIZE=2):
+            response = await self.async_client.get(reverse('my_tickets'))
+            seen = [ticket.id for ticket in response.context['tickets']]
+            data = (await self.async_client.get(
+                reverse('my_tickets_more'), {'cursor': response.context['next_cursor']}
+            )).json()
+        seen += [ticket['id'] for ticket in data['tickets']]
+
+        self.assertEqual(seen, sorted((t.id for t in tickets), reverse=True))
+        self.assertIsNone(data['next_cursor'])
+
+    async def test_other_users_ticket_is_404(self):
+        """다른 사용자의 티켓은 조회할 수 없음"""
+        other = await User.objects.acreate(username='other')
+        ticket = await Ticket.objects.acreate(user=other, numbers="1,2,3,4,5,6")
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(reverse('buy_ticket_done', args=[ticket.id]))
+        self.assertEqual(response.status_code, 404)
+
+
+class ServerTimingTest(LottoTestCase):
+    """요청별 계측 미들웨어 테스트"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+
+    def test_server_timing_header_and_log(self):
+        """응답에 DB·템플릿·전체 시간 헤더를 붙이고 JSON 로그를 남김"""
+        Ticket.objects.create(user=self.user, numbers="1,2,3,4,5,6")
+        with self.assertLogs('lotto.timing', 'INFO') as logs:
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(reverse('my_tickets'))
+
+        header = response['Server-Timing']
+        self.assertIn(f'desc="{len(ctx.captured_queries)} queries"', header)
+        self.assertIn('tpl;dur=', header)
+        self.assertIn('total;dur=', header)
+        record = json.loads(logs.records[-1].getMessage().split(' ', 2)[2])
+        self.assertEqual(record['view'], 'my_tickets')
+        self.assertEqual(record['queries'], len(ctx.captured_queries))
+        self.assertGreater(record['template_ms'], 0)
+
+    @override_settings(LOTTO_SERVER_TIMING=False)
+    def test_header_can_be_disabled(self):
+        with self.assertLogs('lotto.timing', 'INFO'):
+            response = self.client.get(reverse('my_tickets'))
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(LOTTO_TIMING_REPEATED_QUERY_THRESHOLD=2)
+    def test_repeated_queries_warn(self):
+        """같은 쿼리가 기준 횟수 이상 실행되면 N+1 의심 경고"""
+        self.user.is_superuser = self.user.is_staff = True
+        self.user.save()
+        for nums in ("1,2,3,4,5,6", "1,2,3,4,5,7", "1,2,3,10,11,12"):
+            Ticket.objects.create(user=self.user, numbers=nums)
+        settle_draw(Draw.objects.create(numbers="1,2,3,4,5,6", bonus_number=7))
+
+        with self.assertLogs('lotto.timing', 'WARNING') as logs:
+            self.client.get(reverse('admin_winners'))
+        self.assertTrue(any('N+1' in message and 'admin_winners' in message for message in logs.output))
+
+    async def test_async_requests_are_timed(self):
+        """ASGI 요청도 스레드에서 실행된 쿼리까지 계측"""
+        await self.async_client.aforce_login(self.user)
+        with self.assertLogs('lotto.timing', 'INFO') as logs:
+            response = await self.async_client.get(reverse('my_tickets'))
+        self.assertIn('Server-Timing', response)
+        record = json.loads(logs.records[-1].getMessage().split(' ', 2)[2])
+        self.assertEqual(record['view'], 'my_tickets')
+        self.assertGreater(record['queries'], 0)
+
+
+class ProfilingTest(LottoTestCase):
+    """관리자 요청 프로파일링 테스트"""
+
+    def setUp(self):
+        self.client = Client()
+        self.admin = User.objects.create_superuser(username='admin', password='adminpass123')
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(LOTTO_PROFILE_DIR=directory.name, LOTTO_PROFILE_KEEP=2)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_superuser_opt_in_stores_profile(self):
+        """superuser가 요청하면 뷰 프로파일과 SQL별 시간을 저장"""
+        self.client.login(username='admin', password='adminpass123')
+        response = self.client.get(reverse('admin_sales'), {'_profile': '1'})
+        profile = load_profile(response['X-Lotto-Profile-Id'])
+        self.assertEqual(profile['view'], 'admin_sales')
+        self.assertEqual(profile['status'], 200)
+        self.assertEqual(profile['query_count'], sum(query['count'] for query in profile['queries']))
+        self.assertGreater(profile['query_count'], 0)
+        self.assertTrue(any(function['function'] == 'admin_sales' for function in profile['functions']))
+
+        response = self.client.get(reverse('admin_sales'), HTTP_X_LOTTO_PROFILE='1')
+        self.assertIn('X-Lotto-Profile-Id', response)
+
+    def test_not_profiled_without_opt_in_or_superuser(self):
+        self.client.login(username='admin', password='adminpass123')
+        self.assertNotIn('X-Lotto-Profile-Id', self.client.get(reverse('admin_sales')))
+        self.client.login(username='testuser', password='testpass123')
+        self.assertNotIn('X-Lotto-Profile-Id', self.client.get(reverse('my_tickets'), {'_profile': '1'}))
+        self.assertEqual(list_profiles(), [])
+
+    def test_unflagged_request_does_not_load_user(self):
+        """프로파일링 표시가 없는 요청은 세션·사용자를 읽지 않음"""
+        Draw.objects.create(numbers="1,2,3,4,5,6", bonus_number=7, is_active=True)
+        self.client.login(username='admin', password='adminpass123')
+        url = reverse('api_check_numbers')
+        self.client.get(url, {'numbers': '1,2,3,4,5,6'})
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url, {'numbers': '1,2,3,4,5,6'}).status_code, 200)
+
+    def test_ring_buffer_keeps_recent_profiles(self):
+        """보관 개수를 넘으면 오래된 프로파일부터 지움"""
+        self.client.login(username='admin', password='adminpass123')
+        ids = [
+            self.client.get(reverse('admin_sales'), {'_profile': '1'})['X-Lotto-Profile-Id'] for _ in range(3)
+        ]
+        self.assertEqual([profile['id'] for profile in list_profiles()], ids[:0:-1])
+        self.assertIsNone(load_profile(ids[0]))
+
+    def test_admin_profile_pages(self):
+        self.client.login(username='admin', password='adminpass123')
+        profile_id = self.client.get(reverse('admin_draw'), {'_profile': '1'})['X-Lotto-Profile-Id']
+
+        response = self.client.get(reverse('admin_profiles'))
+        self.assertEqual([profile['id'] for profile in response.context['profiles']], [profile_id])
+        response = self.client.get(reverse('admin_profile_detail', args=[profile_id]))
+        self.assertEqual(response.context['profile']['view'], 'admin_draw')
+        response = self.client.get(reverse('admin_profile_detail', args=[profile_id]), {'download': '1'})
+        self.assertTrue(b''.join(response.streaming_content))
+        self.assertEqual(self.client.get(reverse('admin_profile_detail', args=['..'])).status_code, 404)
@@ -0,0 +1,66 @@
+"""
+번호 단위 조회 (TicketNumber 정규화 테이블 사용)
+
+티켓 번호는 "1,5,12,20,33,42" 문자열과 비트마스크로 저장되어 있어 "7번을 고른 티켓"을
+찾으려면 티켓 테이블 전체를 읽어야 한다. TicketNumber는 티켓마다 번호 6행을 (번호, 티켓)
+인덱스와 함께 저장해, 번호 검색과 번호별 선택 횟수 집계를 인덱스만으로 처리한다.
+"""
+import re
+
+from django.db.models import Count
+
+from .models import TicketNumber
+
+_NUMBER_QUERY = re.compile(r'^\d{1,2}(?:[\s,]+\d{1,2})*$')
+
+
+def number_frequency(tickets=None):
+    """
+    번호별 선택 횟수
+
+    Args:
+        tickets: 집계할 티켓 queryset (기본값: 전체)
+
+    Returns:
+        dict: {번호: 티켓 수} (1~45 모두 포함)
+    """
+    rows = TicketNumber.objects.all()
+    if tickets is not None:
+        rows = rows.filter(ticket__in=tickets)
+    counts = dict(rows.order_by().values_list('number').annotate(count=Count('id')))
+    return {n: counts.get(n, 0) for n in range(1, 46)}
+
+
+def filter_tickets_by_numbers(queryset, numbers):
+    """
+    주어진 번호를 모두 포함하는 티켓만 남김
+
+    Args:
+        queryset: 티켓 queryset
+        numbers: 번호 목록 (1~6개)
+    """
+    numbers = sorted(set(numbers))
+    if len(numbers) == 1:
+        return queryset.filter(id__in=TicketNumber.objects.filter(number=numbers[0]).values('ticket_id'))
+    matching = (
+        TicketNumber.objects.filter(number__in=numbers)
+        .order_by()
+        .values('ticket_id')
+        .annotate(matched=Count('id'))
+        .filter(matched=len(numbers))
+        .values('ticket_id')
+    )
+    return queryset.filter(id__in=matching)
+
+
+def parse_number_query(term):
+    """
+    검색어가 번호 목록("7", "1,5,12", "1 5 12")이면 번호 리스트, 아니면 None
+    """
+    term = term.strip()
+    if not _NUMBER_QUERY.match(term):
+        return None
+    numbers = [int(n) for n in re.split(r'[\s,]+', term)]
+    if len(set(numbers)) > 6 or not all(1 <= n <= 45 for n in numbers):
+        return None
+    return numbers
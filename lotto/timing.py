@@ -0,0 +1,162 @@
+"""
+요청별 쿼리 수·DB 시간·템플릿 렌더링 시간·전체 시간 계측
+
+ServerTimingMiddleware가 요청마다 계측을 시작하고, 끝나면 응답에 Server-Timing 헤더를 붙이고
+구조화된 로그(로거 'lotto.timing', JSON 한 줄)를 남긴다.
+  - DB: 연결마다 건 execute_wrapper 훅(signals.py, connection_created)이 쿼리마다 실행 시간을 잰다
+  - 템플릿: TimedDjangoTemplates 백엔드(settings.TEMPLATES)가 render 시간을 잰다
+    (템플릿 안에서 실행된 쿼리는 DB 시간과 템플릿 시간에 모두 들어간다)
+  - N+1 의심: 매개변수를 뺀 같은 SQL이 settings.LOTTO_TIMING_REPEATED_QUERY_THRESHOLD번 이상
+    실행되면 경고 로그를 남긴다
+
+계측 중인 요청은 contextvar로 찾으므로, 비동기 요청에서 sync_to_async 스레드의 연결로 실행한
+쿼리도 함께 센다. 계측 중인 요청이 없으면 훅은 아무것도 하지 않는다.
+"""
+import json
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('lotto_request_timing', default=None)
+
+
+class RequestTiming:
+    """요청 하나의 계측값"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.query_count = 0
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self.statements = Counter()
+
+    @property
+    def total_ms(self):
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def add_query(self, sql, seconds):
+        self.query_count += 1
+        self.db_ms += seconds * 1000
+        self.statements[sql] += 1
+
+    def repeated_queries(self, threshold):
+        """threshold번 이상 실행된 같은 SQL 목록 [(SQL, 횟수)]"""
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+
+def current_timing():
+    """계측 중인 요청의 RequestTiming (계측 중이 아니면 None)"""
+    return _current.get()
+
+
+def _record_query(execute, sql, params, many, context):
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.add_query(sql, time.perf_counter() - started)
+
+
+def install_query_hook(connection):
+    """DB 연결에 쿼리 계측 훅을 건다 (이미 걸려 있으면 건너뜀)"""
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+class TimedTemplate(Template):
+    """렌더링 시간을 계측 중인 요청에 더하는 템플릿"""
+
+    def render(self, context=None, request=None):
+        timing = _current.get()
+        if timing is None:
+            return super().render(context, request)
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timing.template_ms += (time.perf_counter() - started) * 1000
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """렌더링 시간을 재는 Django 템플릿 백엔드 (settings.TEMPLATES의 BACKEND로 사용)"""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+class ServerTimingMiddleware:
+    """
+    요청별 계측값을 Server-Timing 헤더와 로그로 남기는 미들웨어
+
+    전체 시간에 다른 미들웨어도 포함되도록 MIDDLEWARE 맨 앞에 둔다.
+    settings.LOTTO_SERVER_TIMING이 False이면 헤더는 붙이지 않고 로그만 남긴다.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timing = RequestTiming()
+        token = _current.set(timing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timing)
+
+    async def __acall__(self, request):
+        timing = RequestTiming()
+        token = _current.set(timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timing)
+
+    def _finish(self, request, response, timing):
+        match = getattr(request, 'resolver_match', None)
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "queries": timing.query_count,
+            "db_ms": round(timing.db_ms, 2),
+            "template_ms": round(timing.template_ms, 2),
+            "total_ms": round(timing.total_ms, 2),
+        }
+        if settings.LOTTO_SERVER_TIMING:
+            response['Server-Timing'] = (
+                f'db;dur={record["db_ms"]};desc="{timing.query_count} queries", '
+                f'tpl;dur={record["template_ms"]}, '
+                f'total;dur={record["total_ms"]}'
+            )
+        logger.info("request timing %s", json.dumps(record, ensure_ascii=False), extra={"timing": record})
+
+        threshold = settings.LOTTO_TIMING_REPEATED_QUERY_THRESHOLD
+        if threshold:
+            for sql, count in timing.repeated_queries(threshold):
+                logger.warning(
+                    "N+1 의심: %s 요청에서 같은 쿼리가 %s번 실행됨: %s", record["view"] or request.path, count, sql,
+                    extra={"timing": record},
+                )
+        return response
@@ -1,5 +1,9 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, async_views, views
+
+# ASGI 서버에서는 구매·조회·당첨 확인 화면에 비동기 뷰를 사용
+pages = async_views if settings.LOTTO_ASYNC_VIEWS else views
 
 urlpatterns = [
     # 홈
@@ -11,12 +15,25 @@ urlpatterns = [
     path("logout/", views.user_logout, name="logout"),
     
     # 사용자 기능
-    path("buy/", views.buy_ticket, name="buy_ticket"),
-    path("buy/done/<int:ticket_id>/", views.buy_ticket_done, name="buy_ticket_done"),
-    path("my-tickets/", views.my_tickets, name="my_tickets"),
+    path("buy/", pages.buy_ticket, name="buy_ticket"),
+    path("buy/batch/", views.buy_ticket_batch, name="buy_ticket_batch"),
+    path("buy/done/<int:ticket_id>/", pages.buy_ticket_done, name="buy_ticket_done"),
+    path("my-tickets/", pages.my_tickets, name="my_tickets"),
+    path("my-tickets/more/", pages.my_tickets_more, name="my_tickets_more"),
     
     # 관리자 기능
     path("admin/sales/", views.admin_sales, name="admin_sales"),
+    path("admin/exposure/", views.admin_exposure, name="admin_exposure"),
     path("admin/draw/", views.admin_draw, name="admin_draw"),
-    path("admin/winners/", views.admin_winners, name="admin_winners"),
+    path("admin/draw/<int:draw_id>/progress/", views.admin_draw_progress, name="admin_draw_progress"),
+    path("admin/winners/", pages.admin_winners, name="admin_winners"),
+    path("admin/draw/<int:draw_id>/export/", views.admin_export, name="admin_export"),
+    path("admin/profiles/", views.admin_profiles, name="admin_profiles"),
+    path("admin/profiles/<str:profile_id>/", views.admin_profile_detail, name="admin_profile_detail"),
+
+    # JSON API (토큰 인증)
+    path("api/draw/current/", api.current_draw, name="api_current_draw"),
+    path("api/draw/check/", api.check_numbers, name="api_check_numbers"),
+    path("api/tickets/", api.tickets, name="api_tickets"),
+    path("api/tickets/<int:ticket_id>/", api.ticket_detail, name="api_ticket_detail"),
 ]
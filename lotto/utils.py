@@ -1,6 +1,8 @@
 """
 로또 당첨 등급 계산 유틸리티
 """
+import numpy as np
+
 def calculate_winning_grade(ticket_numbers, draw_numbers, bonus_number=None):
     """
     티켓 번호와 당첨 번호를 비교하여 당첨 등급을 계산
@@ -34,3 +36,92 @@ def calculate_winning_grade(ticket_numbers, draw_numbers, bonus_number=None):
     else:
         return 0  # 낙첨
 
+
+
+def numbers_to_mask(numbers):
+    """
+    번호 리스트를 64비트 비트마스크로 변환
+
+    n번 번호는 n번째 비트에 대응한다 (1~45 → 비트 1~45).
+
+    Args:
+        numbers: 번호 리스트 (예: [1, 5, 12, 20, 33, 42])
+
+    Returns:
+        int: 비트마스크
+    """
+    mask = 0
+    for n in numbers:
+        mask |= 1 << n
+    return mask
+
+
+def mask_to_numbers(mask):
+    """비트마스크를 정렬된 번호 리스트로 변환"""
+    return [n for n in range(1, 46) if mask >> n & 1]
+
+
+def calculate_winning_grade_mask(ticket_mask, draw_mask, bonus_number=None):
+    """
+    비트마스크로 당첨 등급 계산 (calculate_winning_grade와 같은 결과)
+
+    Args:
+        ticket_mask: 티켓 번호 비트마스크
+        draw_mask: 당첨 번호 비트마스크
+        bonus_number: 보너스 번호 (옵션)
+
+    Returns:
+        int: 당첨 등급 (0: 낙첨, 1~5: 등급)
+    """
+    match_count = (ticket_mask & draw_mask).bit_count()
+    if match_count == 6:
+        return 1
+    elif match_count == 5:
+        if bonus_number and ticket_mask >> bonus_number & 1:
+            return 2
+        return 3
+    elif match_count == 4:
+        return 4
+    elif match_count == 3:
+        return 5
+    return 0
+
+
+def top_tier_masks(numbers, bonus_number=None):
+    """
+    1~3등이 되는 번호 조합 (당첨 번호와 5개 이상 일치하는 조합)
+
+    당첨 조합 자신과, 번호 하나만 다른 6 x 39개 조합이다.
+
+    Args:
+        numbers: 당첨 번호 6개
+        bonus_number: 보너스 번호 (없으면 5개 일치는 모두 3등)
+
+    Returns:
+        dict: {조합 비트마스크: 등급}
+    """
+    mask = numbers_to_mask(numbers)
+    grades = {}
+    for out in numbers:
+        base = mask & ~(1 << out)
+        for n in range(1, 46):
+            if not mask >> n & 1:
+                grades[base | 1 << n] = 2 if n == bonus_number else 3
+    grades[mask] = 1
+    return grades
+
+
+def number_cooccurrence(masks):
+    """
+    번호 동시 출현 횟수 행렬
+
+    Args:
+        masks: 티켓 번호 비트마스크 목록
+
+    Returns:
+        numpy.ndarray: (46, 46) 행렬. [a][b]는 a와 b를 모두 고른 티켓 수,
+            [n][n]은 n을 고른 티켓 수 (0번 행·열은 사용하지 않음)
+    """
+    masks = np.asarray(masks, dtype=np.int64).reshape(-1)
+    bits = ((masks[:, None] >> np.arange(46)) & 1).astype(np.int64)
+    return bits.T @ bits
@@ -1,14 +1,26 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth import login, logout
-from django.http import Http404
+from django.http import FileResponse, Http404, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.views.decorators.http import require_POST
 from django.contrib import messages
-from django.db.models import Count, Q
 from django.utils import timezone
 from .forms import LottoBuyForm, SignUpForm, LoginForm
-from .models import Ticket, Draw
-from .utils import calculate_winning_grade
+from .models import ArchivedTicket, Ticket, Draw, DrawResult, Round
+from .settlement import settle_draw, settle_top_tiers
+from .jobs import enqueue_settlement, draw_progress
+from .rounds import close_sales, draw_round, ticket_result
+from .pagination import paginate_tickets
+from .sales import sales_summary
+from .draws import get_current_draw
+from .exposure import exposure_heatmap, projected_winners
+from .export import CONTENT_TYPES, EXPORT_KINDS, available_formats, export_filename, iter_export
+from .profiling import PROFILE_HEADER, PROFILE_PARAM, list_profiles, load_profile, profile_path
+from .purchase import auto_pick, build_slip, issue_tickets, parse_numbers, parse_slip_request, validate_picks
 import random
+import time
 
 def signup(request):
     """회원가입"""
@@ -67,19 +79,14 @@ def buy_ticket(request):
         form = LottoBuyForm(request.POST)
         if form.is_valid():
             is_auto = form.cleaned_data["is_auto"]
-            numbers = form.cleaned_data["numbers"]
+            numbers = auto_pick() if is_auto else parse_numbers(form.cleaned_data["numbers"])
 
-            if is_auto:
-                nums = sorted(random.sample(range(1, 46), 6))
-                numbers = ",".join(str(n) for n in nums)
-
-            ticket = Ticket.objects.create(
-                user=request.user,
-                numbers=numbers,
-                is_auto=is_auto
-            )
-
-            return redirect("buy_ticket_done", ticket_id=ticket.id)
+            try:
+                ticket, = issue_tickets(request.user, validate_picks([numbers]), [is_auto])
+            except ValidationError as e:
+                form.add_error(None, e)
+            else:
+                return redirect("buy_ticket_done", ticket_id=ticket.id)
 
     else:
         form = LottoBuyForm()
@@ -87,50 +94,95 @@ def buy_ticket(request):
     return render(request, "lotto/buy_ticket.html", {"form": form})
 
 
+@login_required
+@require_POST
+def buy_ticket_batch(request):
+    """
+    여러 게임 일괄 구매 (JSON)
+
+    요청 본문:
+        {"games": [{"numbers": [1, 5, 12, 20, 33, 42]}, {"auto": true}, ...], "auto_count": 3}
+        games의 각 항목은 수동 번호 또는 자동 구매, auto_count는 추가할 자동 게임 수
+    """
+    try:
+        tickets = issue_tickets(request.user, *build_slip(*parse_slip_request(request.body)))
+    except ValidationError as e:
+        return JsonResponse({"errors": e.messages}, status=400)
+
+    return JsonResponse({
+        "tickets": [
+            {"id": t.id, "numbers": t.numbers, "is_auto": t.is_auto} for t in tickets
+        ],
+    }, status=201)
+
+
 @login_required
 def buy_ticket_done(request, ticket_id):
-    ticket = get_object_or_404(Ticket, id=ticket_id, user=request.user)
-
-    # 활성화된 당첨번호 가져오기
-    winning_draw = Draw.objects.filter(is_active=True).first()
-    winning_grade = 0
-    winning_numbers = None
-    bonus_number = None
-
-    if winning_draw:
-        winning_numbers = winning_draw.numbers
-        bonus_number = winning_draw.bonus_number
-        
-        # 당첨 등급 계산
-        ticket_nums = ticket.get_numbers_list()
-        draw_nums = winning_draw.get_numbers_list()
-        winning_grade = calculate_winning_grade(ticket_nums, draw_nums, bonus_number)
-        
-        # 티켓에 당첨 등급 저장
-        ticket.winning_grade = winning_grade
-        ticket.draw = winning_draw
-        ticket.save()
-
-    return render(request, "lotto/buy_ticket_done.html", {
+    # 보관된 이전 회차 티켓도 같은 번호로 조회
+    ticket = (
+        Ticket.objects.select_related('round__draw').filter(id=ticket_id, user=request.user).first()
+        or get_object_or_404(ArchivedTicket.objects.select_related('round__draw'), id=ticket_id, user=request.user)
+    )
+
+    # 티켓 회차의 추첨 결과 (조회만 하고 저장하지 않음, 저장은 추첨 정산에서)
+    winning_draw, winning_grade = ticket_result(ticket)
+    return render(request, "lotto/buy_ticket_done.html", result_context(ticket, winning_draw, winning_grade))
+
+
+def result_context(ticket, winning_draw, winning_grade):
+    """구매 완료 화면 컨텍스트 (회차 추첨 전이면 winning_numbers가 None)"""
+    return {
         "ticket": ticket,
-        "winning_numbers": winning_numbers,
-        "bonus_number": bonus_number,
+        "winning_numbers": winning_draw.numbers if winning_draw else None,
+        "bonus_number": winning_draw.bonus_number if winning_draw else None,
         "winning_grade": winning_grade,
-    })
+        "winning_grade_display": GRADE_LABELS.get(winning_grade),
+    }
+
+
+GRADE_LABELS = dict(Ticket.WINNING_GRADE_CHOICES)
+
+MY_TICKET_FIELDS = ('id', 'numbers', 'is_auto', 'created_at', 'winning_grade')
 
 
 @login_required
 def my_tickets(request):
-    """내 티켓 목록 보기"""
-    tickets = Ticket.objects.filter(user=request.user).order_by('-created_at')
-    active_draw = Draw.objects.filter(is_active=True).first()
+    """내 티켓 목록 보기 (최신순, 커서 페이지네이션, 이전 회차 보관 티켓까지 이어서)"""
+    tickets = Ticket.objects.filter(user=request.user).only(*MY_TICKET_FIELDS)
+    archived = ArchivedTicket.objects.filter(user=request.user).only(*MY_TICKET_FIELDS)
+    try:
+        tickets, next_cursor = paginate_tickets(
+            tickets, request.GET.get('cursor'), settings.LOTTO_MY_TICKETS_PAGE_SIZE, archive=archived
+        )
+    except ValueError:
+        return HttpResponseBadRequest("잘못된 커서입니다.")
+    active_draw = get_current_draw()
     
     return render(request, "lotto/my_tickets.html", {
         "tickets": tickets,
+        "next_cursor": next_cursor,
         "active_draw": active_draw,
     })
 
 
+@login_required
+def my_tickets_more(request):
+    """내 티켓 목록 다음 페이지 (JSON, 더 보기용)"""
+    tickets = Ticket.objects.filter(user=request.user).values(*MY_TICKET_FIELDS)
+    archived = ArchivedTicket.objects.filter(user=request.user).values(*MY_TICKET_FIELDS)
+    try:
+        tickets, next_cursor = paginate_tickets(
+            tickets, request.GET.get('cursor'), settings.LOTTO_MY_TICKETS_PAGE_SIZE, archive=archived
+        )
+    except ValueError:
+        return JsonResponse({"error": "잘못된 커서입니다."}, status=400)
+
+    for ticket in tickets:
+        ticket['winning_grade_display'] = GRADE_LABELS[ticket['winning_grade']]
+        ticket['created_at'] = timezone.localtime(ticket['created_at']).strftime('%Y-%m-%d %H:%M')
+    return JsonResponse({"tickets": tickets, "next_cursor": next_cursor})
+
+
 def is_admin(user):
     """관리자 여부 확인 (superuser만 관리 기능 사용 가능)"""
     return user.is_superuser
@@ -138,73 +190,93 @@ def is_admin(user):
 
 @user_passes_test(is_admin)
 def admin_sales(request):
-    """관리자: 판매 실적 확인"""
-    total_tickets = Ticket.objects.count()
-    auto_tickets = Ticket.objects.filter(is_auto=True).count()
-    manual_tickets = Ticket.objects.filter(is_auto=False).count()
-    
-    # 사용자별 판매 통계
-    user_stats = Ticket.objects.values('user__username').annotate(
-        ticket_count=Count('id')
-    ).order_by('-ticket_count')[:10]
-    
-    # 날짜별 판매 통계
-    from django.db.models.functions import TruncDate
-    daily_stats = Ticket.objects.annotate(
-        date=TruncDate('created_at')
-    ).values('date').annotate(
-        count=Count('id')
-    ).order_by('-date')[:30]
-    
-    return render(request, "lotto/admin_sales.html", {
-        "total_tickets": total_tickets,
-        "auto_tickets": auto_tickets,
-        "manual_tickets": manual_tickets,
-        "user_stats": user_stats,
-        "daily_stats": daily_stats,
-    })
+    """관리자: 판매 실적 확인 (판매 집계 테이블 사용)"""
+    return render(request, "lotto/admin_sales.html", sales_summary())
+
+
+@user_passes_test(is_admin)
+def admin_exposure(request):
+    """관리자: 현재 회차의 번호 인기도와 후보 번호의 예상 당첨자 수 (노출 집계 테이블 사용)"""
+    context = exposure_heatmap()
+    context["sales_round"] = Round.current()
+    if request.GET.get("numbers"):
+        try:
+            numbers = validate_picks([parse_numbers(request.GET["numbers"])])[0].tolist()
+            bonus = int(request.GET["bonus"]) if request.GET.get("bonus") else None
+            if bonus is not None and (not 1 <= bonus <= 45 or bonus in numbers):
+                raise ValidationError("보너스 번호는 당첨 번호와 다른 1~45 사이 숫자여야 합니다.")
+        except ValueError:
+            context["errors"] = ["보너스 번호는 숫자만 입력해야 합니다."]
+        except ValidationError as e:
+            context["errors"] = e.messages
+        else:
+            started = time.perf_counter()
+            context["projection"] = projected_winners(numbers, bonus)
+            context["projection_ms"] = (time.perf_counter() - started) * 1000
+            context["candidate"] = {"numbers": numbers, "bonus": bonus}
+    return render(request, "lotto/admin_exposure.html", context)
 
 
 @user_passes_test(is_admin)
 def admin_draw(request):
-    """관리자: 추첨 진행"""
+    """관리자: 판매 마감 및 추첨 진행 (현재 회차의 티켓만 정산)"""
     if request.method == "POST":
-        # 기존 활성 추첨 비활성화
-        Draw.objects.filter(is_active=True).update(is_active=False)
-        
+        if request.POST.get("action") == "close_sales":
+            sales_round = close_sales()
+            messages.success(request, f"제{sales_round.number}회 판매를 마감했습니다.")
+            return redirect("admin_draw")
+
         # 새 당첨번호 생성
         numbers = sorted(random.sample(range(1, 46), 6))
         bonus = random.choice([n for n in range(1, 46) if n not in numbers])
-        
-        draw = Draw.objects.create(
-            numbers=",".join(str(n) for n in numbers),
-            bonus_number=bonus,
-            is_active=True
+
+        # 현재 회차 마감·추첨 후 다음 회차 판매 시작 (기존 활성 추첨은 비활성화)
+        draw, sales_round = draw_round(numbers, bonus)
+        tickets = sales_round.tickets.all()
+
+        # 1~3등은 번호 조합 인덱스로 바로 확정하고 나머지는 전체 정산에 맡김
+        top = settle_top_tiers(draw, tickets=tickets)
+        top_summary = f"1등 {top[1]}장, 2등 {top[2]}장, 3등 {top[3]}장"
+
+        if settings.LOTTO_SETTLEMENT_BACKGROUND:
+            # 정산은 워커가 처리하고 요청은 바로 반환
+            enqueue_settlement(draw, tickets=tickets, sales_round=sales_round)
+            messages.success(
+                request,
+                f"제{sales_round.number}회 추첨이 완료되었습니다! 당첨번호: {draw.numbers}, 보너스: {draw.bonus_number} "
+                f"({top_summary} 확정, 4·5등 정산은 백그라운드에서 진행됩니다)"
+            )
+            return redirect("admin_draw")
+
+        # 이번 회차 티켓의 당첨 등급 일괄 계산 및 업데이트
+        report = settle_draw(draw, tickets=tickets)
+
+        messages.success(
+            request,
+            f"제{sales_round.number}회 추첨이 완료되었습니다! 당첨번호: {draw.numbers}, 보너스: {draw.bonus_number} "
+            f"({top_summary}, 정산 {report.processed}장, {report.throughput:,.0f}장/초)"
         )
-        
-        # 모든 티켓에 대해 당첨 등급 계산 및 업데이트
-        tickets = Ticket.objects.all()
-        for ticket in tickets:
-            ticket_nums = ticket.get_numbers_list()
-            draw_nums = draw.get_numbers_list()
-            winning_grade = calculate_winning_grade(ticket_nums, draw_nums, draw.bonus_number)
-            ticket.winning_grade = winning_grade
-            ticket.draw = draw
-            ticket.save()
-        
-        messages.success(request, f"추첨이 완료되었습니다! 당첨번호: {draw.numbers}, 보너스: {draw.bonus_number}")
         return redirect("admin_winners")
-    
-    active_draw = Draw.objects.filter(is_active=True).first()
+
+    active_draw = get_current_draw()
     return render(request, "lotto/admin_draw.html", {
         "active_draw": active_draw,
+        "progress": draw_progress(active_draw) if active_draw else None,
+        "sales_round": Round.current(),
     })
 
 
+@user_passes_test(is_admin)
+def admin_draw_progress(request, draw_id):
+    """관리자: 추첨 정산 진행 상황 (JSON, 폴링용)"""
+    draw = get_object_or_404(Draw, id=draw_id)
+    return JsonResponse(draw_progress(draw))
+
+
 @user_passes_test(is_admin)
 def admin_winners(request):
     """관리자: 당첨자 확인"""
-    active_draw = Draw.objects.filter(is_active=True).first()
+    active_draw = get_current_draw()
     
     if not active_draw:
         messages.info(request, "아직 추첨이 진행되지 않았습니다.")
@@ -213,23 +285,84 @@ def admin_winners(request):
             "winners_by_grade": {},
         })
     
-    # 등급별 당첨자 통계
+    # 등급별 당첨자 통계 (정산 시 기록된 요약 사용)
+    result = DrawResult.objects.filter(draw_id=active_draw.id).first()
+    grade_counts = result.get_grade_counts() if result else {grade: 0 for grade in range(1, 6)}
+    if not result:
+        messages.info(request, "당첨 등급 정산이 아직 완료되지 않았습니다.")
+
     winners_by_grade = {}
-    for grade in range(1, 6):
-        winners = Ticket.objects.filter(draw=active_draw, winning_grade=grade)
+    for grade, count in grade_counts.items():
         winners_by_grade[grade] = {
-            "count": winners.count(),
-            "tickets": winners.select_related('user')[:50],  # 최대 50개만 표시
+            "count": count,
+            # 당첨자가 있는 등급만 조회, 최대 50개만 표시
+            "tickets": (
+                Ticket.objects.filter(draw_id=active_draw.id, winning_grade__gt=0, winning_grade=grade)
+                .select_related('user').order_by('-winning_grade', 'created_at')[:50]
+                if count else []
+            ),
         }
     
-    # 전체 당첨 티켓
-    all_winning_tickets = Ticket.objects.filter(
-        draw=active_draw,
-        winning_grade__gt=0
-    ).select_related('user').order_by('-winning_grade', 'created_at')
+    # 전체 당첨 티켓 (상위 등급부터 최대 100개)
+    all_winning_tickets = []
+    if result and result.winner_count:
+        all_winning_tickets = Ticket.objects.filter(
+            draw_id=active_draw.id,
+            winning_grade__gt=0
+        ).select_related('user').order_by('-winning_grade', 'created_at')[:100]
     
     return render(request, "lotto/admin_winners.html", {
         "active_draw": active_draw,
+        "result": result,
         "winners_by_grade": winners_by_grade,
         "all_winning_tickets": all_winning_tickets,
     })
+
+
+@user_passes_test(is_admin)
+def admin_export(request, draw_id):
+    """
+    관리자: 추첨별 티켓·당첨자 전체 내보내기 (스트리밍)
+
+    ?kind=tickets|winners&format=csv|parquet
+    """
+    kind = request.GET.get("kind", "tickets")
+    fmt = request.GET.get("format", "csv")
+    if kind not in EXPORT_KINDS or fmt not in available_formats():
+        return HttpResponseBadRequest("지원하지 않는 내보내기 형식입니다.")
+    get_object_or_404(Draw, id=draw_id)
+
+    response = StreamingHttpResponse(iter_export(draw_id, kind, fmt), content_type=CONTENT_TYPES[fmt])
+    response["Content-Disposition"] = f'attachment; filename="{export_filename(draw_id, kind, fmt)}"'
+    return response
+
+
+@user_passes_test(is_admin)
+def admin_profiles(request):
+    """관리자: 최근 요청 프로파일 목록"""
+    return render(request, "lotto/admin_profiles.html", {
+        "profiles": list_profiles(),
+        "profile_param": PROFILE_PARAM,
+        "profile_header": PROFILE_HEADER,
+        "keep": settings.LOTTO_PROFILE_KEEP,
+        "enabled": settings.LOTTO_PROFILING_ENABLED,
+    })
+
+
+@user_passes_test(is_admin)
+def admin_profile_detail(request, profile_id):
+    """
+    관리자: 요청 프로파일 상세 (상위 함수, SQL별 실행 횟수·시간)
+
+    ?download=1이면 pstats 원본(.prof) 파일을 내려받는다.
+    """
+    if request.GET.get("download"):
+        path = profile_path(profile_id, '.prof')
+        if path is None:
+            raise Http404("프로파일을 찾을 수 없습니다.")
+        return FileResponse(path.open('rb'), as_attachment=True, filename=path.name)
+
+    profile = load_profile(profile_id)
+    if profile is None:
+        raise Http404("프로파일을 찾을 수 없습니다.")
+    return render(request, "lotto/admin_profile_detail.html", {"profile": profile})
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,6 +42,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'lotto.timing.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -48,6 +50,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'lotto.profiling.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'lotto_site.urls'
@@ -57,7 +60,7 @@ LOGIN_REDIRECT_URL = '/lotto/buy/'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'lotto.timing.TimedDjangoTemplates',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -84,6 +87,21 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# 현재 활성 추첨 스냅샷(lotto.draws)을 프로세스끼리 공유해야 다른 프로세스도 DB 조회 없이 새 추첨을 바로 본다.
+# LOTTO_CACHE_DIR 환경 변수가 있으면 그 디렉터리의 파일 캐시를 모든 프로세스가 공유하고
+# (docker-compose.yml은 공유 볼륨의 디렉터리를 지정), 없으면 프로세스별 메모리 캐시를 쓴다 (개발 서버·테스트).
+if os.environ.get('LOTTO_CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['LOTTO_CACHE_DIR'],
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -124,3 +142,75 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# 로또 설정
+
+# 추첨 정산 방식: 'chunked' (NumPy 청크 처리), 'sql' (DB 내부 UPDATE),
+# 'parallel' (여러 프로세스에서 chunked 처리)
+LOTTO_SETTLEMENT_MODE = 'chunked'
+
+# parallel 정산 시 사용할 워커 프로세스 수
+LOTTO_SETTLEMENT_WORKERS = os.cpu_count() or 1
+
+# 추첨 정산 시 한 번에 처리할 티켓 수
+LOTTO_SETTLEMENT_CHUNK_SIZE = 5000
+
+# 추첨 정산을 백그라운드 워커(manage.py settlement_worker)에서 처리할지 여부
+# False이면 추첨 요청 안에서 바로 정산한다.
+LOTTO_SETTLEMENT_BACKGROUND = True
+
+# 하나의 추첨 정산을 나눌 작업 수 (워커 프로세스들이 나눠 처리)
+LOTTO_SETTLEMENT_PARTITIONS = 4
+
+# 작업이 없을 때 워커가 대기열을 다시 확인하는 간격(초)
+LOTTO_SETTLEMENT_POLL_INTERVAL = 2.0
+
+# 이 시간(초) 동안 갱신이 없는 진행 중 작업은 다시 대기열에 넣는다
+LOTTO_SETTLEMENT_STALE_AFTER = 600
+
+# 내 티켓 목록 한 페이지에 보여줄 티켓 수
+LOTTO_MY_TICKETS_PAGE_SIZE = 50
+
+# 현재 활성 추첨 스냅샷 캐시 유지 시간(초): Django 캐시 / 프로세스 메모리
+# 추첨 시 새 스냅샷을 Django 캐시에 바로 넣으므로 공유 캐시(CACHES)에서는 만료 시간과 관계없이 곧 반영되고,
+# 프로세스별 메모리 캐시에서는 다른 프로세스가 이전 추첨을 최대 이 시간만큼 볼 수 있다.
+LOTTO_CURRENT_DRAW_CACHE_TIMEOUT = 5
+LOTTO_CURRENT_DRAW_LOCAL_TTL = 1.0
+
+# 자동 번호 생성에 os.urandom 기반 난수를 사용할지 여부 (False면 NumPy 기본 난수 생성기)
+LOTTO_AUTO_PICK_SECURE = True
+
+# 일괄 구매 시 한 번에 구매할 수 있는 최대 게임 수
+LOTTO_MAX_GAMES_PER_SLIP = 10
+
+# JSON API 티켓 목록 한 페이지 크기
+LOTTO_API_PAGE_SIZE = 100
+
+# 구매·조회·당첨 확인 화면에 비동기 뷰(lotto/async_views.py) 사용 여부
+# ASGI 서버로 실행할 때 켠다 (lotto_site/settings_asgi.py 참고).
+LOTTO_ASYNC_VIEWS = False
+
+# 회차가 열린 뒤 판매를 마감할 때까지의 시간(시간 단위)
+# None이면 추첨을 진행할 때(또는 관리자가 판매 마감할 때) 마감한다.
+LOTTO_ROUND_SALES_HOURS = None
+
+# 티켓 보관(manage.py archive_tickets): 보관하지 않고 티켓 테이블에 남겨 둘 최근 추첨 회차 수 (1 이상)
+LOTTO_ARCHIVE_KEEP_ROUNDS = 2
+
+# 티켓 보관 시 한 트랜잭션에서 옮길 티켓 수
+LOTTO_ARCHIVE_BATCH_SIZE = 5000
+
+# 응답에 Server-Timing 헤더(DB·템플릿·전체 시간)를 붙일지 여부 (lotto.timing)
+# 요청별 계측 로그는 이 설정과 관계없이 'lotto.timing' 로거로 남긴다.
+LOTTO_SERVER_TIMING = True
+
+# 한 요청에서 같은 SQL(매개변수 제외)이 이 횟수 이상 실행되면 N+1 의심 경고 로그 (None이면 끔)
+LOTTO_TIMING_REPEATED_QUERY_THRESHOLD = 10
+
+# superuser가 ?_profile=1 또는 X-Lotto-Profile: 1 헤더로 요청하면 뷰를 cProfile로 실행해 저장 (lotto.profiling)
+LOTTO_PROFILING_ENABLED = True
+
+# 프로파일 저장 디렉터리와 남겨 둘 최근 프로파일 수 (넘으면 오래된 것부터 지움)
+LOTTO_PROFILE_DIR = BASE_DIR / 'profiles'
+LOTTO_PROFILE_KEEP = 50
@@ -0,0 +1,10 @@
+"""
+ASGI(uvicorn) 배포용 설정
+
+    DJANGO_SETTINGS_MODULE=lotto_site.settings_asgi uvicorn lotto_site.asgi:application
+
+기본 설정에 비동기 뷰 사용만 추가한다.
+"""
+from .settings import *  # noqa: F401,F403
+
+LOTTO_ASYNC_VIEWS = True